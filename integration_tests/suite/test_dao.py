@@ -0,0 +1,340 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_exactly,
+    contains_inanyorder,
+    empty,
+    has_properties,
+    raises,
+)
+from xivo_dao import agent_dao, agent_status_dao
+from xivo_dao.alchemy.agent_login_status import AgentLoginStatus
+from xivo_dao.alchemy.agent_membership_status import AgentMembershipStatus
+from xivo_dao.helpers.db_manager import Session
+from xivo_dao.tests.test_dao import ItemInserter
+
+from wazo_agentd.dao import AgentDAOAdapter, AgentStatusDAOAdapter, _Queue
+from wazo_agentd.exception import NoSuchAgentError
+
+from .helpers.base import UNKNOWN_UUID, BaseIntegrationTest
+from .helpers.database import TENANT_UUID
+
+
+class TestDAOAdapters(BaseIntegrationTest):
+    asset = 'base'
+
+    # Each test runs in a transaction that is rolled back at the end
+
+    def setUp(self):
+        super().setUp()
+        self.connection = self.database.connect()
+        self.transaction = self.connection.begin()
+        Session.remove()
+        Session.configure(bind=self.connection)
+        self.session = Session()
+        self.inserter = ItemInserter(self.session, tenant_uuid=TENANT_UUID)
+        self.dao = AgentStatusDAOAdapter(agent_status_dao)
+        self.agent_dao = AgentDAOAdapter(agent_dao)
+
+    def tearDown(self):
+        Session.remove()
+        self.transaction.rollback()
+        self.connection.close()
+        super().tearDown()
+
+    def test_get_statuses_ordered_by_id(self):
+        agents = [self._add_agent(number) for number in ('3003', '3001', '3002')]
+        agent_ids = [agent.id for agent in agents]
+
+        result = self.dao.get_statuses(agent_ids=agent_ids)
+
+        assert_that(
+            result,
+            contains_exactly(
+                *(
+                    has_properties(agent_id=agent.id, agent_number=agent.number)
+                    for agent in agents
+                )
+            ),
+        )
+
+    def test_get_statuses_pagination(self):
+        agents = [self._add_agent(number) for number in ('3001', '3002', '3003')]
+        agent_ids = [agent.id for agent in agents]
+
+        first = self.dao.get_statuses(agent_ids=agent_ids, limit=2)
+        second = self.dao.get_statuses(agent_ids=agent_ids, limit=2, offset=2)
+
+        assert_that(
+            first,
+            contains_exactly(
+                has_properties(agent_id=agent_ids[0]),
+                has_properties(agent_id=agent_ids[1]),
+            ),
+        )
+        assert_that(second, contains_exactly(has_properties(agent_id=agent_ids[2])))
+
+    def test_get_statuses_tenant_uuids(self):
+        agent = self._add_agent('3001')
+
+        assert_that(
+            self.dao.get_statuses(tenant_uuids=[TENANT_UUID], agent_ids=[agent.id]),
+            contains_exactly(has_properties(agent_id=agent.id)),
+        )
+        assert_that(
+            self.dao.get_statuses(tenant_uuids=[UNKNOWN_UUID], agent_ids=[agent.id]),
+            empty(),
+        )
+
+    def test_get_statuses_logged(self):
+        logged = self._add_agent('3001')
+        not_logged = self._add_agent('3002')
+        self._log_in(logged, extension='1001', context='default')
+        agent_ids = [logged.id, not_logged.id]
+
+        assert_that(
+            self.dao.get_statuses(agent_ids=agent_ids, logged=True),
+            contains_exactly(
+                has_properties(
+                    agent_id=logged.id,
+                    logged=True,
+                    extension='1001',
+                    context='default',
+                )
+            ),
+        )
+        assert_that(
+            self.dao.get_statuses(agent_ids=agent_ids, logged=False),
+            contains_exactly(
+                has_properties(
+                    agent_id=not_logged.id, logged=False, paused=False, extension=None
+                )
+            ),
+        )
+
+    def test_get_statuses_paused(self):
+        paused = self._add_agent('3001')
+        not_paused = self._add_agent('3002')
+        not_logged = self._add_agent('3003')
+        self._log_in(paused, paused=True, paused_reason='lunch')
+        self._log_in(not_paused)
+        agent_ids = [paused.id, not_paused.id, not_logged.id]
+
+        assert_that(
+            self.dao.get_statuses(agent_ids=agent_ids, paused=True),
+            contains_exactly(
+                has_properties(agent_id=paused.id, paused=True, paused_reason='lunch')
+            ),
+        )
+        assert_that(
+            self.dao.get_statuses(agent_ids=agent_ids, paused=False),
+            contains_exactly(
+                has_properties(agent_id=not_paused.id),
+                has_properties(agent_id=not_logged.id),
+            ),
+        )
+
+    def test_get_statuses_context(self):
+        agent = self._add_agent('3001')
+        other = self._add_agent('3002')
+        self._log_in(agent, context='default')
+        self._log_in(other, context='other')
+
+        result = self.dao.get_statuses(
+            agent_ids=[agent.id, other.id], context='default'
+        )
+
+        assert_that(result, contains_exactly(has_properties(agent_id=agent.id)))
+
+    def test_get_statuses_queue_id(self):
+        member = self._add_agent('3001')
+        logged_member = self._add_agent('3002')
+        not_member = self._add_agent('3003')
+        queue = self.inserter.add_queuefeatures(name='q1', number='4001')
+        self._add_queue_member(queue, member)
+        self._add_queue_member(queue, logged_member)
+        self._log_in(logged_member)
+        agent_ids = [member.id, logged_member.id, not_member.id]
+
+        result = self.dao.get_statuses(agent_ids=agent_ids, queue_id=queue.id)
+
+        assert_that(
+            result,
+            contains_exactly(
+                has_properties(agent_id=member.id, logged=False),
+                has_properties(agent_id=logged_member.id, logged=True),
+            ),
+        )
+
+    def test_get_logged_statuses(self):
+        agent = self._add_agent('3001')
+        other = self._add_agent('3002')
+        not_logged = self._add_agent('3003')
+        user1 = self.inserter.add_user(agentid=agent.id)
+        user2 = self.inserter.add_user(agentid=agent.id)
+        queue1 = self.inserter.add_queuefeatures(name='q1', number='4001')
+        queue2 = self.inserter.add_queuefeatures(name='q2', number='4002')
+        self._log_in(agent, extension='1001', paused=True, paused_reason='lunch')
+        self._log_in(other, extension='1002')
+        self._add_membership(agent, queue1, penalty=1)
+        self._add_membership(agent, queue2, penalty=2)
+        self._add_membership(other, queue1)
+        agent_ids = {agent.id, other.id, not_logged.id}
+
+        result = [
+            status
+            for status in self.dao.get_logged_statuses(tenant_uuids=[TENANT_UUID])
+            if status.agent_id in agent_ids
+        ]
+
+        assert_that(
+            result,
+            contains_inanyorder(
+                has_properties(
+                    agent_id=agent.id,
+                    agent_number='3001',
+                    tenant_uuid=TENANT_UUID,
+                    extension='1001',
+                    context='default',
+                    paused=True,
+                    paused_reason='lunch',
+                    queues=contains_inanyorder(
+                        has_properties(id=queue1.id, name='q1', penalty=1),
+                        has_properties(id=queue2.id, name='q2', penalty=2),
+                    ),
+                    user_ids=contains_inanyorder(user1.id, user2.id),
+                    user_uuids=contains_inanyorder(str(user1.uuid), str(user2.uuid)),
+                ),
+                has_properties(
+                    agent_id=other.id,
+                    queues=contains_exactly(
+                        has_properties(id=queue1.id, tenant_uuid=TENANT_UUID)
+                    ),
+                    user_ids=empty(),
+                    user_uuids=empty(),
+                ),
+            ),
+        )
+
+    def test_get_logged_statuses_tenant_uuids(self):
+        agent = self._add_agent('3001')
+        self._log_in(agent)
+
+        result = self.dao.get_logged_statuses(tenant_uuids=[UNKNOWN_UUID])
+
+        assert_that(result, empty())
+
+    def test_get_logged_statuses_current_agent_number(self):
+        agent = self._add_agent('3001')
+        self._log_in(agent)
+        agent.number = '3999'
+        self.session.flush()
+
+        result = self.dao.get_logged_statuses(tenant_uuids=[TENANT_UUID])
+
+        assert_that(
+            [status for status in result if status.agent_id == agent.id],
+            contains_exactly(has_properties(agent_number='3999')),
+        )
+
+    def test_add_agents_to_queue(self):
+        member = self._add_agent('3001')
+        agent = self._add_agent('3002')
+        queue = self.inserter.add_queuefeatures(name='q1', number='4001')
+        self._add_membership(member, queue, penalty=1)
+
+        self.dao.add_agents_to_queue(
+            [member.id, agent.id, agent.id], _Queue(queue.id, TENANT_UUID, 'q1', 5)
+        )
+
+        assert_that(
+            self._get_memberships(queue),
+            contains_inanyorder(
+                has_properties(agent_id=member.id, queue_name='q1', penalty=5),
+                has_properties(agent_id=agent.id, queue_name='q1', penalty=5),
+            ),
+        )
+
+    def test_remove_agents_from_queue(self):
+        member = self._add_agent('3001')
+        other_member = self._add_agent('3002')
+        not_member = self._add_agent('3003')
+        queue = self.inserter.add_queuefeatures(name='q1', number='4001')
+        other_queue = self.inserter.add_queuefeatures(name='q2', number='4002')
+        self._add_membership(member, queue)
+        self._add_membership(member, other_queue)
+        self._add_membership(other_member, queue)
+
+        self.dao.remove_agents_from_queue([member.id, not_member.id], queue.id)
+
+        assert_that(
+            self._get_memberships(queue),
+            contains_exactly(has_properties(agent_id=other_member.id)),
+        )
+        assert_that(
+            self._get_memberships(other_queue),
+            contains_exactly(has_properties(agent_id=member.id)),
+        )
+
+    def test_get_agents_missing(self):
+        agent = self._add_agent('3001')
+        missing_id = agent.id + 1000
+
+        assert_that(
+            calling(self.agent_dao.get_agents).with_args([agent.id, missing_id]),
+            raises(NoSuchAgentError),
+        )
+
+        result = self.agent_dao.get_agents([agent.id, missing_id], ignore_missing=True)
+
+        assert_that(result.keys(), contains_exactly(agent.id))
+
+    def _add_agent(self, number):
+        return self.inserter.add_agent(number=number, tenant_uuid=TENANT_UUID)
+
+    def _log_in(self, agent, extension=None, context='default', **kwargs):
+        self.session.add(
+            AgentLoginStatus(
+                agent_id=agent.id,
+                agent_number=agent.number,
+                extension=extension or agent.number,
+                context=context,
+                interface=f'Local/id-{agent.id}@agentcallback',
+                state_interface=f'PJSIP/agent-{agent.id}',
+                **kwargs,
+            )
+        )
+        self.session.flush()
+
+    def _add_membership(self, agent, queue, penalty=0):
+        self.session.add(
+            AgentMembershipStatus(
+                agent_id=agent.id,
+                queue_id=queue.id,
+                queue_name=queue.name,
+                penalty=penalty,
+            )
+        )
+        self.session.flush()
+
+    def _get_memberships(self, queue):
+        self.session.expire_all()
+        return (
+            self.session.query(AgentMembershipStatus)
+            .filter(AgentMembershipStatus.queue_id == queue.id)
+            .all()
+        )
+
+    def _add_queue_member(self, queue, agent, penalty=0):
+        return self.inserter.add_queue_member(
+            queue_name=queue.name,
+            interface=f'Local/id-{agent.id}@agentcallback',
+            penalty=penalty,
+            usertype='agent',
+            category='queue',
+            channel='Agent',
+            userid=agent.id,
+        )
@@ -0,0 +1,95 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from requests.adapters import HTTPAdapter
+from wazo_amid_client import Client
+
+from wazo_agentd.metrics import AMI_ACTION_DURATION
+
+
+class _SharedHTTPAdapter(HTTPAdapter):
+    # Mounted on every session of the client: closing one of these sessions
+    # must not close the connections used by the others
+    def close(self):
+        pass
+
+
+class AmidClient(Client):
+    def __init__(self, *args, max_concurrent_actions=10, pool_size=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The client creates a new session for each request. The sessions share
+        # the same connection pool, so that connections to wazo-amid are kept
+        # alive and reused instead of being opened for each action.
+        self._adapter = _SharedHTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size or max_concurrent_actions
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_actions, thread_name_prefix='amid'
+        )
+        # The commands of the client are instance attributes, not methods
+        self._send_action = self.action
+        self.action = self._timed_action
+
+    def session(self):
+        session = super().session()
+        # The base client asks the server to close the connection after each
+        # request, which would defeat the pool
+        session.headers.pop('Connection', None)
+        session.mount('http://', self._adapter)
+        session.mount('https://', self._adapter)
+        return session
+
+    def collect_metrics(self):
+        opened = requests = idle = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            requests += pool.num_requests
+            idle += pool.pool.qsize() if pool.pool else 0
+        return [
+            CounterMetricFamily(
+                'agentd_amid_connections_opened_total',
+                'Number of connections opened to wazo-amid since the start',
+                value=opened,
+            ),
+            CounterMetricFamily(
+                'agentd_amid_requests_total',
+                'Number of requests sent to wazo-amid since the start, '
+                'on new or reused connections',
+                value=requests,
+            ),
+            GaugeMetricFamily(
+                'agentd_amid_connections_idle',
+                'Number of open connections to wazo-amid waiting in the pool',
+                value=idle,
+            ),
+        ]
+
+    def _timed_action(self, action, *args, **kwargs):
+        with AMI_ACTION_DURATION.labels(action=action).time():
+            return self._send_action(action, *args, **kwargs)
+
+    def actions(self, actions, return_exceptions=False):
+        # Send the (action, params) pairs concurrently and return their responses
+        # in the same order. The first error is raised once all actions are done,
+        # or, like asyncio.gather, errors are returned in place of the responses
+        # when return_exceptions is true.
+        return self._submit_all(self.action, actions, return_exceptions)
+
+    def commands(self, commands, return_exceptions=False):
+        return self._submit_all(
+            self.command, [(command,) for command in commands], return_exceptions
+        )
+
+    def _submit_all(self, function, calls, return_exceptions):
+        futures = [self._executor.submit(function, *args) for args in calls]
+        wait(futures)
+        if return_exceptions:
+            return [future.exception() or future.result() for future in futures]
+        return [future.result() for future in futures]
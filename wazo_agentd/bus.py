@@ -1,11 +1,23 @@
-# Copyright 2015-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import logging
+import queue
+import threading
+import time
+
 from wazo_bus.consumer import BusConsumer as Consumer
 from wazo_bus.publisher import BusPublisher as Publisher
 from wazo_bus.resources.ami.event import AMIEvent
+from wazo_bus.resources.common.event import TenantEvent
 from xivo.status import Status
 
+from wazo_agentd.metrics import BUS_PUBLISH_DURATION
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
 
 class BusConsumer(Consumer):
     @classmethod
@@ -25,6 +37,77 @@ class BusPublisher(Publisher):
         name = 'wazo-agentd'
         return cls(name=name, service_uuid=service_uuid, **bus_config)
 
+    def publish(self, event, *args, **kwargs):
+        with BUS_PUBLISH_DURATION.labels(event=event.name).time():
+            return super().publish(event, *args, **kwargs)
+
 
 class QueueMemberPausedEvent(AMIEvent):
     name = 'QueueMemberPause'
+
+
+class AgentsJobCompletedEvent(TenantEvent):
+    service = 'agentd'
+    name = 'agents_job_completed'
+    routing_key_fmt = 'agentd.jobs.completed'
+
+
+class _Partition:
+    def __init__(self, name):
+        self.events = queue.Queue()
+        self.current_since = None
+        self.thread = threading.Thread(target=self._run, name=name)
+
+    def _run(self):
+        while True:
+            item = self.events.get()
+            if item is _STOP:
+                return
+            queued_at, callback, payload = item
+            self.current_since = queued_at
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception('Error while handling bus event with %s', callback)
+            finally:
+                self.current_since = None
+
+
+class BusEventDispatcher:
+    # Handles bus events on a pool of threads. Events are partitioned by a key
+    # (e.g. the agent or the queue they are about): events with the same key are
+    # handled in order, by the same thread, while other events are handled in
+    # parallel.
+
+    def __init__(self, workers=4):
+        self._partitions = [
+            _Partition(f'bus_events_{index}') for index in range(workers)
+        ]
+
+    def __enter__(self):
+        for partition in self._partitions:
+            partition.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        for partition in self._partitions:
+            partition.events.put(_STOP)
+        for partition in self._partitions:
+            partition.thread.join()
+
+    def partitioned(self, key_function, callback):
+        def dispatch(payload):
+            key = key_function(payload)
+            partition = self._partitions[hash(key) % len(self._partitions)]
+            partition.events.put((time.monotonic(), callback, payload))
+
+        return dispatch
+
+    def provide_status(self, status):
+        now = time.monotonic()
+        running_since = [partition.current_since for partition in self._partitions]
+        oldest = [since for since in running_since if since is not None]
+        status['bus_events']['queue_depth'] = sum(
+            partition.events.qsize() for partition in self._partitions
+        )
+        status['bus_events']['lag'] = round(now - min(oldest), 3) if oldest else 0
@@ -1,4 +1,4 @@
-# Copyright 2012-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2012-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import argparse
@@ -13,7 +13,14 @@ _DEFAULT_CONFIG = {
     'logfile': '/var/log/wazo-agentd.log',
     'config_file': '/etc/wazo-agentd/config.yml',
     'extra_config_files': '/etc/wazo-agentd/conf.d/',
-    'amid': {'host': 'localhost', 'port': 9491, 'prefix': None, 'https': False},
+    'amid': {
+        'host': 'localhost',
+        'port': 9491,
+        'prefix': None,
+        'https': False,
+        'max_concurrent_actions': 10,
+        'pool_size': None,
+    },
     'auth': {
         'host': 'localhost',
         'port': 9497,
@@ -29,6 +36,34 @@ _DEFAULT_CONFIG = {
         'exchange_name': 'wazo-headers',
         'exchange_type': 'headers',
     },
+    'bulk_operations': {
+        'max_concurrency': 10,
+    },
+    'exten_features': {
+        'cache_ttl': 300,
+    },
+    'jobs': {
+        'max_concurrent_jobs': 2,
+        'max_finished_jobs': 100,
+    },
+    'locks': {
+        'hold_warning_threshold': 1.0,
+    },
+    'pause_events': {
+        'coalescing_window': 1.0,
+        'per_queue_events': False,
+    },
+    'queue_log': {
+        'max_batch_size': 100,
+        'flush_interval': 0.5,
+    },
+    'reconciliation': {
+        'enabled': True,
+        'interval': 300,
+    },
+    'status_versions': {
+        'max_tracked_agents': 10000,
+    },
     'rest_api': {
         'listen': '127.0.0.1',
         'port': _DEFAULT_HTTP_PORT,
@@ -40,6 +75,9 @@ _DEFAULT_CONFIG = {
         },
         'max_threads': 10,
     },
+    'bus_events': {
+        'workers': 4,
+    },
     'consul': {
         'scheme': 'http',
         'port': 8500,
@@ -48,6 +86,7 @@ _DEFAULT_CONFIG = {
         'agent': True,
         'agents': True,
         'api': True,
+        'metrics': True,
         'status': True,
     },
     'service_discovery': {
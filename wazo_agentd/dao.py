@@ -1,7 +1,20 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from collections import namedtuple
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+from sqlalchemy import false, func
+from sqlalchemy.dialects.postgresql import insert
+from xivo_dao.alchemy.agent_login_status import AgentLoginStatus
+from xivo_dao.alchemy.agent_membership_status import AgentMembershipStatus
+from xivo_dao.alchemy.agentfeatures import AgentFeatures
+from xivo_dao.alchemy.queue_log import QueueLog
+from xivo_dao.alchemy.queuefeatures import QueueFeatures
+from xivo_dao.alchemy.queuemember import QueueMember
+from xivo_dao.alchemy.userfeatures import UserFeatures
+from xivo_dao.helpers.db_manager import Session
 
 from wazo_agentd.exception import (
     NoSuchAgentError,
@@ -9,8 +22,28 @@ from wazo_agentd.exception import (
     NoSuchQueueError,
 )
 
+_Agent = namedtuple('_Agent', ['id', 'tenant_uuid', 'number', 'queues', 'user_ids'])
 _Queue = namedtuple('_Queue', ['id', 'tenant_uuid', 'name', 'penalty'])
 
+AgentStatus = namedtuple(
+    'AgentStatus',
+    [
+        'agent_id',
+        'agent_number',
+        'tenant_uuid',
+        'extension',
+        'context',
+        'interface',
+        'state_interface',
+        'login_at',
+        'paused',
+        'paused_reason',
+        'queues',
+        'user_ids',
+        'user_uuids',
+    ],
+)
+
 
 class _AbstractDAOAdapter:
     def __init__(self, dao):
@@ -39,13 +72,275 @@ class AgentDAOAdapter(_AbstractDAOAdapter):
         except LookupError:
             raise NoSuchAgentError()
 
+    def get_agents(self, agent_ids, tenant_uuids=None, ignore_missing=False):
+        # Same as get_agent for many agents, with their queues and users, in three
+        # queries. Raises NoSuchAgentError if any of them is not found, unless
+        # ignore_missing is set: the missing agents are then left out.
+        agent_ids = set(agent_ids)
+        session = Session()
+        query = session.query(AgentFeatures).filter(AgentFeatures.id.in_(agent_ids))
+        if tenant_uuids is not None:
+            query = query.filter(AgentFeatures.tenant_uuid.in_(tenant_uuids))
+        agents = query.all()
+        if len(agents) != len(agent_ids) and not ignore_missing:
+            raise NoSuchAgentError()
+
+        queues = defaultdict(list)
+        members = (
+            session.query(QueueMember, QueueFeatures)
+            .join(QueueFeatures, QueueFeatures.name == QueueMember.queue_name)
+            .filter(QueueMember.usertype == 'agent')
+            .filter(QueueMember.category == 'queue')
+            .filter(QueueMember.userid.in_(agent_ids))
+        )
+        for member, queue in members:
+            queues[member.userid].append(
+                _Queue(queue.id, queue.tenant_uuid, queue.name, member.penalty)
+            )
+
+        user_ids = defaultdict(list)
+        users = session.query(UserFeatures.agentid, UserFeatures.id).filter(
+            UserFeatures.agentid.in_(agent_ids)
+        )
+        for agent_id, user_id in users:
+            user_ids[agent_id].append(user_id)
+
+        return {
+            agent.id: _Agent(
+                id=agent.id,
+                tenant_uuid=agent.tenant_uuid,
+                number=agent.number,
+                queues=queues[agent.id],
+                user_ids=user_ids[agent.id],
+            )
+            for agent in agents
+        }
+
+    def find_agents(self, agent_ids=(), agent_numbers=(), tenant_uuids=None):
+        # Agents matching any of the IDs or numbers, unknown ones are ignored
+        agents = []
+        for column, values in (
+            (AgentFeatures.id, agent_ids),
+            (AgentFeatures.number, agent_numbers),
+        ):
+            if not values:
+                continue
+            query = Session().query(AgentFeatures).filter(column.in_(set(values)))
+            if tenant_uuids is not None:
+                query = query.filter(AgentFeatures.tenant_uuid.in_(tenant_uuids))
+            agents.extend(query.all())
+        return agents
+
+
+class AgentStatusDAOAdapter(_AbstractDAOAdapter):
+    def get_statuses(
+        self,
+        tenant_uuids=None,
+        agent_ids=None,
+        logged=None,
+        paused=None,
+        queue_id=None,
+        context=None,
+        limit=None,
+        offset=None,
+    ):
+        # Same as the DAO get_statuses, with the filters and the pagination done
+        # in the query. Agents are ordered by ID.
+        session = Session()
+        logged_column = AgentLoginStatus.agent_id.isnot(None)
+        paused_column = func.coalesce(AgentLoginStatus.paused, false())
+        query = (
+            session.query(
+                AgentFeatures.id.label('agent_id'),
+                AgentFeatures.tenant_uuid.label('tenant_uuid'),
+                AgentFeatures.number.label('agent_number'),
+                logged_column.label('logged'),
+                paused_column.label('paused'),
+                AgentLoginStatus.paused_reason.label('paused_reason'),
+                AgentLoginStatus.extension.label('extension'),
+                AgentLoginStatus.context.label('context'),
+                AgentLoginStatus.state_interface.label('state_interface'),
+            )
+            .outerjoin(AgentLoginStatus, AgentLoginStatus.agent_id == AgentFeatures.id)
+            .order_by(AgentFeatures.id)
+        )
+        if tenant_uuids is not None:
+            query = query.filter(AgentFeatures.tenant_uuid.in_(tenant_uuids))
+        if agent_ids is not None:
+            query = query.filter(AgentFeatures.id.in_(agent_ids))
+        if logged is not None:
+            query = query.filter(logged_column == logged)
+        if paused is not None:
+            query = query.filter(paused_column == paused)
+        if context is not None:
+            query = query.filter(AgentLoginStatus.context == context)
+        if queue_id is not None:
+            members = (
+                session.query(QueueMember.userid)
+                .join(QueueFeatures, QueueFeatures.name == QueueMember.queue_name)
+                .filter(QueueMember.usertype == 'agent')
+                .filter(QueueMember.category == 'queue')
+                .filter(QueueFeatures.id == queue_id)
+            )
+            query = query.filter(AgentFeatures.id.in_(members))
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def get_logged_statuses(self, tenant_uuids=None):
+        # The status of every logged agent, with its queues and users, in three
+        # queries instead of a get_status call per agent
+        session = Session()
+        query = session.query(
+            AgentLoginStatus, AgentFeatures.tenant_uuid, AgentFeatures.number
+        ).join(AgentFeatures, AgentFeatures.id == AgentLoginStatus.agent_id)
+        if tenant_uuids is not None:
+            query = query.filter(AgentFeatures.tenant_uuid.in_(tenant_uuids))
+        login_statuses = query.all()
+        if not login_statuses:
+            return []
+
+        agent_ids = [login_status.agent_id for login_status, _, _ in login_statuses]
+        queues = defaultdict(list)
+        memberships = (
+            session.query(AgentMembershipStatus, QueueFeatures.tenant_uuid)
+            .outerjoin(
+                QueueFeatures, QueueFeatures.id == AgentMembershipStatus.queue_id
+            )
+            .filter(AgentMembershipStatus.agent_id.in_(agent_ids))
+        )
+        for membership, queue_tenant_uuid in memberships:
+            queues[membership.agent_id].append(
+                _Queue(
+                    membership.queue_id,
+                    queue_tenant_uuid,
+                    membership.queue_name,
+                    membership.penalty,
+                )
+            )
+
+        user_ids = defaultdict(list)
+        user_uuids = defaultdict(list)
+        users = session.query(
+            UserFeatures.agentid, UserFeatures.id, UserFeatures.uuid
+        ).filter(UserFeatures.agentid.in_(agent_ids))
+        for agent_id, user_id, user_uuid in users:
+            user_ids[agent_id].append(user_id)
+            user_uuids[agent_id].append(str(user_uuid))
+
+        return [
+            AgentStatus(
+                agent_id=login_status.agent_id,
+                agent_number=agent_number,
+                tenant_uuid=tenant_uuid,
+                extension=login_status.extension,
+                context=login_status.context,
+                interface=login_status.interface,
+                state_interface=login_status.state_interface,
+                login_at=login_status.login_at,
+                paused=login_status.paused,
+                paused_reason=login_status.paused_reason,
+                queues=tuple(queues[login_status.agent_id]),
+                user_ids=tuple(user_ids[login_status.agent_id]),
+                user_uuids=tuple(user_uuids[login_status.agent_id]),
+            )
+            for login_status, tenant_uuid, agent_number in login_statuses
+        ]
+
+    def add_agents_to_queue(self, agent_ids, queue):
+        # The penalty of agents that are already members is updated
+        if not agent_ids:
+            return
+        rows = [
+            {
+                'agent_id': agent_id,
+                'queue_id': queue.id,
+                'queue_name': queue.name,
+                'penalty': queue.penalty,
+            }
+            for agent_id in dict.fromkeys(agent_ids)
+        ]
+        query = insert(AgentMembershipStatus.__table__).values(rows)
+        query = query.on_conflict_do_update(
+            index_elements=['agent_id', 'queue_id'],
+            set_={
+                'queue_name': query.excluded.queue_name,
+                'penalty': query.excluded.penalty,
+            },
+        )
+        Session().execute(query)
+
+    def remove_agents_from_queue(self, agent_ids, queue_id):
+        if not agent_ids:
+            return
+        (
+            Session()
+            .query(AgentMembershipStatus)
+            .filter(AgentMembershipStatus.queue_id == queue_id)
+            .filter(AgentMembershipStatus.agent_id.in_(agent_ids))
+            .delete(synchronize_session=False)
+        )
+
 
 class ExtenFeaturesDAOAdapter(_AbstractDAOAdapter):
+    # Feature extensions almost never change: they are cached for ttl seconds and
+    # the cache is cleared when an extension feature is edited. A ttl of 0
+    # disables the cache.
+
+    def __init__(self, dao, ttl=300):
+        super().__init__(dao)
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._extensions = {}
+        self._hits = 0
+        self._misses = 0
+
     def get_extension(self, feature_name):
-        for extension in self._dao.find_extenfeatures_settings([feature_name]):
-            return extension.exten
+        extension = self.get_extensions([feature_name]).get(feature_name)
+        if extension is None:
+            raise NoSuchExtenFeatureError()
+        return extension
+
+    def get_extensions(self, feature_names):
+        now = time.monotonic()
+        extensions = {}
+        missing = []
+        with self._lock:
+            for feature_name in feature_names:
+                cached = self._extensions.get(feature_name)
+                if cached is not None and cached[1] > now:
+                    extensions[feature_name] = cached[0]
+                else:
+                    missing.append(feature_name)
+            self._hits += len(extensions)
+            self._misses += len(missing)
+
+        if missing:
+            found = {
+                extension.typeval: extension.exten
+                for extension in self._dao.find_extenfeatures_settings(missing)
+            }
+            expires_at = now + self._ttl
+            with self._lock:
+                for feature_name in missing:
+                    extension = found.get(feature_name)
+                    if self._ttl:
+                        self._extensions[feature_name] = (extension, expires_at)
+                    extensions[feature_name] = extension
 
-        raise NoSuchExtenFeatureError()
+        return {name: exten for name, exten in extensions.items() if exten is not None}
+
+    def invalidate(self, *args):
+        with self._lock:
+            self._extensions.clear()
+
+    def provide_status(self, status):
+        with self._lock:
+            status['extension_features_cache']['hits'] = self._hits
+            status['extension_features_cache']['misses'] = self._misses
+            status['extension_features_cache']['size'] = len(self._extensions)
 
 
 class QueueDAOAdapter(_AbstractDAOAdapter):
@@ -57,3 +352,23 @@ class QueueDAOAdapter(_AbstractDAOAdapter):
             return _Queue(queue.id, queue.tenant_uuid, queue.name, self._PENALTY)
         except LookupError:
             raise NoSuchQueueError()
+
+    def get_queues(self, queue_ids, tenant_uuids=None):
+        queue_ids = set(queue_ids)
+        query = Session().query(QueueFeatures).filter(QueueFeatures.id.in_(queue_ids))
+        if tenant_uuids is not None:
+            query = query.filter(QueueFeatures.tenant_uuid.in_(tenant_uuids))
+        queues = query.all()
+        if len(queues) != len(queue_ids):
+            raise NoSuchQueueError()
+
+        return {
+            queue.id: _Queue(queue.id, queue.tenant_uuid, queue.name, self._PENALTY)
+            for queue in queues
+        }
+
+
+class QueueLogDAOAdapter(_AbstractDAOAdapter):
+    def insert_entries(self, entries):
+        rows = [entry._asdict() for entry in entries]
+        Session().execute(QueueLog.__table__.insert().values(rows))
@@ -1,4 +1,4 @@
-# Copyright 2012-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2012-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 # The following strings are part of the exposed HTTP API; don't rename them
@@ -6,6 +6,7 @@
 NO_SUCH_AGENT = 'no such agent'
 NO_SUCH_LINE = 'no such line'
 NO_SUCH_QUEUE = 'no such queue'
+NO_SUCH_JOB = 'no such job'
 ALREADY_LOGGED = 'already logged'
 NOT_LOGGED = 'not logged in'
 ALREADY_IN_USE = 'extension and context already in use'
@@ -36,6 +37,10 @@ class NoSuchQueueError(AgentServerError):
     error = NO_SUCH_QUEUE
 
 
+class NoSuchJobError(AgentServerError):
+    error = NO_SUCH_JOB
+
+
 class AgentNotLoggedError(AgentServerError):
     error = NOT_LOGGED
 
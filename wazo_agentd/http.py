@@ -1,4 +1,4 @@
-# Copyright 2013-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -30,6 +30,7 @@ from wazo_agentd.exception import (
     ExtensionAlreadyInUseError,
     NoSuchAgentError,
     NoSuchExtensionError,
+    NoSuchJobError,
     NoSuchLineError,
     NoSuchQueueError,
     QueueDifferentTenantError,
@@ -38,7 +39,12 @@ from wazo_agentd.exception import (
 logger = logging.getLogger(__name__)
 
 
-_AGENT_404_ERRORS = (NoSuchAgentError, NoSuchExtensionError, NoSuchQueueError)
+_AGENT_404_ERRORS = (
+    NoSuchAgentError,
+    NoSuchExtensionError,
+    NoSuchJobError,
+    NoSuchQueueError,
+)
 _AGENT_409_ERRORS = (
     AgentAlreadyLoggedError,
     AgentNotLoggedError,
@@ -55,6 +61,17 @@ _AGENT_400_ERRORS = (
 
 _status_aggregator = None
 
+
+def error_status_code(error):
+    if isinstance(error, _AGENT_400_ERRORS):
+        return 400
+    if isinstance(error, _AGENT_404_ERRORS):
+        return 404
+    if isinstance(error, _AGENT_409_ERRORS):
+        return 409
+    return 500
+
+
 auth_verifier = AuthVerifierFlask()
 
 
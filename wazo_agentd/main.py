@@ -1,4 +1,4 @@
-# Copyright 2012-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2012-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -8,10 +8,19 @@ import threading
 from functools import partial
 
 import xivo_dao
-from wazo_amid_client import Client as AmidClient
 from wazo_auth_client import Client as AuthClient
-from wazo_bus.resources.agent.event import AgentDeletedEvent, AgentEditedEvent
+from wazo_bus.resources.agent.event import (
+    AgentCreatedEvent,
+    AgentDeletedEvent,
+    AgentEditedEvent,
+)
+from wazo_bus.resources.extension_feature.event import ExtensionFeatureEditedEvent
 from wazo_bus.resources.queue.event import QueueDeletedEvent, QueueEditedEvent
+from wazo_bus.resources.user.event import UserDeletedEvent
+from wazo_bus.resources.user_agent.event import (
+    UserAgentAssociatedEvent,
+    UserAgentDissociatedEvent,
+)
 from xivo import plugin_helpers
 from xivo.config_helper import set_xivo_uuid
 from xivo.consul_helpers import ServiceCatalogRegistration
@@ -20,15 +29,31 @@ from xivo.token_renewer import TokenRenewer
 from xivo.user_rights import change_user
 from xivo.xivo_logging import setup_logging, silence_loggers
 from xivo_dao import agent_dao as orig_agent_dao
-from xivo_dao import agent_status_dao, asterisk_conf_dao, context_dao, line_dao
+from xivo_dao import agent_status_dao as orig_agent_status_dao
+from xivo_dao import asterisk_conf_dao, context_dao, line_dao
 from xivo_dao import queue_dao as orig_queue_dao
-from xivo_dao import queue_log_dao, queue_member_dao
+from xivo_dao import queue_log_dao as orig_queue_log_dao
+from xivo_dao import queue_member_dao
+from xivo_dao.helpers.db_manager import Session
 from xivo_dao.resources.user import dao as user_dao
 
 from wazo_agentd import http
-from wazo_agentd.bus import BusConsumer, BusPublisher, QueueMemberPausedEvent
+from wazo_agentd.ami import AmidClient
+from wazo_agentd.bus import (
+    BusConsumer,
+    BusEventDispatcher,
+    BusPublisher,
+    QueueMemberPausedEvent,
+)
 from wazo_agentd.config import load as load_config
-from wazo_agentd.dao import AgentDAOAdapter, ExtenFeaturesDAOAdapter, QueueDAOAdapter
+from wazo_agentd.dao import (
+    AgentDAOAdapter,
+    AgentStatusDAOAdapter,
+    ExtenFeaturesDAOAdapter,
+    QueueDAOAdapter,
+    QueueLogDAOAdapter,
+)
+from wazo_agentd.metrics import LOCK_WAITING, instrument_db_sessions, register_collector
 from wazo_agentd.queuelog import QueueLogManager
 from wazo_agentd.service.action.add import AddToQueueAction
 from wazo_agentd.service.action.login import LoginAction
@@ -36,14 +61,19 @@ from wazo_agentd.service.action.logoff import LogoffAction
 from wazo_agentd.service.action.pause import PauseAction
 from wazo_agentd.service.action.remove import RemoveFromQueueAction
 from wazo_agentd.service.action.update import UpdatePenaltyAction
+from wazo_agentd.service.batch import BatchExecutor
+from wazo_agentd.service.bulk import BulkExecutor
 from wazo_agentd.service.handler.login import LoginHandler
 from wazo_agentd.service.handler.logoff import LogoffHandler
 from wazo_agentd.service.handler.membership import MembershipHandler
 from wazo_agentd.service.handler.on_agent import OnAgentHandler
-from wazo_agentd.service.handler.on_queue import OnQueueHandler
+from wazo_agentd.service.handler.on_queue import AGENT_ID_FROM_IFACE, OnQueueHandler
 from wazo_agentd.service.handler.pause import PauseHandler
+from wazo_agentd.service.handler.reconcile import ReconcileHandler
 from wazo_agentd.service.handler.relog import RelogHandler
 from wazo_agentd.service.handler.status import StatusHandler
+from wazo_agentd.service.job import JobScheduler
+from wazo_agentd.service.lock import LockManager
 from wazo_agentd.service.manager.add_member import AddMemberManager
 from wazo_agentd.service.manager.blf import BLFManager
 from wazo_agentd.service.manager.login import LoginManager
@@ -55,10 +85,13 @@ from wazo_agentd.service.manager.on_queue_agent_paused import OnQueueAgentPaused
 from wazo_agentd.service.manager.on_queue_deleted import OnQueueDeletedManager
 from wazo_agentd.service.manager.on_queue_updated import OnQueueUpdatedManager
 from wazo_agentd.service.manager.pause import PauseManager
+from wazo_agentd.service.manager.reconcile import ReconcileManager
 from wazo_agentd.service.manager.relog import RelogManager
 from wazo_agentd.service.manager.remove_member import RemoveMemberManager
 from wazo_agentd.service.proxy import ServiceProxy
+from wazo_agentd.service.reconcile import ReconcileScheduler
 from wazo_agentd.service_discovery import self_check
+from wazo_agentd.store import AgentStatusStore
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +107,7 @@ def main(argv=None):
         change_user(user)
 
     xivo_dao.init_db_from_config(config)
+    instrument_db_sessions(Session)
 
     setup_logging(config['logfile'], debug=config['debug'])
     silence_loggers(['Flask-Cors', 'amqp'], logging.WARNING)
@@ -85,8 +119,12 @@ def main(argv=None):
 def _run(config):
     xivo_uuid = config['uuid']
     agent_dao = AgentDAOAdapter(orig_agent_dao)
+    agent_status_dao = AgentStatusDAOAdapter(orig_agent_status_dao)
     queue_dao = QueueDAOAdapter(orig_queue_dao)
-    exten_features_dao = ExtenFeaturesDAOAdapter(asterisk_conf_dao)
+    exten_features_dao = ExtenFeaturesDAOAdapter(
+        asterisk_conf_dao, ttl=config['exten_features']['cache_ttl']
+    )
+    queue_log_dao = QueueLogDAOAdapter(orig_queue_log_dao)
     amid_client = AmidClient(**config['amid'])
     auth_client = AuthClient(**config['auth'])
     token_renewer = TokenRenewer(auth_client)
@@ -98,18 +136,21 @@ def _run(config):
     bus_consumer = BusConsumer.from_config(config['bus'])
     bus_publisher = BusPublisher.from_config(xivo_uuid, config['bus'])
 
+    agent_status_store = AgentStatusStore(
+        agent_status_dao, agent_dao, user_dao, **config['status_versions']
+    )
+    agent_status_store.load()
+
     blf_manager = BLFManager(amid_client, exten_features_dao)
-    queue_log_manager = QueueLogManager(queue_log_dao)
+    queue_log_manager = QueueLogManager(queue_log_dao, **config['queue_log'])
 
-    add_to_queue_action = AddToQueueAction(amid_client, agent_status_dao)
+    add_to_queue_action = AddToQueueAction(amid_client, agent_status_store)
     login_action = LoginAction(
         amid_client,
         queue_log_manager,
         blf_manager,
-        agent_status_dao,
+        agent_status_store,
         line_dao,
-        user_dao,
-        agent_dao,
         bus_publisher,
     )
     pause_action = PauseAction(amid_client)
@@ -119,44 +160,65 @@ def _run(config):
         queue_log_manager,
         blf_manager,
         pause_manager,
-        agent_status_dao,
-        user_dao,
-        agent_dao,
+        agent_status_store,
         bus_publisher,
     )
-    remove_from_queue_action = RemoveFromQueueAction(amid_client, agent_status_dao)
-    update_penalty_action = UpdatePenaltyAction(amid_client, agent_status_dao)
+    remove_from_queue_action = RemoveFromQueueAction(amid_client, agent_status_store)
+    update_penalty_action = UpdatePenaltyAction(amid_client, agent_status_store)
+
+    bulk_executor = BulkExecutor(**config['bulk_operations'])
 
     add_member_manager = AddMemberManager(
-        add_to_queue_action, amid_client, agent_status_dao, queue_member_dao
+        add_to_queue_action, amid_client, agent_status_store, queue_member_dao
+    )
+    login_manager = LoginManager(
+        login_action, agent_status_store, context_dao, line_dao
     )
-    login_manager = LoginManager(login_action, agent_status_dao, context_dao, line_dao)
-    logoff_manager = LogoffManager(logoff_action, agent_dao, agent_status_dao)
-    on_agent_deleted_manager = OnAgentDeletedManager(logoff_manager, agent_status_dao)
+    logoff_manager = LogoffManager(
+        logoff_action, agent_dao, agent_status_store, bulk_executor
+    )
+    on_agent_deleted_manager = OnAgentDeletedManager(logoff_manager, agent_status_store)
     on_agent_updated_manager = OnAgentUpdatedManager(
         add_to_queue_action,
         remove_from_queue_action,
         update_penalty_action,
-        agent_status_dao,
+        agent_status_store,
+    )
+    on_queue_added_manager = OnQueueAddedManager(
+        add_to_queue_action, agent_status_store
     )
-    on_queue_added_manager = OnQueueAddedManager(add_to_queue_action, agent_status_dao)
-    on_queue_deleted_manager = OnQueueDeletedManager(agent_status_dao)
+    on_queue_deleted_manager = OnQueueDeletedManager(agent_status_store)
     on_queue_updated_manager = OnQueueUpdatedManager(
-        add_to_queue_action, remove_from_queue_action, agent_status_dao
+        add_to_queue_action, remove_from_queue_action, agent_status_store
     )
     on_queue_agent_paused_manager = OnQueueAgentPausedManager(
-        agent_status_dao, user_dao, agent_dao, bus_publisher
+        agent_status_store,
+        bus_publisher,
+        **config['pause_events'],
     )
     relog_manager = RelogManager(
-        login_action, logoff_action, agent_dao, agent_status_dao
+        login_action,
+        logoff_action,
+        on_agent_updated_manager,
+        agent_dao,
+        agent_status_store,
+        bulk_executor,
     )
     remove_member_manager = RemoveMemberManager(
-        remove_from_queue_action, amid_client, agent_status_dao, queue_member_dao
+        remove_from_queue_action, amid_client, agent_status_store, queue_member_dao
+    )
+    reconcile_manager = ReconcileManager(
+        add_to_queue_action,
+        remove_from_queue_action,
+        update_penalty_action,
+        amid_client,
+        agent_status_store,
     )
 
-    service_proxy = ServiceProxy()
+    lock_manager = LockManager(**config['locks'])
+    service_proxy = ServiceProxy(agent_dao, agent_status_store, line_dao, lock_manager)
     service_proxy.login_handler = LoginHandler(login_manager, agent_dao)
-    service_proxy.logoff_handler = LogoffHandler(logoff_manager, agent_status_dao)
+    service_proxy.logoff_handler = LogoffHandler(logoff_manager, agent_status_store)
     service_proxy.membership_handler = MembershipHandler(
         add_member_manager, remove_member_manager, agent_dao, queue_dao
     )
@@ -171,14 +233,34 @@ def _run(config):
         queue_dao,
         agent_dao,
     )
-    service_proxy.pause_handler = PauseHandler(pause_manager, agent_status_dao)
+    service_proxy.pause_handler = PauseHandler(pause_manager, agent_status_store)
+    service_proxy.reconcile_handler = ReconcileHandler(reconcile_manager)
     service_proxy.relog_handler = RelogHandler(relog_manager)
-    service_proxy.status_handler = StatusHandler(agent_dao, agent_status_dao, xivo_uuid)
+    service_proxy.status_handler = StatusHandler(
+        agent_dao, agent_status_store, xivo_uuid
+    )
 
-    _init_bus_consume(bus_consumer, service_proxy)
+    batch_executor = BatchExecutor(
+        service_proxy, agent_dao, **config['bulk_operations']
+    )
+    job_scheduler = JobScheduler(bus_publisher, **config['jobs'])
+    reconcile_scheduler = ReconcileScheduler(service_proxy, **config['reconciliation'])
+    token_renewer.subscribe_to_next_token_change(reconcile_scheduler.run_now)
+
+    event_dispatcher = BusEventDispatcher(**config['bus_events'])
+    _init_bus_consume(bus_consumer, event_dispatcher, service_proxy)
+    _init_agent_status_store(bus_consumer, event_dispatcher, agent_status_store)
+    bus_consumer.subscribe(
+        ExtensionFeatureEditedEvent.name, exten_features_dao.invalidate
+    )
     token_renewer.subscribe_to_token_change(token_status.token_change_callback)
     status_aggregator.add_provider(bus_consumer.provide_status)
+    status_aggregator.add_provider(event_dispatcher.provide_status)
     status_aggregator.add_provider(token_status.provide_status)
+    status_aggregator.add_provider(exten_features_dao.provide_status)
+    status_aggregator.add_provider(lock_manager.provide_status)
+    LOCK_WAITING.set_function(lock_manager.count_waiting)
+    register_collector(amid_client.collect_metrics)
 
     http_iface = http.HTTPInterface(
         config, service_proxy, auth_client, status_aggregator
@@ -201,8 +283,10 @@ def _run(config):
             'ami': amid_client,
             'auth': auth_client,
             'bus_consumer': bus_consumer,
+            'batch_executor': batch_executor,
             'bus_publisher': bus_publisher,
             'config': config,
+            'job_scheduler': job_scheduler,
             'token_changed_subscribe': token_renewer.subscribe_to_token_change,
             'next_token_changed_subscribe': token_renewer.subscribe_to_next_token_change,
             'status_aggregator': status_aggregator,
@@ -222,21 +306,69 @@ def _run(config):
 
     logger.info('wazo-agentd starting...')
     try:
-        with token_renewer:
-            with bus_consumer:
-                with ServiceCatalogRegistration(*service_discovery_args):
-                    http_iface.run()
+        with queue_log_manager:
+            with token_renewer:
+                with event_dispatcher:
+                    with bus_consumer:
+                        with job_scheduler, reconcile_scheduler:
+                            with ServiceCatalogRegistration(*service_discovery_args):
+                                http_iface.run()
     finally:
         _stopping_thread.join()
 
 
-def _init_bus_consume(bus_consumer, service_proxy):
+def _init_bus_consume(bus_consumer, event_dispatcher, service_proxy):
     events = (
-        (AgentEditedEvent, service_proxy.on_agent_updated),
-        (AgentDeletedEvent, service_proxy.on_agent_deleted),
-        (QueueEditedEvent, service_proxy.on_queue_updated),
-        (QueueDeletedEvent, service_proxy.on_queue_deleted),
-        (QueueMemberPausedEvent, service_proxy.on_agent_paused),
-    )
-    for event, action in events:
-        bus_consumer.subscribe(event.name, action)
+        (AgentEditedEvent, _agent_key, service_proxy.on_agent_updated),
+        (AgentDeletedEvent, _agent_key, service_proxy.on_agent_deleted),
+        (QueueEditedEvent, _queue_key, service_proxy.on_queue_updated),
+        (QueueDeletedEvent, _queue_key, service_proxy.on_queue_deleted),
+        (QueueMemberPausedEvent, _queue_member_key, service_proxy.on_agent_paused),
+    )
+    for event, key, action in events:
+        bus_consumer.subscribe(event.name, event_dispatcher.partitioned(key, action))
+
+
+def _init_agent_status_store(bus_consumer, event_dispatcher, agent_status_store):
+    events = (
+        (AgentCreatedEvent, _agent_key, agent_status_store.on_agent_created),
+        (AgentEditedEvent, _agent_key, agent_status_store.on_agent_edited),
+        (AgentDeletedEvent, _agent_key, agent_status_store.on_agent_deleted),
+        (
+            UserAgentAssociatedEvent,
+            _association_agent_key,
+            agent_status_store.on_user_agent_association_changed,
+        ),
+        (
+            UserAgentDissociatedEvent,
+            _association_agent_key,
+            agent_status_store.on_user_agent_association_changed,
+        ),
+        (UserDeletedEvent, _user_key, agent_status_store.on_user_deleted),
+        (QueueEditedEvent, _queue_key, agent_status_store.on_queue_changed),
+        (QueueDeletedEvent, _queue_key, agent_status_store.on_queue_changed),
+    )
+    for event, key, action in events:
+        bus_consumer.subscribe(event.name, event_dispatcher.partitioned(key, action))
+
+
+def _agent_key(agent):
+    return ('agent', agent['id'])
+
+
+def _association_agent_key(association):
+    return ('agent', association['agent_id'])
+
+
+def _queue_key(queue):
+    return ('queue', queue['id'])
+
+
+def _queue_member_key(msg):
+    if matches := AGENT_ID_FROM_IFACE.match(msg.get('Interface', '')):
+        return ('agent', int(matches.group(1)))
+    return ('member', msg.get('MemberName'))
+
+
+def _user_key(user):
+    return ('user', user['uuid'])
@@ -0,0 +1,100 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import time
+
+from prometheus_client import REGISTRY, Gauge, Histogram
+from sqlalchemy import event
+
+BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class _FunctionCollector:
+    def __init__(self, function):
+        self.collect = function
+
+    def describe(self):
+        # Nothing is collected when the collector is registered
+        return []
+
+
+def register_collector(function, registry=REGISTRY):
+    # function returns the metric families computed from a current state, each
+    # time the metrics are collected
+    registry.register(_FunctionCollector(function))
+
+
+def instrument_db_sessions(session):
+    event.listen(session, 'after_begin', _on_session_begin)
+    event.listen(session, 'after_commit', _on_session_end)
+    event.listen(session, 'after_rollback', _on_session_end)
+
+
+def _on_session_begin(session, *args):
+    session.info.setdefault('metrics_started_at', time.monotonic())
+
+
+def _on_session_end(session):
+    started = session.info.pop('metrics_started_at', None)
+    if started is not None:
+        DB_SESSION_DURATION.observe(time.monotonic() - started)
+
+
+SERVICE_OPERATION_DURATION = Histogram(
+    'agentd_service_operation_duration_seconds',
+    'Duration of the agent operations, including the time waiting for locks',
+    ['operation'],
+    buckets=BUCKETS,
+)
+AMI_ACTION_DURATION = Histogram(
+    'agentd_ami_action_duration_seconds',
+    'Duration of the AMI actions sent through wazo-amid',
+    ['action'],
+    buckets=BUCKETS,
+)
+DB_SESSION_DURATION = Histogram(
+    'agentd_db_session_duration_seconds',
+    'Duration of the database transactions',
+    buckets=BUCKETS,
+)
+LOCK_WAIT_DURATION = Histogram(
+    'agentd_lock_wait_seconds',
+    'Time spent waiting for the agent, queue and global locks',
+    ['operation', 'mode'],
+    buckets=BUCKETS,
+)
+LOCK_HOLD_DURATION = Histogram(
+    'agentd_lock_hold_seconds',
+    'Time during which the agent, queue and global locks are held',
+    ['operation', 'mode'],
+    buckets=BUCKETS,
+)
+LOCK_WAITING = Gauge(
+    'agentd_lock_waiting',
+    'Number of operations waiting for a lock',
+)
+BUS_PUBLISH_DURATION = Histogram(
+    'agentd_bus_publish_duration_seconds',
+    'Duration of the publication of bus events',
+    ['event'],
+    buckets=BUCKETS,
+)
+RECONCILIATION_DRIFT = Gauge(
+    'agentd_reconciliation_drift',
+    'Number of differences between the agents and Asterisk found by the last reconciliation',
+    ['kind'],
+)
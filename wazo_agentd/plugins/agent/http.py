@@ -11,6 +11,7 @@ from .schemas import (
     agent_login_schema,
     pause_schema,
     queue_schema,
+    queues_schema,
     user_agent_login_schema,
 )
 
@@ -133,6 +134,26 @@ class RemoveAgentFromQueue(_BaseAgentResource):
         return '', 204
 
 
+class AddAgentToQueues(_BaseAgentResource):
+    @required_acl('agentd.agents.by-id.{agent_id}.add.create')
+    def post(self, agent_id):
+        body = queues_schema.load(request.get_json())
+        tenant_uuids = self._build_tenant_list({'recurse': True})
+        members = [(agent_id, queue_id) for queue_id in body['queue_ids']]
+        self.service_proxy.add_agents_to_queues(members, tenant_uuids=tenant_uuids)
+        return '', 204
+
+
+class RemoveAgentFromQueues(_BaseAgentResource):
+    @required_acl('agentd.agents.by-id.{agent_id}.delete.create')
+    def post(self, agent_id):
+        body = queues_schema.load(request.get_json())
+        tenant_uuids = self._build_tenant_list({'recurse': True})
+        members = [(agent_id, queue_id) for queue_id in body['queue_ids']]
+        self.service_proxy.remove_agents_from_queues(members, tenant_uuids=tenant_uuids)
+        return '', 204
+
+
 class PauseAgentByNumber(_BaseAgentResource):
     @required_acl('agentd.agents.by-number.{agent_number}.pause.create')
     def post(self, agent_number):
@@ -1,8 +1,9 @@
-# Copyright 2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2024-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from .http import (
     AddAgentToQueue,
+    AddAgentToQueues,
     AgentById,
     AgentByNumber,
     LoginAgentById,
@@ -14,6 +15,7 @@ from .http import (
     PauseAgentByNumber,
     PauseUserAgent,
     RemoveAgentFromQueue,
+    RemoveAgentFromQueues,
     UnpauseAgentByNumber,
     UnpauseUserAgent,
     UserAgent,
@@ -103,6 +105,18 @@ class Plugin:
             resource_class_args=[service_proxy],
         )
 
+        api.add_resource(
+            AddAgentToQueues,
+            '/agents/by-id/<int:agent_id>/queues/add',
+            resource_class_args=[service_proxy],
+        )
+
+        api.add_resource(
+            RemoveAgentFromQueues,
+            '/agents/by-id/<int:agent_id>/queues/remove',
+            resource_class_args=[service_proxy],
+        )
+
         api.add_resource(
             PauseAgentByNumber,
             '/agents/by-number/<agent_number>/pause',
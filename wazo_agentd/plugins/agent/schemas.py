@@ -1,4 +1,4 @@
-# Copyright 2020-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2020-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo.mallow import fields, validate
@@ -24,7 +24,14 @@ class QueueSchema(Schema):
     queue_id = fields.Integer(required=True)
 
 
+class QueuesSchema(Schema):
+    queue_ids = fields.List(
+        fields.Integer(), required=True, validate=validate.Length(min=1)
+    )
+
+
 agent_login_schema = AgentLoginSchema()
 pause_schema = PauseSchema()
 queue_schema = QueueSchema()
+queues_schema = QueuesSchema()
 user_agent_login_schema = UserAgentLoginSchema()
@@ -0,0 +1,44 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from flask import Flask
+from flask_restful import Api
+from hamcrest import assert_that, contains_inanyorder
+
+from wazo_agentd.plugins.agent.plugin import Plugin
+
+
+class TestPlugin(unittest.TestCase):
+    def test_load(self):
+        app = Flask(__name__)
+        api = Api(app)
+
+        Plugin().load({'api': api, 'service_proxy': Mock()})
+
+        rules = [rule.rule for rule in app.url_map.iter_rules()]
+        assert_that(
+            rules,
+            contains_inanyorder(
+                '/static/<path:filename>',
+                '/agents/by-id/<int:agent_id>',
+                '/agents/by-number/<agent_number>',
+                '/users/me/agents',
+                '/agents/by-id/<int:agent_id>/login',
+                '/agents/by-number/<agent_number>/login',
+                '/users/me/agents/login',
+                '/agents/by-id/<int:agent_id>/logoff',
+                '/agents/by-number/<agent_number>/logoff',
+                '/users/me/agents/logoff',
+                '/users/me/agents/pause',
+                '/users/me/agents/unpause',
+                '/agents/by-id/<int:agent_id>/add',
+                '/agents/by-id/<int:agent_id>/remove',
+                '/agents/by-id/<int:agent_id>/queues/add',
+                '/agents/by-id/<int:agent_id>/queues/remove',
+                '/agents/by-number/<agent_number>/pause',
+                '/agents/by-number/<agent_number>/unpause',
+            ),
+        )
@@ -1,9 +1,65 @@
-# Copyright 2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2024-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from flask import request
 from xivo.auth_verifier import required_acl
+from xivo.tenant_flask_helpers import Tenant
 
-from wazo_agentd.http import AuthResource
+from wazo_agentd.http import AuthResource, error_status_code
+from wazo_agentd.service.batch import BatchOperation
+
+from .schemas import (
+    agents_list_schema,
+    batch_schema,
+    bulk_operation_schema,
+    members_schema,
+    relog_schema,
+)
+
+
+def _format_result(result):
+    return {
+        'id': result.agent_id,
+        'number': result.agent_number,
+        'success': result.error is None,
+        'error': result.error,
+    }
+
+
+def _format_bulk_results(results):
+    return {
+        'total': len(results),
+        'failed': sum(1 for result in results if result.error),
+        'items': [_format_result(result) for result in results],
+    }
+
+
+def _format_job(job):
+    return {
+        'uuid': job.uuid,
+        'operation': job.operation,
+        'status': job.status,
+        'total': job.total,
+        'processed': job.processed,
+        'failed': job.failed,
+        'remaining': job.remaining,
+        'items': [_format_result(result) for result in list(job.results)],
+    }
+
+
+def _format_batch_result(result):
+    if result.error is None:
+        status, error = 204, None
+    else:
+        status = error_status_code(result.error)
+        error = getattr(result.error, 'error', None) or 'server error'
+    return {
+        'operation': result.operation,
+        'id': result.agent_id,
+        'number': result.agent_number,
+        'status': status,
+        'error': error,
+    }
 
 
 class _BaseAgentResource(AuthResource):
@@ -16,22 +72,131 @@ class Agents(_BaseAgentResource):
     def get(self):
         params = self.parse_params()
         tenant_uuids = self._build_tenant_list(params)
-        return self.service_proxy.get_agent_statuses(tenant_uuids=tenant_uuids)
+        args = agents_list_schema.load(request.args)
 
+        # The version is read first: a change made while the statuses are read
+        # gives a newer version, and the next request will get it
+        version = self.service_proxy.get_agent_statuses_version(
+            tenant_uuids=tenant_uuids
+        )
+        headers = {'ETag': f'"{version}"'}
+        if request.if_none_match.contains(str(version)):
+            return '', 304, headers
 
-class LogoffAgents(_BaseAgentResource):
-    @required_acl('agentd.agents.logoff.create')
-    def post(self):
+        filters = {
+            name: args[name]
+            for name in ('logged', 'paused', 'queue_id', 'context')
+            if args[name] is not None
+        }
+        statuses = self.service_proxy.get_agent_statuses(
+            tenant_uuids=tenant_uuids,
+            since_version=args['since_version'],
+            filters=filters,
+            limit=args['limit'],
+            offset=args['offset'],
+            fields=args['fields_'],
+        )
+        return statuses, 200, headers
+
+
+class _BulkOperationResource(_BaseAgentResource):
+    operation = None
+    schema = bulk_operation_schema
+
+    def __init__(self, service_proxy, job_scheduler):
+        super().__init__(service_proxy)
+        self.job_scheduler = job_scheduler
+
+    def _run(self, function):
         params = self.parse_params()
         tenant_uuids = self._build_tenant_list(params)
-        self.service_proxy.logoff_all(tenant_uuids=tenant_uuids)
-        return '', 204
+        # Arguments other than concurrency and async are passed to the operation
+        args = self.schema.load(request.args)
+        concurrency = args.pop('concurrency')
+        async_ = args.pop('async_')
+
+        if not async_:
+            results = function(
+                tenant_uuids=tenant_uuids, concurrency=concurrency, **args
+            )
+            return _format_bulk_results(results), 200
 
+        def run_job(job):
+            function(
+                tenant_uuids=tenant_uuids, concurrency=concurrency, job=job, **args
+            )
+
+        tenant_uuid = Tenant.autodetect().uuid
+        job = self.job_scheduler.submit(self.operation, tenant_uuid, run_job)
+        return _format_job(job), 202
+
+
+class LogoffAgents(_BulkOperationResource):
+    operation = 'logoff'
+
+    @required_acl('agentd.agents.logoff.create')
+    def post(self):
+        return self._run(self.service_proxy.logoff_all)
+
+
+class RelogAgents(_BulkOperationResource):
+    operation = 'relog'
+    schema = relog_schema
 
-class RelogAgents(_BaseAgentResource):
     @required_acl('agentd.agents.relog.create')
     def post(self):
+        return self._run(self.service_proxy.relog_all)
+
+
+def _load_members():
+    body = members_schema.load(request.get_json())
+    return [(member['agent_id'], member['queue_id']) for member in body['members']]
+
+
+class AddAgentsToQueues(_BaseAgentResource):
+    @required_acl('agentd.agents.queues.add.create')
+    def post(self):
+        members = _load_members()
+        tenant_uuids = self._build_tenant_list({'recurse': True})
+        self.service_proxy.add_agents_to_queues(members, tenant_uuids=tenant_uuids)
+        return '', 204
+
+
+class RemoveAgentsFromQueues(_BaseAgentResource):
+    @required_acl('agentd.agents.queues.remove.create')
+    def post(self):
+        members = _load_members()
+        tenant_uuids = self._build_tenant_list({'recurse': True})
+        self.service_proxy.remove_agents_from_queues(members, tenant_uuids=tenant_uuids)
+        return '', 204
+
+
+class AgentsBatch(AuthResource):
+    def __init__(self, batch_executor):
+        self.batch_executor = batch_executor
+
+    @required_acl('agentd.agents.batch.create')
+    def post(self):
+        body = batch_schema.load(request.get_json())
+        tenant_uuids = self._build_tenant_list({'recurse': True})
+        operations = [BatchOperation(**operation) for operation in body['operations']]
+        results = self.batch_executor.run(
+            operations, tenant_uuids=tenant_uuids, concurrency=body['concurrency']
+        )
+        return {
+            'total': len(results),
+            'failed': sum(1 for result in results if result.error),
+            'items': [_format_batch_result(result) for result in results],
+        }, 200
+
+
+class AgentsJob(AuthResource):
+    def __init__(self, job_scheduler):
+        self.job_scheduler = job_scheduler
+
+    @required_acl('agentd.jobs.{job_uuid}.read')
+    def get(self, job_uuid):
         params = self.parse_params()
         tenant_uuids = self._build_tenant_list(params)
-        self.service_proxy.relog_all(tenant_uuids=tenant_uuids)
-        return '', 204
+        job = self.job_scheduler.get(job_uuid, tenant_uuids=tenant_uuids)
+        return _format_job(job), 200
@@ -1,13 +1,23 @@
-# Copyright 2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2024-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from .http import Agents, LogoffAgents, RelogAgents
+from .http import (
+    AddAgentsToQueues,
+    Agents,
+    AgentsBatch,
+    AgentsJob,
+    LogoffAgents,
+    RelogAgents,
+    RemoveAgentsFromQueues,
+)
 
 
 class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
         service_proxy = dependencies['service_proxy']
+        job_scheduler = dependencies['job_scheduler']
+        batch_executor = dependencies['batch_executor']
 
         api.add_resource(
             Agents,
@@ -18,11 +28,35 @@ class Plugin:
         api.add_resource(
             LogoffAgents,
             '/agents/logoff',
-            resource_class_args=[service_proxy],
+            resource_class_args=[service_proxy, job_scheduler],
         )
 
         api.add_resource(
             RelogAgents,
             '/agents/relog',
+            resource_class_args=[service_proxy, job_scheduler],
+        )
+
+        api.add_resource(
+            AddAgentsToQueues,
+            '/agents/queues/add',
+            resource_class_args=[service_proxy],
+        )
+
+        api.add_resource(
+            RemoveAgentsFromQueues,
+            '/agents/queues/remove',
             resource_class_args=[service_proxy],
         )
+
+        api.add_resource(
+            AgentsBatch,
+            '/agents/batch',
+            resource_class_args=[batch_executor],
+        )
+
+        api.add_resource(
+            AgentsJob,
+            '/jobs/<job_uuid>',
+            resource_class_args=[job_scheduler],
+        )
@@ -0,0 +1,102 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from marshmallow import ValidationError, post_load, validates, validates_schema
+from xivo.mallow import fields, validate
+from xivo.mallow_helpers import Schema
+
+STATUS_FIELDS = (
+    'id',
+    'tenant_uuid',
+    'origin_uuid',
+    'number',
+    'logged',
+    'paused',
+    'paused_reason',
+    'extension',
+    'context',
+    'state_interface',
+)
+
+
+class AgentsListSchema(Schema):
+    since_version = fields.Integer(validate=validate.Range(min=0), load_default=None)
+    limit = fields.Integer(validate=validate.Range(min=0), load_default=None)
+    offset = fields.Integer(validate=validate.Range(min=0), load_default=0)
+    logged = fields.Boolean(load_default=None)
+    paused = fields.Boolean(load_default=None)
+    queue_id = fields.Integer(load_default=None)
+    context = fields.String(load_default=None)
+    fields_ = fields.String(data_key='fields', load_default=None)
+
+    @validates('fields_')
+    def validate_fields(self, value, **kwargs):
+        unknown = set(value.split(',')).difference(STATUS_FIELDS)
+        if unknown:
+            raise ValidationError(f'unknown fields: {", ".join(sorted(unknown))}')
+
+    @post_load
+    def split_fields(self, data, **kwargs):
+        if data['fields_'] is not None:
+            data['fields_'] = data['fields_'].split(',')
+        return data
+
+
+class BulkOperationSchema(Schema):
+    concurrency = fields.Integer(validate=validate.Range(min=1), load_default=None)
+    async_ = fields.Boolean(data_key='async', load_default=False)
+
+
+class RelogSchema(BulkOperationSchema):
+    mode = fields.String(
+        validate=validate.OneOf(['full', 'changes']), load_default='full'
+    )
+
+
+class MemberSchema(Schema):
+    agent_id = fields.Integer(required=True)
+    queue_id = fields.Integer(required=True)
+
+
+class MembersSchema(Schema):
+    members = fields.List(
+        fields.Nested(MemberSchema), required=True, validate=validate.Length(min=1)
+    )
+
+
+class BatchOperationSchema(Schema):
+    operation = fields.String(
+        required=True, validate=validate.OneOf(['login', 'logoff', 'pause', 'unpause'])
+    )
+    agent_id = fields.Integer(load_default=None)
+    agent_number = fields.String(load_default=None)
+    extension = fields.String(load_default=None)
+    context = fields.String(load_default=None)
+    reason = fields.String(validate=validate.Length(min=1, max=80), load_default=None)
+
+    @validates_schema
+    def validate_agent(self, data, **kwargs):
+        if (data['agent_id'] is None) == (data['agent_number'] is None):
+            raise ValidationError(
+                'exactly one of agent_id and agent_number is required', 'agent_id'
+            )
+        if data['operation'] == 'login':
+            for field in ('extension', 'context'):
+                if data[field] is None:
+                    raise ValidationError('required for login', field)
+
+
+class BatchSchema(Schema):
+    operations = fields.List(
+        fields.Nested(BatchOperationSchema),
+        required=True,
+        validate=validate.Length(min=1),
+    )
+    concurrency = fields.Integer(validate=validate.Range(min=1), load_default=None)
+
+
+agents_list_schema = AgentsListSchema()
+batch_schema = BatchSchema()
+bulk_operation_schema = BulkOperationSchema()
+members_schema = MembersSchema()
+relog_schema = RelogSchema()
@@ -0,0 +1,40 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from flask import Flask
+from flask_restful import Api
+from hamcrest import assert_that, contains_inanyorder
+
+from wazo_agentd.plugins.agents.plugin import Plugin
+
+
+class TestPlugin(unittest.TestCase):
+    def test_load(self):
+        app = Flask(__name__)
+        api = Api(app)
+        dependencies = {
+            'api': api,
+            'service_proxy': Mock(),
+            'job_scheduler': Mock(),
+            'batch_executor': Mock(),
+        }
+
+        Plugin().load(dependencies)
+
+        rules = [rule.rule for rule in app.url_map.iter_rules()]
+        assert_that(
+            rules,
+            contains_inanyorder(
+                '/static/<path:filename>',
+                '/agents',
+                '/agents/logoff',
+                '/agents/relog',
+                '/agents/queues/add',
+                '/agents/queues/remove',
+                '/agents/batch',
+                '/jobs/<job_uuid>',
+            ),
+        )
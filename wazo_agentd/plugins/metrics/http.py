@@ -0,0 +1,21 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from flask import Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from xivo.auth_verifier import required_acl
+
+from wazo_agentd.http import AuthResource
+
+
+class MetricsResource(AuthResource):
+    def __init__(self, registry):
+        self.registry = registry
+
+    @required_acl('agentd.metrics.read')
+    def get(self):
+        return Response(
+            generate_latest(self.registry),
+            status=200,
+            content_type=CONTENT_TYPE_LATEST,
+        )
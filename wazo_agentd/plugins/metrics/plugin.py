@@ -0,0 +1,13 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from prometheus_client import REGISTRY
+
+from .http import MetricsResource
+
+
+class Plugin:
+    def load(self, dependencies):
+        api = dependencies['api']
+
+        api.add_resource(MetricsResource, '/metrics', resource_class_args=[REGISTRY])
@@ -1,24 +1,76 @@
-# Copyright 2012-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2012-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import datetime
+import logging
+import queue
+import threading
+import time
+from collections import namedtuple
 
 from xivo_dao.helpers import db_utils
 
+logger = logging.getLogger(__name__)
+
+QueueLogEntry = namedtuple(
+    'QueueLogEntry',
+    [
+        'time',
+        'callid',
+        'queuename',
+        'agent',
+        'event',
+        'data1',
+        'data2',
+        'data3',
+        'data4',
+        'data5',
+    ],
+    defaults=['', '', '', '', ''],
+)
+
+_STOP = object()
+
 
 class QueueLogManager:
-    def __init__(self, queue_log_dao):
+    # Entries are timestamped when they are queued and written by a background
+    # thread, in batches of at most max_batch_size entries, at most flush_interval
+    # seconds after the first entry of the batch was queued.
+
+    def __init__(self, queue_log_dao, max_batch_size=100, flush_interval=0.5):
         self._dao = queue_log_dao
+        self._max_batch_size = max_batch_size
+        self._flush_interval = flush_interval
+        self._entries = queue.Queue()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='queue_log')
+        self._thread.start()
+
+    def stop(self):
+        self._entries.put(_STOP)
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        else:
+            self._run()
 
     def on_agent_logged_in(self, agent_number, extension, context):
         time = self.format_time_now()
         agent = self._format_agent(agent_number)
         data1 = self._format_data1(extension, context)
 
-        with db_utils.session_scope():
-            self._dao.insert_entry(
-                time, 'NONE', 'NONE', agent, 'AGENTCALLBACKLOGIN', data1
-            )
+        self._entries.put(
+            QueueLogEntry(time, 'NONE', 'NONE', agent, 'AGENTCALLBACKLOGIN', data1)
+        )
 
     def on_agent_logged_off(self, agent_number, extension, context, logged_time):
         time = self.format_time_now()
@@ -26,8 +78,8 @@ class QueueLogManager:
         data1 = self._format_data1(extension, context)
         logged_time = self._format_logged_time(logged_time)
 
-        with db_utils.session_scope():
-            self._dao.insert_entry(
+        self._entries.put(
+            QueueLogEntry(
                 time,
                 'NONE',
                 'NONE',
@@ -37,6 +89,36 @@ class QueueLogManager:
                 logged_time,
                 'CommandLogoff',
             )
+        )
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            entry = self._entries.get()
+            if entry is _STOP:
+                break
+
+            batch = [entry]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    entry = self._entries.get(timeout=max(timeout, 0))
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            self._write(batch)
+
+    def _write(self, entries):
+        try:
+            with db_utils.session_scope():
+                self._dao.insert_entries(entries)
+        except Exception:
+            logger.exception('Failed to write %s queue_log entries', len(entries))
 
     def _format_agent(self, agent_number):
         return f'Agent/{agent_number}'
@@ -1,4 +1,4 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -16,30 +16,52 @@ class AddToQueueAction:
         self._agent_status_dao = agent_status_dao
 
     def add_agent_to_queue(self, agent_status, queue):
-        self._update_asterisk(agent_status, queue)
-        self._update_agent_status(agent_status, queue)
-
-    def _update_asterisk(self, agent_status, queue):
-        member_name = format_agent_member_name(agent_status.agent_number)
-        skills = format_agent_skills(agent_status.agent_id)
-        response = self._amid_client.action(
-            'QueueAdd',
-            {
-                'Queue': queue.name,
-                'Interface': agent_status.interface,
-                'MemberName': member_name,
-                'StateInterface': agent_status.state_interface,
-                'Penalty': queue.penalty,
-                'Skills': skills,
-            },
+        self.add_agent_to_queues(agent_status, [queue])
+
+    def add_agent_to_queues(self, agent_status, queues):
+        self.update_asterisk(agent_status, queues)
+        with db_utils.session_scope():
+            self.update_agent_status(agent_status, queues)
+
+    def update_asterisk(self, agent_status, queues):
+        self._update_asterisk([(agent_status, queue) for queue in queues])
+
+    def update_agent_status(self, agent_status, queues):
+        # Must be called inside a session
+        self._agent_status_dao.add_agent_to_queues(agent_status.agent_id, queues)
+
+    def add_agents_to_queue(self, agent_statuses, queue):
+        self._update_asterisk(
+            [(agent_status, queue) for agent_status in agent_statuses]
         )
-        if response[0]['Response'] != 'Success':
-            logger.warning(
-                'Failure to add interface %r to queue %r',
-                agent_status.interface,
-                queue.name,
+        with db_utils.session_scope():
+            self._agent_status_dao.add_agents_to_queue(
+                [agent_status.agent_id for agent_status in agent_statuses], queue
             )
 
-    def _update_agent_status(self, agent_status, queue):
-        with db_utils.session_scope():
-            self._agent_status_dao.add_agent_to_queues(agent_status.agent_id, [queue])
+    def _update_asterisk(self, members):
+        responses = self._amid_client.actions(
+            [
+                (
+                    'QueueAdd',
+                    {
+                        'Queue': queue.name,
+                        'Interface': agent_status.interface,
+                        'MemberName': format_agent_member_name(
+                            agent_status.agent_number
+                        ),
+                        'StateInterface': agent_status.state_interface,
+                        'Penalty': queue.penalty,
+                        'Skills': format_agent_skills(agent_status.agent_id),
+                    },
+                )
+                for agent_status, queue in members
+            ]
+        )
+        for (agent_status, queue), response in zip(members, responses):
+            if response[0]['Response'] != 'Success':
+                logger.warning(
+                    'Failure to add interface %r to queue %r',
+                    agent_status.interface,
+                    queue.name,
+                )
@@ -1,4 +1,4 @@
-# Copyright 2013-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -20,8 +20,6 @@ class LoginAction:
         blf_manager,
         agent_status_dao,
         line_dao,
-        user_dao,
-        agent_dao,
         bus_publisher,
     ):
         self._amid_client = amid_client
@@ -29,8 +27,6 @@ class LoginAction:
         self._queue_log_manager = queue_log_manager
         self._agent_status_dao = agent_status_dao
         self._line_dao = line_dao
-        self._user_dao = user_dao
-        self._agent_dao = agent_dao
         self._bus_publisher = bus_publisher
 
     def login_agent(self, agent, extension, context):
@@ -94,51 +90,44 @@ class LoginAction:
     def _update_asterisk(self, agent, interface, state_interface):
         member_name = format_agent_member_name(agent.number)
         skills = format_agent_skills(agent.id)
-        for queue in agent.queues:
-            response = self._amid_client.action(
-                'QueueAdd',
-                {
-                    'Queue': queue.name,
-                    'Interface': interface,
-                    'MemberName': member_name,
-                    'StateInterface': state_interface,
-                    'Penalty': queue.penalty,
-                    'Skills': skills,
-                },
-            )
+        responses = self._amid_client.actions(
+            [
+                (
+                    'QueueAdd',
+                    {
+                        'Queue': queue.name,
+                        'Interface': interface,
+                        'MemberName': member_name,
+                        'StateInterface': state_interface,
+                        'Penalty': queue.penalty,
+                        'Skills': skills,
+                    },
+                )
+                for queue in agent.queues
+            ]
+        )
+        for queue, response in zip(agent.queues, responses):
             if response[0]['Response'] != 'Success':
                 logger.warning(
                     'Failure to add interface %r to queue %r', interface, queue.name
                 )
 
     def _update_blf(self, agent):
+        changes = []
         for user_id in agent.user_ids:
-            self._blf_manager.set_user_blf(
-                user_id, 'agentstaticlogin', 'INUSE', f'*{agent.id}'
-            )
-            self._blf_manager.set_user_blf(
-                user_id, 'agentstaticlogin', 'INUSE', agent.number
-            )
-            self._blf_manager.set_user_blf(
-                user_id, 'agentstaticlogoff', 'NOT_INUSE', f'*{agent.id}'
-            )
-            self._blf_manager.set_user_blf(
-                user_id, 'agentstaticlogoff', 'NOT_INUSE', agent.number
-            )
-            self._blf_manager.set_user_blf(
-                user_id, 'agentstaticlogtoggle', 'INUSE', f'*{agent.id}'
-            )
-            self._blf_manager.set_user_blf(
-                user_id, 'agentstaticlogtoggle', 'INUSE', agent.number
-            )
+            for target in (f'*{agent.id}', agent.number):
+                changes.extend(
+                    [
+                        (user_id, 'agentstaticlogin', 'INUSE', target),
+                        (user_id, 'agentstaticlogoff', 'NOT_INUSE', target),
+                        (user_id, 'agentstaticlogtoggle', 'INUSE', target),
+                    ]
+                )
+        self._blf_manager.set_user_blfs(changes)
 
     def _send_bus_status_update(self, agent):
-        logger.debug('Looking for users with agent id %s...', agent.id)
-        with db_utils.session_scope():
-            tenant_uuid = self._agent_dao.agent_with_id(agent.id).tenant_uuid
-            users = [
-                user.uuid for user in self._user_dao.find_all_by_agent_id(agent.id)
-            ]
-            logger.debug('Found %s users.', len(users))
-            event = AgentStatusUpdatedEvent(agent.id, 'logged_in', tenant_uuid, users)
-            self._bus_publisher.publish(event)
+        identity = self._agent_status_dao.get_identity(agent.id)
+        event = AgentStatusUpdatedEvent(
+            agent.id, 'logged_in', identity.tenant_uuid, list(identity.user_uuids)
+        )
+        self._bus_publisher.publish(event)
@@ -1,4 +1,4 @@
-# Copyright 2013-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import datetime
@@ -19,8 +19,6 @@ class LogoffAction:
         blf_manager,
         pause_manager,
         agent_status_dao,
-        user_dao,
-        agent_dao,
         bus_publisher,
     ):
         self._amid_client = amid_client
@@ -28,8 +26,6 @@ class LogoffAction:
         self._blf_manager = blf_manager
         self._pause_manager = pause_manager
         self._agent_status_dao = agent_status_dao
-        self._user_dao = user_dao
-        self._agent_dao = agent_dao
         self._bus_publisher = bus_publisher
 
     def logoff_agent(self, agent_status):
@@ -50,44 +46,43 @@ class LogoffAction:
         self._pause_manager.unpause_agent(agent_status)
 
     def _update_asterisk(self, agent_status):
-        for queue in agent_status.queues:
-            try:
-                self._amid_client.action(
+        results = self._amid_client.actions(
+            [
+                (
                     'QueueRemove',
                     {'Queue': queue.name, 'Interface': agent_status.interface},
                 )
-            except AmidProtocolError as e:
-                if str(e) == 'Unable to remove interface: Not there':
-                    logger.info(
-                        '%s was already logged off of %s',
-                        agent_status.interface,
-                        queue.name,
-                    )
-                    continue
-                raise
+                for queue in agent_status.queues
+            ],
+            return_exceptions=True,
+        )
+        for queue, result in zip(agent_status.queues, results):
+            if not isinstance(result, Exception):
+                continue
+            if (
+                isinstance(result, AmidProtocolError)
+                and str(result) == 'Unable to remove interface: Not there'
+            ):
+                logger.info(
+                    '%s was already logged off of %s',
+                    agent_status.interface,
+                    queue.name,
+                )
+                continue
+            raise result
 
     def _update_blf(self, agent_status):
-        agent_id = f'*{agent_status.agent_id}'
-        number = agent_status.agent_number
+        changes = []
         for user_id in agent_status.user_ids:
-            self._blf_manager.set_user_blf(
-                user_id, 'agentstaticlogin', 'NOT_INUSE', agent_id
-            )
-            self._blf_manager.set_user_blf(
-                user_id, 'agentstaticlogin', 'NOT_INUSE', number
-            )
-            self._blf_manager.set_user_blf(
-                user_id, 'agentstaticlogoff', 'INUSE', agent_id
-            )
-            self._blf_manager.set_user_blf(
-                user_id, 'agentstaticlogoff', 'INUSE', number
-            )
-            self._blf_manager.set_user_blf(
-                user_id, 'agentstaticlogtoggle', 'NOT_INUSE', agent_id
-            )
-            self._blf_manager.set_user_blf(
-                user_id, 'agentstaticlogtoggle', 'NOT_INUSE', number
-            )
+            for target in (f'*{agent_status.agent_id}', agent_status.agent_number):
+                changes.extend(
+                    [
+                        (user_id, 'agentstaticlogin', 'NOT_INUSE', target),
+                        (user_id, 'agentstaticlogoff', 'INUSE', target),
+                        (user_id, 'agentstaticlogtoggle', 'NOT_INUSE', target),
+                    ]
+                )
+        self._blf_manager.set_user_blfs(changes)
 
     def _update_queue_log(self, agent_status):
         login_time = self._compute_login_time(agent_status.login_at)
@@ -108,12 +103,10 @@ class LogoffAction:
             self._agent_status_dao.log_off_agent(agent_status.agent_id)
 
     def _send_bus_status_update(self, agent_status):
-        agent_id = agent_status.agent_id
-        with db_utils.session_scope():
-            tenant_uuid = self._agent_dao.agent_with_id(agent_id).tenant_uuid
-            users = [
-                user.uuid for user in self._user_dao.find_all_by_agent_id(agent_id)
-            ]
-            logger.debug('Found %s users.', len(users))
-            event = AgentStatusUpdatedEvent(agent_id, 'logged_out', tenant_uuid, users)
-            self._bus_publisher.publish(event)
+        event = AgentStatusUpdatedEvent(
+            agent_status.agent_id,
+            'logged_out',
+            agent_status.tenant_uuid,
+            list(agent_status.user_uuids),
+        )
+        self._bus_publisher.publish(event)
@@ -1,4 +1,4 @@
-# Copyright 2013-2020 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo_dao.helpers import db_utils
@@ -10,16 +10,38 @@ class RemoveFromQueueAction:
         self._agent_status_dao = agent_status_dao
 
     def remove_agent_from_queue(self, agent_status, queue):
-        self._update_asterisk(agent_status, queue)
-        self._update_agent_status(agent_status, queue)
+        self.remove_agent_from_queues(agent_status, [queue])
 
-    def _update_asterisk(self, agent_status, queue):
-        self._amid_client.action(
-            'QueueRemove', {'Queue': queue.name, 'Interface': agent_status.interface}
+    def remove_agent_from_queues(self, agent_status, queues):
+        self.update_asterisk(agent_status, queues)
+        with db_utils.session_scope():
+            self.update_agent_status(agent_status, queues)
+
+    def update_asterisk(self, agent_status, queues):
+        self._update_asterisk([(agent_status, queue) for queue in queues])
+
+    def update_agent_status(self, agent_status, queues):
+        # Must be called inside a session
+        self._agent_status_dao.remove_agent_from_queues(
+            agent_status.agent_id, [queue.id for queue in queues]
         )
 
-    def _update_agent_status(self, agent_status, queue):
+    def remove_agents_from_queue(self, agent_statuses, queue):
+        self._update_asterisk(
+            [(agent_status, queue) for agent_status in agent_statuses]
+        )
         with db_utils.session_scope():
-            self._agent_status_dao.remove_agent_from_queues(
-                agent_status.agent_id, [queue.id]
+            self._agent_status_dao.remove_agents_from_queue(
+                [agent_status.agent_id for agent_status in agent_statuses], queue.id
             )
+
+    def _update_asterisk(self, members):
+        self._amid_client.actions(
+            [
+                (
+                    'QueueRemove',
+                    {'Queue': queue.name, 'Interface': agent_status.interface},
+                )
+                for agent_status, queue in members
+            ]
+        )
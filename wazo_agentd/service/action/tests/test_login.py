@@ -1,8 +1,8 @@
-# Copyright 2013-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import unittest
-from unittest.mock import ANY, Mock, call
+from unittest.mock import ANY, Mock
 
 from hamcrest import assert_that, contains_inanyorder, has_entries
 from wazo_bus.resources.agent.event import AgentStatusUpdatedEvent
@@ -11,6 +11,7 @@ from wazo_agentd.queuelog import QueueLogManager
 from wazo_agentd.service.action.login import LoginAction
 from wazo_agentd.service.helper import format_agent_skills
 from wazo_agentd.service.manager.blf import BLFManager
+from wazo_agentd.store import AgentIdentity
 
 
 class TestLoginAction(unittest.TestCase):
@@ -19,9 +20,8 @@ class TestLoginAction(unittest.TestCase):
         self.queue_log_manager = Mock(QueueLogManager)
         self.blf_manager = Mock(BLFManager)
         self.agent_status_dao = Mock()
+        self.agent_status_dao.get_identity.return_value = AgentIdentity(None, ())
         self.line_dao = Mock()
-        self.user_dao = Mock()
-        self.agent_dao = Mock()
         self.bus_publisher = Mock()
         self.login_action = LoginAction(
             self.amid_client,
@@ -29,8 +29,6 @@ class TestLoginAction(unittest.TestCase):
             self.blf_manager,
             self.agent_status_dao,
             self.line_dao,
-            self.user_dao,
-            self.agent_dao,
             self.bus_publisher,
         )
 
@@ -52,12 +50,10 @@ class TestLoginAction(unittest.TestCase):
         self.line_dao.get_interface_from_exten_and_context.return_value = (
             state_interface_sip
         )
-        self.user_dao.find_all_by_agent_id.return_value = [
-            Mock(uuid='42'),
-            Mock(uuid='43'),
-        ]
-        self.amid_client.action.return_value = [{'Response': 'Ok'}]
-        self.agent_dao.agent_with_id.return_value = Mock(tenant_uuid=tenant_uuid)
+        self.amid_client.actions.return_value = [[{'Response': 'Ok'}]]
+        self.agent_status_dao.get_identity.return_value = AgentIdentity(
+            tenant_uuid, ('42', '43')
+        )
 
         self.login_action.login_agent(agent, extension, context)
 
@@ -70,26 +66,30 @@ class TestLoginAction(unittest.TestCase):
         self.queue_log_manager.on_agent_logged_in.assert_called_once_with(
             agent_number, extension, context
         )
-        self.amid_client.action.assert_called_once_with(
-            'QueueAdd',
-            {
-                'Queue': queue.name,
-                'Interface': ANY,
-                'MemberName': ANY,
-                'StateInterface': state_interface_sip,
-                'Penalty': queue.penalty,
-                'Skills': skills,
-            },
+        self.amid_client.actions.assert_called_once_with(
+            [
+                (
+                    'QueueAdd',
+                    {
+                        'Queue': queue.name,
+                        'Interface': ANY,
+                        'MemberName': ANY,
+                        'StateInterface': state_interface_sip,
+                        'Penalty': queue.penalty,
+                        'Skills': skills,
+                    },
+                )
+            ]
         )
         assert_that(
-            self.blf_manager.set_user_blf.call_args_list,
+            self.blf_manager.set_user_blfs.call_args.args[0],
             contains_inanyorder(
-                call(user_id, 'agentstaticlogin', 'INUSE', f'*{agent_id}'),
-                call(user_id, 'agentstaticlogin', 'INUSE', agent_number),
-                call(user_id, 'agentstaticlogoff', 'NOT_INUSE', f'*{agent_id}'),
-                call(user_id, 'agentstaticlogoff', 'NOT_INUSE', agent_number),
-                call(user_id, 'agentstaticlogtoggle', 'INUSE', f'*{agent_id}'),
-                call(user_id, 'agentstaticlogtoggle', 'INUSE', agent_number),
+                (user_id, 'agentstaticlogin', 'INUSE', f'*{agent_id}'),
+                (user_id, 'agentstaticlogin', 'INUSE', agent_number),
+                (user_id, 'agentstaticlogoff', 'NOT_INUSE', f'*{agent_id}'),
+                (user_id, 'agentstaticlogoff', 'NOT_INUSE', agent_number),
+                (user_id, 'agentstaticlogtoggle', 'INUSE', f'*{agent_id}'),
+                (user_id, 'agentstaticlogtoggle', 'INUSE', agent_number),
             ),
         )
         event = AgentStatusUpdatedEvent(10, 'logged_in', tenant_uuid, ['42', '43'])
@@ -120,11 +120,7 @@ class TestLoginAction(unittest.TestCase):
         self.line_dao.get_interface_from_exten_and_context.return_value = (
             state_interface_sccp
         )
-        self.user_dao.find_all_by_agent_id.return_value = [
-            Mock(uuid='42'),
-            Mock(uuid='43'),
-        ]
-        self.amid_client.action.return_value = [{'Response': 'Ok'}]
+        self.amid_client.actions.return_value = [[{'Response': 'Ok'}]]
 
         self.login_action.login_agent(agent, extension, context)
 
@@ -152,12 +148,10 @@ class TestLoginAction(unittest.TestCase):
             extension,
             context,
         )
-        self.user_dao.find_all_by_agent_id.return_value = [
-            Mock(uuid='42'),
-            Mock(uuid='43'),
-        ]
-        self.amid_client.action.return_value = [{'Response': 'Ok'}]
-        self.agent_dao.agent_with_id.return_value = Mock(tenant_uuid=tenant_uuid)
+        self.amid_client.actions.return_value = [[{'Response': 'Ok'}]]
+        self.agent_status_dao.get_identity.return_value = AgentIdentity(
+            tenant_uuid, ('42', '43')
+        )
 
         self.login_action.login_agent_on_line(agent, line_id)
 
@@ -170,16 +164,20 @@ class TestLoginAction(unittest.TestCase):
         self.queue_log_manager.on_agent_logged_in.assert_called_once_with(
             agent_number, extension, context
         )
-        self.amid_client.action.assert_called_once_with(
-            'QueueAdd',
-            {
-                'Queue': queue.name,
-                'Interface': ANY,
-                'MemberName': ANY,
-                'StateInterface': state_interface_sip,
-                'Penalty': queue.penalty,
-                'Skills': skills,
-            },
+        self.amid_client.actions.assert_called_once_with(
+            [
+                (
+                    'QueueAdd',
+                    {
+                        'Queue': queue.name,
+                        'Interface': ANY,
+                        'MemberName': ANY,
+                        'StateInterface': state_interface_sip,
+                        'Penalty': queue.penalty,
+                        'Skills': skills,
+                    },
+                )
+            ]
         )
 
         event = AgentStatusUpdatedEvent(10, 'logged_in', tenant_uuid, ['42', '43'])
@@ -194,3 +192,18 @@ class TestLoginAction(unittest.TestCase):
             ),
         )
         self.bus_publisher.publish.assert_called_once_with(event)
+
+    def test_login_agent_reports_each_failed_queue(self):
+        queue1, queue2 = Mock(), Mock()
+        queue1.name, queue2.name = 'q1', 'q2'
+        agent = Mock(id=10, number='10', queues=[queue1, queue2], user_ids=[])
+        self.amid_client.actions.return_value = [
+            [{'Response': 'Success'}],
+            [{'Response': 'Error'}],
+        ]
+
+        with self.assertLogs('wazo_agentd.service.action.login', 'WARNING') as logs:
+            self.login_action.login_agent(agent, '1001', 'default')
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("'q2'", logs.output[0])
@@ -1,9 +1,9 @@
-# Copyright 2013-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import datetime
 import unittest
-from unittest.mock import ANY, Mock, call
+from unittest.mock import ANY, Mock
 
 from hamcrest import assert_that, contains_inanyorder, has_entries
 from wazo_amid_client.exceptions import AmidProtocolError
@@ -15,12 +15,11 @@ from wazo_agentd.service.action.logoff import LogoffAction
 class TestLogoffAction(unittest.TestCase):
     def setUp(self):
         self.amid_client = Mock()
+        self.amid_client.actions.return_value = []
         self.queue_log_manager = Mock()
         self.blf_manager = Mock()
         self.pause_manager = Mock()
         self.agent_status_dao = Mock()
-        self.user_dao = Mock()
-        self.agent_dao = Mock()
         self.bus_publisher = Mock()
         self.logoff_action = LogoffAction(
             self.amid_client,
@@ -28,8 +27,6 @@ class TestLogoffAction(unittest.TestCase):
             self.blf_manager,
             self.pause_manager,
             self.agent_status_dao,
-            self.user_dao,
-            self.agent_dao,
             self.bus_publisher,
         )
 
@@ -46,11 +43,8 @@ class TestLogoffAction(unittest.TestCase):
         agent_status.login_at = datetime.datetime.utcnow()
         agent_status.queues = [queue]
         tenant_uuid = '00000000-0000-4000-8000-000000001ebc'
-        self.user_dao.find_all_by_agent_id.return_value = [
-            Mock(uuid='42'),
-            Mock(uuid='43'),
-        ]
-        self.agent_dao.agent_with_id.return_value = Mock(tenant_uuid=tenant_uuid)
+        agent_status.tenant_uuid = tenant_uuid
+        agent_status.user_uuids = ('42', '43')
         event = AgentStatusUpdatedEvent(10, 'logged_out', tenant_uuid, ['42', '43'])
         self.pause_manager.unpause_agent.side_effect = AmidProtocolError(
             Mock(json=Mock(return_value=[{'Message': 'Interface not found'}]))
@@ -58,18 +52,24 @@ class TestLogoffAction(unittest.TestCase):
 
         self.logoff_action.logoff_agent(agent_status)
 
-        self.amid_client.action.assert_called_once_with(
-            'QueueRemove', {'Queue': queue.name, 'Interface': agent_status.interface}
+        self.amid_client.actions.assert_called_once_with(
+            [
+                (
+                    'QueueRemove',
+                    {'Queue': queue.name, 'Interface': agent_status.interface},
+                )
+            ],
+            return_exceptions=True,
         )
         assert_that(
-            self.blf_manager.set_user_blf.call_args_list,
+            self.blf_manager.set_user_blfs.call_args.args[0],
             contains_inanyorder(
-                call(user_id, 'agentstaticlogin', 'NOT_INUSE', f'*{agent_id}'),
-                call(user_id, 'agentstaticlogin', 'NOT_INUSE', agent_number),
-                call(user_id, 'agentstaticlogoff', 'INUSE', f'*{agent_id}'),
-                call(user_id, 'agentstaticlogoff', 'INUSE', agent_number),
-                call(user_id, 'agentstaticlogtoggle', 'NOT_INUSE', f'*{agent_id}'),
-                call(user_id, 'agentstaticlogtoggle', 'NOT_INUSE', agent_number),
+                (user_id, 'agentstaticlogin', 'NOT_INUSE', f'*{agent_id}'),
+                (user_id, 'agentstaticlogin', 'NOT_INUSE', agent_number),
+                (user_id, 'agentstaticlogoff', 'INUSE', f'*{agent_id}'),
+                (user_id, 'agentstaticlogoff', 'INUSE', agent_number),
+                (user_id, 'agentstaticlogtoggle', 'NOT_INUSE', f'*{agent_id}'),
+                (user_id, 'agentstaticlogtoggle', 'NOT_INUSE', agent_number),
             ),
         )
         self.pause_manager.unpause_agent.assert_called_once_with(agent_status)
@@ -106,27 +106,30 @@ class TestLogoffAction(unittest.TestCase):
         agent_status.login_at = datetime.datetime.utcnow()
         agent_status.queues = [queue]
         tenant_uuid = '00000000-0000-4000-8000-000000001ebc'
-        self.user_dao.find_all_by_agent_id.return_value = [
-            Mock(uuid='42'),
-            Mock(uuid='43'),
-        ]
-        self.agent_dao.agent_with_id.return_value = Mock(tenant_uuid=tenant_uuid)
+        agent_status.tenant_uuid = tenant_uuid
+        agent_status.user_uuids = ('42', '43')
         event = AgentStatusUpdatedEvent(10, 'logged_out', tenant_uuid, ['42', '43'])
 
         self.logoff_action.logoff_agent(agent_status)
 
-        self.amid_client.action.assert_called_once_with(
-            'QueueRemove', {'Queue': queue.name, 'Interface': agent_status.interface}
+        self.amid_client.actions.assert_called_once_with(
+            [
+                (
+                    'QueueRemove',
+                    {'Queue': queue.name, 'Interface': agent_status.interface},
+                )
+            ],
+            return_exceptions=True,
         )
         assert_that(
-            self.blf_manager.set_user_blf.call_args_list,
+            self.blf_manager.set_user_blfs.call_args.args[0],
             contains_inanyorder(
-                call(user_id, 'agentstaticlogin', 'NOT_INUSE', f'*{agent_id}'),
-                call(user_id, 'agentstaticlogin', 'NOT_INUSE', agent_number),
-                call(user_id, 'agentstaticlogoff', 'INUSE', f'*{agent_id}'),
-                call(user_id, 'agentstaticlogoff', 'INUSE', agent_number),
-                call(user_id, 'agentstaticlogtoggle', 'NOT_INUSE', f'*{agent_id}'),
-                call(user_id, 'agentstaticlogtoggle', 'NOT_INUSE', agent_number),
+                (user_id, 'agentstaticlogin', 'NOT_INUSE', f'*{agent_id}'),
+                (user_id, 'agentstaticlogin', 'NOT_INUSE', agent_number),
+                (user_id, 'agentstaticlogoff', 'INUSE', f'*{agent_id}'),
+                (user_id, 'agentstaticlogoff', 'INUSE', agent_number),
+                (user_id, 'agentstaticlogtoggle', 'NOT_INUSE', f'*{agent_id}'),
+                (user_id, 'agentstaticlogtoggle', 'NOT_INUSE', agent_number),
             ),
         )
         self.pause_manager.unpause_agent.assert_called_once_with(agent_status)
@@ -161,24 +164,27 @@ class TestLogoffAction(unittest.TestCase):
         agent_status.agent_number = agent_number
         agent_status.login_at = datetime.datetime.utcnow()
         agent_status.queues = [queue]
-        self.user_dao.find_all_by_agent_id.return_value = [
-            Mock(uuid='42'),
-            Mock(uuid='43'),
-        ]
         tenant_uuid = '00000000-0000-4000-8000-000000001ebc'
-        self.agent_dao.agent_with_id.return_value = Mock(tenant_uuid=tenant_uuid)
+        agent_status.tenant_uuid = tenant_uuid
+        agent_status.user_uuids = ('42', '43')
         event = AgentStatusUpdatedEvent(10, 'logged_out', tenant_uuid, ['42', '43'])
 
         response = Mock()
         response.json.return_value = [
             {'Message': 'Unable to remove interface: Not there'}
         ]
-        self.amid_client.action.side_effect = AmidProtocolError(response)
+        self.amid_client.actions.return_value = [AmidProtocolError(response)]
 
         self.logoff_action.logoff_agent(agent_status)
 
-        self.amid_client.action.assert_called_once_with(
-            'QueueRemove', {'Queue': queue.name, 'Interface': agent_status.interface}
+        self.amid_client.actions.assert_called_once_with(
+            [
+                (
+                    'QueueRemove',
+                    {'Queue': queue.name, 'Interface': agent_status.interface},
+                )
+            ],
+            return_exceptions=True,
         )
         self.queue_log_manager.on_agent_logged_off.assert_called_once_with(
             agent_number, agent_status.extension, agent_status.context, ANY
@@ -199,3 +205,16 @@ class TestLogoffAction(unittest.TestCase):
             ),
         )
         self.bus_publisher.publish.assert_called_once_with(event)
+
+    def test_logoff_agent_asterisk_error(self):
+        queue = Mock()
+        agent_status = Mock(user_ids=[], queues=[queue])
+        response = Mock()
+        response.json.return_value = [{'Message': 'Unexpected error'}]
+        self.amid_client.actions.return_value = [AmidProtocolError(response)]
+
+        self.assertRaises(
+            AmidProtocolError, self.logoff_action.logoff_agent, agent_status
+        )
+
+        self.agent_status_dao.log_off_agent.assert_not_called()
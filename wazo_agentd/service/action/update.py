@@ -1,4 +1,4 @@
-# Copyright 2013-2020 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo_dao.helpers import db_utils
@@ -10,21 +10,28 @@ class UpdatePenaltyAction:
         self._agent_status_dao = agent_status_dao
 
     def update(self, agent_status, queue):
-        self._update_asterisk(agent_status, queue)
-        self._update_agent_status(agent_status, queue)
+        self.update_asterisk(agent_status, [queue])
+        with db_utils.session_scope():
+            self.update_agent_status(agent_status, [queue])
 
-    def _update_asterisk(self, agent_status, queue):
-        self._amid_client.action(
-            'QueuePenalty',
-            {
-                'Queue': queue.name,
-                'Interface': agent_status.interface,
-                'Penalty': queue.penalty,
-            },
+    def update_asterisk(self, agent_status, queues):
+        self._amid_client.actions(
+            [
+                (
+                    'QueuePenalty',
+                    {
+                        'Queue': queue.name,
+                        'Interface': agent_status.interface,
+                        'Penalty': queue.penalty,
+                    },
+                )
+                for queue in queues
+            ]
         )
 
-    def _update_agent_status(self, agent_status, queue):
-        with db_utils.session_scope():
+    def update_agent_status(self, agent_status, queues):
+        # Must be called inside a session
+        for queue in queues:
             self._agent_status_dao.update_penalty(
                 agent_status.agent_id, queue.id, queue.penalty
             )
@@ -0,0 +1,128 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from xivo_dao.helpers import db_utils
+
+from wazo_agentd.exception import NoSuchAgentError
+
+logger = logging.getLogger(__name__)
+
+BatchOperation = namedtuple(
+    'BatchOperation',
+    ['operation', 'agent_id', 'agent_number', 'extension', 'context', 'reason'],
+    defaults=[None, None, None, None, None],
+)
+BatchResult = namedtuple(
+    'BatchResult', ['operation', 'agent_id', 'agent_number', 'error']
+)
+
+
+class BatchExecutor:
+    # Runs login, logoff, pause and unpause operations on many agents. The agents
+    # are looked up in one pass, then the operations are run concurrently; the
+    # operations on the same agent are run one after the other, in order.
+
+    def __init__(self, service_proxy, agent_dao, max_concurrency=10):
+        self._service_proxy = service_proxy
+        self._agent_dao = agent_dao
+        self._max_concurrency = max_concurrency
+        self._functions = {
+            'login': self._login,
+            'logoff': self._logoff,
+            'pause': self._pause,
+            'unpause': self._unpause,
+        }
+
+    def run(self, operations, tenant_uuids=None, concurrency=None):
+        agents_by_id, agents_by_number = self._find_agents(operations, tenant_uuids)
+
+        results = [None] * len(operations)
+        operations_by_agent = OrderedDict()
+        for index, operation in enumerate(operations):
+            if operation.agent_id is not None:
+                agent = agents_by_id.get(operation.agent_id)
+            else:
+                agent = agents_by_number.get(operation.agent_number)
+            if agent is None:
+                results[index] = BatchResult(
+                    operation.operation,
+                    operation.agent_id,
+                    operation.agent_number,
+                    NoSuchAgentError(),
+                )
+                continue
+            operations_by_agent.setdefault(agent.id, (agent, []))[1].append(
+                (index, operation)
+            )
+
+        if operations_by_agent:
+            concurrency = min(
+                concurrency or self._max_concurrency, self._max_concurrency
+            )
+            with ThreadPoolExecutor(
+                concurrency, thread_name_prefix='batch'
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        self._run_agent, agent, agent_operations, tenant_uuids
+                    )
+                    for agent, agent_operations in operations_by_agent.values()
+                ]
+            for future in futures:
+                for index, result in future.result():
+                    results[index] = result
+        return results
+
+    def _find_agents(self, operations, tenant_uuids):
+        agent_ids = [op.agent_id for op in operations if op.agent_id is not None]
+        agent_numbers = [
+            op.agent_number for op in operations if op.agent_number is not None
+        ]
+        with db_utils.session_scope():
+            agents = self._agent_dao.find_agents(
+                agent_ids, agent_numbers, tenant_uuids=tenant_uuids
+            )
+            agents_by_id = {agent.id: agent for agent in agents}
+            agents_by_number = {agent.number: agent for agent in agents}
+        return agents_by_id, agents_by_number
+
+    def _run_agent(self, agent, operations, tenant_uuids):
+        results = []
+        for index, operation in operations:
+            function = self._functions[operation.operation]
+            try:
+                function(agent, operation, tenant_uuids)
+            except Exception as e:
+                if not hasattr(e, 'error'):
+                    logger.exception(
+                        'Batch %s failed on agent %s', operation.operation, agent.id
+                    )
+                error = e
+            else:
+                error = None
+            results.append(
+                (index, BatchResult(operation.operation, agent.id, agent.number, error))
+            )
+        return results
+
+    def _login(self, agent, operation, tenant_uuids):
+        self._service_proxy.login_agent_by_id(
+            agent.id, operation.extension, operation.context, tenant_uuids=tenant_uuids
+        )
+
+    def _logoff(self, agent, operation, tenant_uuids):
+        self._service_proxy.logoff_agent_by_id(agent.id, tenant_uuids=tenant_uuids)
+
+    def _pause(self, agent, operation, tenant_uuids):
+        self._service_proxy.pause_agent_by_number(
+            agent.number, operation.reason, tenant_uuids=tenant_uuids
+        )
+
+    def _unpause(self, agent, operation, tenant_uuids):
+        self._service_proxy.unpause_agent_by_number(
+            agent.number, tenant_uuids=tenant_uuids
+        )
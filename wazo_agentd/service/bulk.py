@@ -0,0 +1,53 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+BulkResult = namedtuple('BulkResult', ['agent_id', 'agent_number', 'error'])
+
+
+class BulkExecutor:
+    # Runs an operation on many agents with a bounded number of threads. A failure
+    # on one agent is logged and reported in its result without stopping the
+    # others.
+
+    def __init__(self, max_concurrency=10):
+        self._max_concurrency = max_concurrency
+
+    def run(self, function, agent_statuses, concurrency=None, job=None):
+        agent_statuses = list(agent_statuses)
+        if job:
+            job.start(len(agent_statuses))
+        if not agent_statuses:
+            return []
+
+        concurrency = min(concurrency or self._max_concurrency, self._max_concurrency)
+        with ThreadPoolExecutor(concurrency, thread_name_prefix='bulk') as executor:
+            futures = [
+                executor.submit(self._run_one, function, agent_status, job)
+                for agent_status in agent_statuses
+            ]
+        return [future.result() for future in futures]
+
+    def _run_one(self, function, agent_status, job):
+        result = self._run_function(function, agent_status)
+        if job:
+            job.add_result(result)
+        return result
+
+    def _run_function(self, function, agent_status):
+        try:
+            function(agent_status)
+        except Exception as e:
+            logger.warning(
+                'Bulk operation failed on agent %s',
+                agent_status.agent_id,
+                exc_info=True,
+            )
+            error = getattr(e, 'error', None) or str(e) or e.__class__.__name__
+            return BulkResult(agent_status.agent_id, agent_status.agent_number, error)
+        return BulkResult(agent_status.agent_id, agent_status.agent_number, None)
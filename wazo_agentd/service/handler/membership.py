@@ -1,4 +1,4 @@
-# Copyright 2013-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -39,3 +39,24 @@ class MembershipHandler:
             agent = self._agent_dao.get_agent(agent_id, tenant_uuids=tenant_uuids)
             queue = self._queue_dao.get_queue(queue_id, tenant_uuids=tenant_uuids)
         self._remove_member_manager.remove_agent_from_queue(agent, queue)
+
+    @debug.trace_duration
+    def handle_add_to_queues(self, members, tenant_uuids=None):
+        logger.info('Executing add to queues command (%s members)', len(members))
+        members = self._get_members(members, tenant_uuids)
+        self._add_member_manager.add_agents_to_queues(members)
+
+    @debug.trace_duration
+    def handle_remove_from_queues(self, members, tenant_uuids=None):
+        logger.info('Executing remove from queues command (%s members)', len(members))
+        members = self._get_members(members, tenant_uuids)
+        self._remove_member_manager.remove_agents_from_queues(members)
+
+    def _get_members(self, members, tenant_uuids):
+        members = list(dict.fromkeys(members))
+        agent_ids = {agent_id for agent_id, _ in members}
+        queue_ids = {queue_id for _, queue_id in members}
+        with db_utils.session_scope():
+            agents = self._agent_dao.get_agents(agent_ids, tenant_uuids=tenant_uuids)
+            queues = self._queue_dao.get_queues(queue_ids, tenant_uuids=tenant_uuids)
+        return [(agents[agent_id], queues[queue_id]) for agent_id, queue_id in members]
@@ -0,0 +1,18 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+
+from xivo import debug
+
+logger = logging.getLogger(__name__)
+
+
+class ReconcileHandler:
+    def __init__(self, reconcile_manager):
+        self._reconcile_manager = reconcile_manager
+
+    @debug.trace_duration
+    def handle_reconcile(self):
+        logger.info('Executing reconcile command')
+        return self._reconcile_manager.reconcile()
@@ -1,4 +1,4 @@
-# Copyright 2013-2020 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -18,6 +18,11 @@ class StatusHandler:
     @debug.trace_duration
     def handle_status_by_id(self, agent_id, tenant_uuids=None):
         logger.info('Executing status command (ID %s)', agent_id)
+        agent_status = self._agent_status_dao.get_status(
+            agent_id, tenant_uuids=tenant_uuids
+        )
+        if agent_status is not None:
+            return self._format_logged_status(agent_status)
         with db_utils.session_scope():
             agent = self._agent_dao.get_agent(agent_id, tenant_uuids=tenant_uuids)
         return self._handle_status(agent)
@@ -25,6 +30,11 @@ class StatusHandler:
     @debug.trace_duration
     def handle_status_by_number(self, agent_number, tenant_uuids=None):
         logger.info('Executing status command (number %s)', agent_number)
+        agent_status = self._agent_status_dao.get_status_by_number(
+            agent_number, tenant_uuids=tenant_uuids
+        )
+        if agent_status is not None:
+            return self._format_logged_status(agent_status)
         with db_utils.session_scope():
             agent = self._agent_dao.get_agent_by_number(
                 agent_number, tenant_uuids=tenant_uuids
@@ -34,6 +44,11 @@ class StatusHandler:
     @debug.trace_duration
     def handle_status_by_user(self, user_uuid, tenant_uuids=None):
         logger.info('Executing status command (agent of user %s)', user_uuid)
+        agent_status = self._agent_status_dao.get_status_by_user(
+            user_uuid, tenant_uuids=tenant_uuids
+        )
+        if agent_status is not None:
+            return self._format_logged_status(agent_status)
         with db_utils.session_scope():
             agent = self._agent_dao.get_agent_by_user_uuid(
                 user_uuid, tenant_uuids=tenant_uuids
@@ -41,13 +56,30 @@ class StatusHandler:
         return self._handle_status(agent)
 
     @debug.trace_duration
-    def handle_statuses(self, tenant_uuids=None):
+    def handle_statuses(
+        self,
+        tenant_uuids=None,
+        since_version=None,
+        filters=None,
+        limit=None,
+        offset=None,
+        fields=None,
+    ):
         logger.info('Executing statuses command')
+        agent_ids = None
+        if since_version is not None:
+            agent_ids = self._agent_status_dao.get_agent_ids_changed_since(
+                since_version
+            )
         with db_utils.session_scope():
             agent_statuses = self._agent_status_dao.get_statuses(
-                tenant_uuids=tenant_uuids
+                tenant_uuids=tenant_uuids,
+                agent_ids=agent_ids,
+                limit=limit,
+                offset=offset,
+                **(filters or {}),
             )
-            return [
+            statuses = [
                 {
                     'id': status.agent_id,
                     'tenant_uuid': status.tenant_uuid,
@@ -62,6 +94,14 @@ class StatusHandler:
                 }
                 for status in agent_statuses
             ]
+        if fields:
+            statuses = [
+                {field: status[field] for field in fields} for status in statuses
+            ]
+        return statuses
+
+    def handle_statuses_version(self, tenant_uuids=None):
+        return self._agent_status_dao.get_version(tenant_uuids=tenant_uuids)
 
     def _handle_status(self, agent):
         with db_utils.session_scope():
@@ -92,3 +132,17 @@ class StatusHandler:
                 'context': context,
                 'state_interface': state_interface,
             }
+
+    def _format_logged_status(self, agent_status):
+        return {
+            'id': agent_status.agent_id,
+            'tenant_uuid': agent_status.tenant_uuid,
+            'origin_uuid': self._uuid,
+            'number': agent_status.agent_number,
+            'logged': True,
+            'paused': agent_status.paused,
+            'paused_reason': agent_status.paused_reason,
+            'extension': agent_status.extension,
+            'context': agent_status.context,
+            'state_interface': agent_status.state_interface,
+        }
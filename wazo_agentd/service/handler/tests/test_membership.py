@@ -0,0 +1,54 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from wazo_agentd.exception import NoSuchQueueError
+from wazo_agentd.service.handler.membership import MembershipHandler
+
+
+class TestMembershipHandler(unittest.TestCase):
+    def setUp(self):
+        self.add_member_manager = Mock()
+        self.remove_member_manager = Mock()
+        self.agent_dao = Mock()
+        self.queue_dao = Mock()
+        self.handler = MembershipHandler(
+            self.add_member_manager,
+            self.remove_member_manager,
+            self.agent_dao,
+            self.queue_dao,
+        )
+
+    def test_handle_add_to_queues(self):
+        agent1, agent2 = Mock(), Mock()
+        queue1, queue2 = Mock(), Mock()
+        self.agent_dao.get_agents.return_value = {1: agent1, 2: agent2}
+        self.queue_dao.get_queues.return_value = {11: queue1, 12: queue2}
+
+        self.handler.handle_add_to_queues(
+            [(1, 11), (1, 12), (2, 11), (1, 11)], tenant_uuids=['tenant']
+        )
+
+        self.agent_dao.get_agents.assert_called_once_with(
+            {1, 2}, tenant_uuids=['tenant']
+        )
+        self.queue_dao.get_queues.assert_called_once_with(
+            {11, 12}, tenant_uuids=['tenant']
+        )
+        self.add_member_manager.add_agents_to_queues.assert_called_once_with(
+            [(agent1, queue1), (agent1, queue2), (agent2, queue1)]
+        )
+
+    def test_handle_remove_from_queues_unknown_queue(self):
+        self.agent_dao.get_agents.return_value = {1: Mock()}
+        self.queue_dao.get_queues.side_effect = NoSuchQueueError()
+
+        self.assertRaises(
+            NoSuchQueueError,
+            self.handler.handle_remove_from_queues,
+            [(1, 11)],
+        )
+
+        self.remove_member_manager.remove_agents_from_queues.assert_not_called()
@@ -1,4 +1,4 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import unittest
@@ -16,8 +16,11 @@ class TestRelogHandler(unittest.TestCase):
         self.tenants = ['fake-tenant']
 
     def test_handle_relog_all(self):
-        self.relog_handler.handle_relog_all(tenant_uuids=self.tenants)
+        result = self.relog_handler.handle_relog_all(
+            tenant_uuids=self.tenants, concurrency=5, job=None
+        )
 
         self.relog_manager.relog_all_agents.assert_called_once_with(
-            tenant_uuids=self.tenants
+            tenant_uuids=self.tenants, concurrency=5, job=None, mode='full'
         )
+        self.assertEqual(result, self.relog_manager.relog_all_agents.return_value)
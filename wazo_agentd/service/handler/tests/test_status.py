@@ -0,0 +1,89 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, contains_exactly, equal_to, has_entries
+
+from wazo_agentd.service.handler.status import StatusHandler
+
+
+class TestStatusHandler(unittest.TestCase):
+    def setUp(self):
+        self.agent_dao = Mock()
+        self.agent_status_dao = Mock()
+        self.agent_status_dao.get_statuses.return_value = [
+            Mock(agent_id=1, logged=True),
+            Mock(agent_id=2, logged=False),
+        ]
+        self.handler = StatusHandler(self.agent_dao, self.agent_status_dao, 'xivo-uuid')
+        self.tenants = ['fake-tenant']
+
+    def test_handle_statuses(self):
+        result = self.handler.handle_statuses(tenant_uuids=self.tenants)
+
+        assert_that(
+            result,
+            contains_exactly(
+                has_entries(id=1, logged=True, origin_uuid='xivo-uuid'),
+                has_entries(id=2, logged=False, origin_uuid='xivo-uuid'),
+            ),
+        )
+        self.agent_status_dao.get_statuses.assert_called_once_with(
+            tenant_uuids=self.tenants, agent_ids=None, limit=None, offset=None
+        )
+        self.agent_status_dao.get_agent_ids_changed_since.assert_not_called()
+
+    def test_handle_statuses_since_version(self):
+        self.agent_status_dao.get_agent_ids_changed_since.return_value = {2}
+
+        self.handler.handle_statuses(tenant_uuids=self.tenants, since_version=42)
+
+        self.agent_status_dao.get_agent_ids_changed_since.assert_called_once_with(42)
+        self.agent_status_dao.get_statuses.assert_called_once_with(
+            tenant_uuids=self.tenants, agent_ids={2}, limit=None, offset=None
+        )
+
+    def test_handle_statuses_since_unknown_version(self):
+        self.agent_status_dao.get_agent_ids_changed_since.return_value = None
+
+        result = self.handler.handle_statuses(since_version=1)
+
+        assert_that(result, contains_exactly(has_entries(id=1), has_entries(id=2)))
+        self.agent_status_dao.get_statuses.assert_called_once_with(
+            tenant_uuids=None, agent_ids=None, limit=None, offset=None
+        )
+
+    def test_handle_statuses_filters_and_pagination(self):
+        self.handler.handle_statuses(
+            filters={'logged': True, 'queue_id': 3}, limit=10, offset=20
+        )
+
+        self.agent_status_dao.get_statuses.assert_called_once_with(
+            tenant_uuids=None,
+            agent_ids=None,
+            limit=10,
+            offset=20,
+            logged=True,
+            queue_id=3,
+        )
+
+    def test_handle_statuses_fields(self):
+        result = self.handler.handle_statuses(fields=['id', 'logged'])
+
+        assert_that(
+            result,
+            contains_exactly(
+                equal_to({'id': 1, 'logged': True}),
+                equal_to({'id': 2, 'logged': False}),
+            ),
+        )
+
+    def test_handle_statuses_version(self):
+        result = self.handler.handle_statuses_version(tenant_uuids=self.tenants)
+
+        self.agent_status_dao.get_version.assert_called_once_with(
+            tenant_uuids=self.tenants
+        )
+        self.assertEqual(result, self.agent_status_dao.get_version.return_value)
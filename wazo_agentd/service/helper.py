@@ -1,4 +1,4 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import re
@@ -16,3 +16,10 @@ def format_agent_skills(agent_id):
 
 def is_valid_agent_number(agent_number):
     return AGENT_NUMBER_REGEX.match(agent_number)
+
+
+def group_queues_by_agent(members):
+    queues_by_agent = {}
+    for agent, queue in members:
+        queues_by_agent.setdefault(agent.id, []).append(queue)
+    return queues_by_agent
@@ -0,0 +1,124 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from wazo_agentd.bus import AgentsJobCompletedEvent
+from wazo_agentd.exception import NoSuchJobError
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    def __init__(self, operation, tenant_uuid):
+        self.uuid = str(uuid.uuid4())
+        self.operation = operation
+        self.tenant_uuid = tenant_uuid
+        self.status = 'pending'
+        self.total = None
+        self.processed = 0
+        self.failed = 0
+        self.results = []
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self):
+        if self.total is None:
+            return None
+        return self.total - self.processed
+
+    def start(self, total):
+        self.total = total
+
+    def add_result(self, result):
+        with self._lock:
+            self.results.append(result)
+            self.processed += 1
+            if result.error:
+                self.failed += 1
+
+
+class JobScheduler:
+    # Runs bulk operations in the background, at most max_concurrent_jobs at a
+    # time. Finished jobs are kept until max_finished_jobs newer jobs are done.
+
+    def __init__(self, bus_publisher, max_concurrent_jobs=2, max_finished_jobs=100):
+        self._bus_publisher = bus_publisher
+        self._max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(
+            max_concurrent_jobs, thread_name_prefix='job'
+        )
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._finished_jobs = OrderedDict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def stop(self):
+        self._executor.shutdown(wait=True)
+
+    def submit(self, operation, tenant_uuid, function):
+        job = Job(operation, tenant_uuid)
+        with self._lock:
+            self._jobs[job.uuid] = job
+        self._executor.submit(self._run, job, function)
+        logger.info('Job %s (%s) scheduled', job.uuid, operation)
+        return job
+
+    def get(self, job_uuid, tenant_uuids=None):
+        with self._lock:
+            job = self._jobs.get(job_uuid) or self._finished_jobs.get(job_uuid)
+        if job is None:
+            raise NoSuchJobError()
+        if tenant_uuids is not None and job.tenant_uuid not in tenant_uuids:
+            raise NoSuchJobError()
+        return job
+
+    def _run(self, job, function):
+        job.status = 'running'
+        try:
+            function(job)
+        except Exception:
+            logger.exception('Job %s (%s) failed', job.uuid, job.operation)
+            job.status = 'error'
+        else:
+            job.status = 'finished'
+        logger.info(
+            'Job %s (%s) %s: %s processed, %s failed',
+            job.uuid,
+            job.operation,
+            job.status,
+            job.processed,
+            job.failed,
+        )
+
+        with self._lock:
+            self._finished_jobs[job.uuid] = self._jobs.pop(job.uuid)
+            while len(self._finished_jobs) > self._max_finished_jobs:
+                self._finished_jobs.popitem(last=False)
+
+        self._publish_completed(job)
+
+    def _publish_completed(self, job):
+        content = {
+            'uuid': job.uuid,
+            'operation': job.operation,
+            'status': job.status,
+            'total': job.total,
+            'processed': job.processed,
+            'failed': job.failed,
+        }
+        try:
+            self._bus_publisher.publish(
+                AgentsJobCompletedEvent(content, job.tenant_uuid)
+            )
+        except Exception:
+            logger.exception('Could not publish the completion of job %s', job.uuid)
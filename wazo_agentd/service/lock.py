@@ -0,0 +1,228 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from wazo_agentd.metrics import LOCK_HOLD_DURATION, LOCK_WAIT_DURATION
+
+logger = logging.getLogger(__name__)
+
+
+class ReadWriteLock:
+    # Writer-preferring: once a writer is waiting, new readers wait too, so that
+    # bulk operations are not starved by a continuous flow of agent operations.
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def shared(self):
+        with self._condition:
+            while self._writer or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class _KeyLock:
+    __slots__ = ('lock', 'users')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+
+
+class KeyedLock:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    @contextmanager
+    def __call__(self, *keys):
+        # Keys are always acquired in the same order to avoid deadlocks between
+        # operations locking more than one key (e.g. an agent and a queue)
+        keys = sorted(set(keys), key=repr)
+        key_locks = [self._retain(key) for key in keys]
+        acquired = []
+        try:
+            for key_lock in key_locks:
+                key_lock.lock.acquire()
+                acquired.append(key_lock)
+            yield
+        finally:
+            for key_lock in reversed(acquired):
+                key_lock.lock.release()
+            for key in keys:
+                self._release(key)
+
+    def _retain(self, key):
+        with self._lock:
+            key_lock = self._key_locks.get(key)
+            if key_lock is None:
+                key_lock = self._key_locks[key] = _KeyLock()
+            key_lock.users += 1
+            return key_lock
+
+    def _release(self, key):
+        with self._lock:
+            key_lock = self._key_locks[key]
+            key_lock.users -= 1
+            if not key_lock.users:
+                del self._key_locks[key]
+
+
+class _Holder:
+    __slots__ = ('operation', 'mode', 'keys', 'thread', 'since')
+
+    def __init__(self, operation, mode, keys):
+        self.operation = operation
+        self.mode = mode
+        self.keys = keys
+        self.thread = threading.current_thread().name
+        self.since = time.monotonic()
+
+
+class LockManager:
+    # Besides locking, the wait and hold times are measured per operation, and
+    # the current holders and the number of waiting operations are exposed in
+    # the status. The operation is set by the caller with operation().
+
+    def __init__(self, hold_warning_threshold=1.0):
+        self._global_lock = ReadWriteLock()
+        self._keyed_lock = KeyedLock()
+        self._hold_warning_threshold = hold_warning_threshold
+        self._local = threading.local()
+        self._state_lock = threading.Lock()
+        self._holders = set()
+        self._waiting = 0
+
+    @contextmanager
+    def operation(self, name):
+        previous = getattr(self._local, 'operation', None)
+        self._local.operation = name
+        try:
+            yield
+        finally:
+            self._local.operation = previous
+
+    @contextmanager
+    def agent(self, agent_id, *extra_keys):
+        with self.keys(('agent', agent_id), *extra_keys):
+            yield
+
+    @contextmanager
+    def queue(self, queue_id):
+        with self.keys(('queue', queue_id)):
+            yield
+
+    @contextmanager
+    def keys(self, *keys):
+        with self._instrumented('shared', keys) as acquired:
+            with self._global_lock.shared():
+                with self._keyed_lock(*keys):
+                    acquired()
+                    yield
+
+    @contextmanager
+    def all(self):
+        with self._instrumented('exclusive', ()) as acquired:
+            with self._global_lock.exclusive():
+                acquired()
+                yield
+
+    def provide_status(self, status):
+        now = time.monotonic()
+        with self._state_lock:
+            holders = list(self._holders)
+            waiting = self._waiting
+        status['locks']['waiting'] = waiting
+        status['locks']['holders'] = [
+            {
+                'operation': holder.operation,
+                'mode': holder.mode,
+                'keys': [_format_key(key) for key in holder.keys],
+                'thread': holder.thread,
+                'held_for': now - holder.since,
+            }
+            for holder in sorted(holders, key=lambda holder: holder.since)
+        ]
+
+    def count_waiting(self):
+        with self._state_lock:
+            return self._waiting
+
+    @contextmanager
+    def _instrumented(self, mode, keys):
+        operation = getattr(self._local, 'operation', None) or 'unknown'
+        started = time.monotonic()
+        holder = None
+
+        def acquired():
+            nonlocal holder
+            holder = _Holder(operation, mode, keys)
+            LOCK_WAIT_DURATION.labels(operation=operation, mode=mode).observe(
+                holder.since - started
+            )
+            with self._state_lock:
+                self._waiting -= 1
+                self._holders.add(holder)
+
+        with self._state_lock:
+            self._waiting += 1
+        try:
+            yield acquired
+        finally:
+            if holder is None:
+                with self._state_lock:
+                    self._waiting -= 1
+            else:
+                self._release(holder)
+
+    def _release(self, holder):
+        held = time.monotonic() - holder.since
+        with self._state_lock:
+            self._holders.discard(holder)
+        LOCK_HOLD_DURATION.labels(operation=holder.operation, mode=holder.mode).observe(
+            held
+        )
+        if held > self._hold_warning_threshold:
+            logger.warning(
+                'Lock held for %.3f seconds by %s (%s lock on %s)',
+                held,
+                holder.operation,
+                holder.mode,
+                ', '.join(_format_key(key) for key in holder.keys) or 'everything',
+            )
+
+
+def _format_key(key):
+    if isinstance(key, tuple):
+        return ':'.join(str(part) for part in key)
+    return str(key)
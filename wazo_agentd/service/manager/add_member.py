@@ -1,9 +1,10 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo_dao.helpers import db_utils
 
 from wazo_agentd.exception import AgentAlreadyInQueueError, QueueDifferentTenantError
+from wazo_agentd.service.helper import group_queues_by_agent
 
 
 class AddMemberManager:
@@ -16,11 +17,16 @@ class AddMemberManager:
         self._queue_member_dao = queue_member_dao
 
     def add_agent_to_queue(self, agent, queue):
-        self._check_agent_in_same_tenant_queue(agent, queue)
-        self._check_agent_is_not_member_of_queue(agent, queue)
-        self._add_queue_member(agent, queue)
-        self._send_agent_added_event(agent, queue)
-        self._add_to_queue_if_logged(agent, queue)
+        self.add_agents_to_queues([(agent, queue)])
+
+    def add_agents_to_queues(self, members):
+        # All the (agent, queue) members are checked before any change is made
+        for agent, queue in members:
+            self._check_agent_in_same_tenant_queue(agent, queue)
+            self._check_agent_is_not_member_of_queue(agent, queue)
+        self._add_queue_members(members)
+        self._send_agent_added_events(members)
+        self._add_to_queues_if_logged(members)
 
     def _check_agent_in_same_tenant_queue(self, agent, queue):
         if agent.tenant_uuid != queue.tenant_uuid:
@@ -31,25 +37,35 @@ class AddMemberManager:
             if agent_queue.name == queue.name:
                 raise AgentAlreadyInQueueError()
 
-    def _add_queue_member(self, agent, queue):
+    def _add_queue_members(self, members):
         with db_utils.session_scope():
-            self._queue_member_dao.add_agent_to_queue(
-                agent.id, agent.number, queue.name
+            for agent, queue in members:
+                self._queue_member_dao.add_agent_to_queue(
+                    agent.id, agent.number, queue.name
+                )
+            self._agent_status_dao.on_queue_members_changed(
+                [agent for agent, _ in members]
             )
 
-    def _send_agent_added_event(self, agent, queue):
-        self._amid_client.action(
-            'UserEvent',
-            {
-                'UserEvent': 'AgentAddedToQueue',
-                'AgentID': agent.id,
-                'AgentNumber': agent.number,
-                'QueueName': queue.name,
-            },
+    def _send_agent_added_events(self, members):
+        self._amid_client.actions(
+            [
+                (
+                    'UserEvent',
+                    {
+                        'UserEvent': 'AgentAddedToQueue',
+                        'AgentID': agent.id,
+                        'AgentNumber': agent.number,
+                        'QueueName': queue.name,
+                    },
+                )
+                for agent, queue in members
+            ]
         )
 
-    def _add_to_queue_if_logged(self, agent, queue):
-        with db_utils.session_scope():
-            agent_status = self._agent_status_dao.get_status(agent.id)
-        if agent_status is not None:
-            self._add_to_queue_action.add_agent_to_queue(agent_status, queue)
+    def _add_to_queues_if_logged(self, members):
+        for agent_id, queues in group_queues_by_agent(members).items():
+            with db_utils.session_scope():
+                agent_status = self._agent_status_dao.get_status(agent_id)
+            if agent_status is not None:
+                self._add_to_queue_action.add_agent_to_queues(agent_status, queues)
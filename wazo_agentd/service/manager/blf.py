@@ -1,4 +1,4 @@
-# Copyright 2021 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2021-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -6,10 +6,10 @@ import logging
 from xivo.xivo_helpers import fkey_extension
 from xivo_dao.helpers import db_utils
 
-from wazo_agentd.exception import NoSuchExtenFeatureError
-
 logger = logging.getLogger(__name__)
 
+_FKEY_PREFIX_FEATURE = 'phoneprogfunckey'
+
 
 class BLFManager:
     def __init__(self, amid_client, exten_features_dao):
@@ -17,21 +17,31 @@ class BLFManager:
         self._exten_features_dao = exten_features_dao
 
     def set_user_blf(self, user_id, feature_name, state, target):
+        self.set_user_blfs([(user_id, feature_name, state, target)])
+
+    def set_user_blfs(self, changes):
+        # changes is a list of (user_id, feature_name, state, target)
+        if not changes:
+            return
+
+        feature_names = {_FKEY_PREFIX_FEATURE}
+        feature_names.update(feature_name for _, feature_name, _, _ in changes)
         with db_utils.session_scope():
-            try:
-                exten_prefix = self._exten_features_dao.get_extension(
-                    'phoneprogfunckey'
-                )
-                feature_exten = self._exten_features_dao.get_extension(feature_name)
-            except NoSuchExtenFeatureError:
+            extensions = self._exten_features_dao.get_extensions(feature_names)
+
+        exten_prefix = extensions.get(_FKEY_PREFIX_FEATURE)
+        cli_commands = []
+        for user_id, feature_name, state, target in changes:
+            feature_exten = extensions.get(feature_name)
+            if exten_prefix is None or feature_exten is None:
                 logger.info(
                     'cannot set BLF %s %s missing extension configuration',
                     feature_name,
                     state,
                 )
-                return
+                continue
+            hint = fkey_extension(exten_prefix, (user_id, feature_exten, target))
+            cli_commands.append(f'devstate change Custom:{hint} {state}')
 
-        hint = fkey_extension(exten_prefix, (user_id, feature_exten, target))
-        cli_command = f'devstate change Custom:{hint} {state}'
-        result = self._amid_client.command(cli_command)
-        logger.debug('devstate change result: %s', result['response'][0])
+        for result in self._amid_client.commands(cli_commands):
+            logger.debug('devstate change result: %s', result['response'][0])
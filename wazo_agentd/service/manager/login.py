@@ -1,4 +1,4 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -45,15 +45,13 @@ class LoginManager:
                 raise ContextDifferentTenantError()
 
     def _check_agent_is_not_logged(self, agent):
-        with db_utils.session_scope():
-            agent_status = self._agent_status_dao.get_status(agent.id)
+        agent_status = self._agent_status_dao.get_status(agent.id)
         if agent_status is not None:
             raise AgentAlreadyLoggedError()
 
     def _check_extension_is_not_in_use(self, extension, context):
-        with db_utils.session_scope():
-            if self._agent_status_dao.is_extension_in_use(extension, context):
-                raise ExtensionAlreadyInUseError()
+        if self._agent_status_dao.is_extension_in_use(extension, context):
+            raise ExtensionAlreadyInUseError()
 
     def _check_user_owns_line(self, user_uuid, line_id):
         with db_utils.session_scope():
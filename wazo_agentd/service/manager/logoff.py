@@ -1,4 +1,4 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo_dao.helpers import db_utils
@@ -7,10 +7,11 @@ from wazo_agentd.exception import AgentNotLoggedError, NoSuchAgentError
 
 
 class LogoffManager:
-    def __init__(self, logoff_action, agent_dao, agent_status_dao):
+    def __init__(self, logoff_action, agent_dao, agent_status_dao, bulk_executor):
         self._logoff_action = logoff_action
         self._agent_dao = agent_dao
         self._agent_status_dao = agent_status_dao
+        self._bulk_executor = bulk_executor
 
     def logoff_agent(self, agent_status):
         self._check_agent_is_logged(agent_status)
@@ -21,19 +22,15 @@ class LogoffManager:
         self._check_agent_is_logged(agent_status)
         self._logoff_action.logoff_agent(agent_status)
 
-    def logoff_all_agents(self, tenant_uuids=None):
+    def logoff_all_agents(self, tenant_uuids=None, concurrency=None, job=None):
         agent_statuses = self._get_agent_statuses(tenant_uuids=tenant_uuids)
-        for agent_status in agent_statuses:
-            self._logoff_action.logoff_agent(agent_status)
+        return self._bulk_executor.run(
+            self._logoff_action.logoff_agent, agent_statuses, concurrency, job
+        )
 
     def _get_agent_statuses(self, tenant_uuids=None):
         with db_utils.session_scope():
-            agent_ids = self._agent_status_dao.get_logged_agent_ids(
-                tenant_uuids=tenant_uuids
-            )
-            return [
-                self._agent_status_dao.get_status(agent_id) for agent_id in agent_ids
-            ]
+            return self._agent_status_dao.get_logged_statuses(tenant_uuids=tenant_uuids)
 
     def _check_user_has_agent(self, user_uuid, tenant_uuids=None):
         try:
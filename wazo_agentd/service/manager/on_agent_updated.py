@@ -1,6 +1,8 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from xivo_dao.helpers import db_utils
+
 
 class OnAgentUpdatedManager:
     def __init__(
@@ -21,25 +23,36 @@ class OnAgentUpdatedManager:
             return
 
         queue_delta = self._calculate_queue_delta(agent_status, agent)
+        self.update_queues(agent_status, queue_delta)
+
+    def update_queues(self, agent_status, queue_delta):
+        if queue_delta.is_empty():
+            return
 
-        self._manage_added_queues(agent_status, queue_delta.added)
-        self._manage_removed_queues(agent_status, queue_delta.removed)
-        self._manage_penalty_updated(agent_status, queue_delta.penalty_updated)
+        self._update_asterisk(agent_status, queue_delta)
+        self._update_agent_status(agent_status, queue_delta)
 
     def _calculate_queue_delta(self, agent_status, agent):
         return QueueDelta.calculate(agent_status.queues, agent.queues)
 
-    def _manage_added_queues(self, agent_status, added_queues):
-        for queue in added_queues:
-            self._add_to_queue_action.add_agent_to_queue(agent_status, queue)
+    def _update_asterisk(self, agent_status, queue_delta):
+        for action, queues in self._actions(queue_delta):
+            if queues:
+                action.update_asterisk(agent_status, queues)
 
-    def _manage_penalty_updated(self, agent_status, updated_queues):
-        for queue in updated_queues:
-            self._update_penalty_action.update(agent_status, queue)
+    def _update_agent_status(self, agent_status, queue_delta):
+        # The whole delta is saved in one transaction
+        with db_utils.session_scope():
+            for action, queues in self._actions(queue_delta):
+                if queues:
+                    action.update_agent_status(agent_status, queues)
 
-    def _manage_removed_queues(self, agent_status, removed_queues):
-        for queue in removed_queues:
-            self._remove_from_queue_action.remove_agent_from_queue(agent_status, queue)
+    def _actions(self, queue_delta):
+        return [
+            (self._add_to_queue_action, queue_delta.added),
+            (self._remove_from_queue_action, queue_delta.removed),
+            (self._update_penalty_action, queue_delta.penalty_updated),
+        ]
 
 
 class QueueDelta:
@@ -48,6 +61,9 @@ class QueueDelta:
         self.removed = removed
         self.penalty_updated = penalty_updated
 
+    def is_empty(self):
+        return not (self.added or self.removed or self.penalty_updated)
+
     @classmethod
     def calculate(cls, old_queues, new_queues):
         old_queues_by_id = {q.id: q for q in old_queues}
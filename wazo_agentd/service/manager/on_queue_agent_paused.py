@@ -1,7 +1,9 @@
-# Copyright 2017-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2017-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
+import threading
+import time
 from functools import partial
 
 from wazo_bus.resources.agent.event import AgentPausedEvent, AgentUnpausedEvent
@@ -11,33 +13,62 @@ logger = logging.getLogger(__name__)
 
 
 class OnQueueAgentPausedManager:
-    def __init__(self, agent_status_dao, user_dao, agent_dao, bus_publisher):
+    # Asterisk sends a QueueMemberPause event for each queue of the agent. Only the
+    # first event of a given agent and state within coalescing_window seconds
+    # updates the pause status and, unless per_queue_events is set, is published.
+    # A change is only recorded once it is written, so that the following events
+    # are not dropped when the write fails.
+
+    def __init__(
+        self,
+        agent_status_dao,
+        bus_publisher,
+        coalescing_window=1.0,
+        per_queue_events=False,
+    ):
         self._agent_status_dao = agent_status_dao
-        self._user_dao = user_dao
-        self._agent_dao = agent_dao
         self._bus_publisher = bus_publisher
+        self._coalescing_window = coalescing_window
+        self._per_queue_events = per_queue_events
+        self._lock = threading.Lock()
+        self._last_changes = {}
 
     def on_queue_agent_paused(self, agent_id, agent_number, reason, queue):
-        self._db_update_agent_status(agent_id, True, reason)
         event = partial(AgentPausedEvent, agent_id, agent_number, queue, reason)
-        self._send_bus_status_update(event, agent_id)
+        self._on_pause_changed(agent_id, True, reason, event)
 
     def on_queue_agent_unpaused(self, agent_id, agent_number, reason, queue):
-        self._db_update_agent_status(agent_id, False, reason)
         event = partial(AgentUnpausedEvent, agent_id, agent_number, queue, reason)
-        self._send_bus_status_update(event, agent_id)
+        self._on_pause_changed(agent_id, False, reason, event)
+
+    def _on_pause_changed(self, agent_id, is_paused, reason, partial_event):
+        if self._is_duplicate(agent_id, is_paused, reason):
+            logger.debug('Pause status of agent %s already updated', agent_id)
+            if self._per_queue_events:
+                self._send_bus_status_update(partial_event, agent_id)
+            return
+
+        self._db_update_agent_status(agent_id, is_paused, reason)
+        self._record_change(agent_id, is_paused, reason)
+        self._send_bus_status_update(partial_event, agent_id)
+
+    def _is_duplicate(self, agent_id, is_paused, reason):
+        with self._lock:
+            last_change = self._last_changes.get(agent_id)
+        if last_change and last_change[:2] == (is_paused, reason):
+            return time.monotonic() < last_change[2]
+        return False
+
+    def _record_change(self, agent_id, is_paused, reason):
+        expires_at = time.monotonic() + self._coalescing_window
+        with self._lock:
+            self._last_changes[agent_id] = (is_paused, reason, expires_at)
 
     def _db_update_agent_status(self, agent_id, is_paused, reason):
         with db_utils.session_scope():
             self._agent_status_dao.update_pause_status(agent_id, is_paused, reason)
 
     def _send_bus_status_update(self, partial_event, agent_id):
-        with db_utils.session_scope():
-            logger.debug('Looking for users with agent id %s...', agent_id)
-            tenant_uuid = self._agent_dao.agent_with_id(agent_id).tenant_uuid
-            users = [
-                user.uuid for user in self._user_dao.find_all_by_agent_id(agent_id)
-            ]
-            logger.debug('Found %s users.', len(users))
-            event = partial_event(tenant_uuid, users)
-            self._bus_publisher.publish(event)
+        identity = self._agent_status_dao.get_identity(agent_id)
+        event = partial_event(identity.tenant_uuid, list(identity.user_uuids))
+        self._bus_publisher.publish(event)
@@ -0,0 +1,183 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+from collections import defaultdict, namedtuple
+from functools import partial
+
+from wazo_agentd.dao import _Queue
+from wazo_agentd.metrics import RECONCILIATION_DRIFT
+from wazo_agentd.service.handler.on_queue import AGENT_ID_FROM_IFACE
+from wazo_agentd.service.manager.on_agent_updated import QueueDelta
+
+logger = logging.getLogger(__name__)
+
+Drift = namedtuple('Drift', ['added', 'removed', 'penalty', 'pause', 'stale'])
+Reconciliation = namedtuple('Reconciliation', ['drift', 'errors'])
+
+_AsteriskMember = namedtuple(
+    '_AsteriskMember', ['queue_name', 'interface', 'penalty', 'paused']
+)
+
+
+class ReconcileManager:
+    # The stored agent statuses are the reference: the agent members of the
+    # Asterisk queues are compared with them and only the differences are sent
+    # back to Asterisk. Members of agents that are not logged are removed.
+    #
+    # Asterisk is the reference for the pause state, which can be set per queue
+    # and whose events may still be waiting to be handled: pause differences are
+    # only counted.
+    #
+    # A failure does not stop the reconciliation: the errors are collected by
+    # agent ID and returned with the drift.
+
+    def __init__(
+        self,
+        add_to_queue_action,
+        remove_from_queue_action,
+        update_penalty_action,
+        amid_client,
+        agent_status_dao,
+    ):
+        self._add_to_queue_action = add_to_queue_action
+        self._remove_from_queue_action = remove_from_queue_action
+        self._update_penalty_action = update_penalty_action
+        self._amid_client = amid_client
+        self._agent_status_dao = agent_status_dao
+
+    def reconcile(self):
+        members = self._get_asterisk_members()
+        agent_statuses = self._agent_status_dao.get_logged_statuses()
+
+        drift = Drift(0, 0, 0, 0, 0)
+        errors = {}
+        for agent_status in agent_statuses:
+            agent_members = members.pop(agent_status.agent_id, [])
+            agent_drift, agent_errors = self._reconcile_agent(
+                agent_status, agent_members
+            )
+            drift = _add(drift, agent_drift)
+            if agent_errors:
+                errors[agent_status.agent_id] = agent_errors
+        for agent_id, agent_members in members.items():
+            agent_drift, agent_errors = self._remove_stale_members(
+                agent_id, agent_members
+            )
+            drift = _add(drift, agent_drift)
+            if agent_errors:
+                errors[agent_id] = agent_errors
+
+        for kind, count in drift._asdict().items():
+            RECONCILIATION_DRIFT.labels(kind=kind).set(count)
+        if any(drift):
+            logger.warning('Reconciled agents with Asterisk: %s', drift)
+        else:
+            logger.debug('Agents are in sync with Asterisk')
+        for agent_id, agent_errors in errors.items():
+            logger.warning(
+                'Failed to reconcile agent %s with Asterisk: %s',
+                agent_id,
+                '; '.join(str(error) for error in agent_errors),
+            )
+        return Reconciliation(drift, errors)
+
+    def _get_asterisk_members(self):
+        members = defaultdict(list)
+        for event in self._amid_client.action('QueueStatus'):
+            if event.get('Event') != 'QueueMember':
+                continue
+            interface = event.get('Location') or event.get('Interface') or ''
+            matches = AGENT_ID_FROM_IFACE.match(interface)
+            if not matches:
+                continue
+            members[int(matches.group(1))].append(
+                _AsteriskMember(
+                    queue_name=event['Queue'],
+                    interface=interface,
+                    penalty=int(event.get('Penalty') or 0),
+                    paused=event.get('Paused') == '1',
+                )
+            )
+        return members
+
+    def _reconcile_agent(self, agent_status, members):
+        # Queues are compared by name, the only identifier known by Asterisk
+        actual = [
+            _Queue(member.queue_name, None, member.queue_name, member.penalty)
+            for member in members
+        ]
+        expected = [
+            _Queue(queue.name, queue.tenant_uuid, queue.name, queue.penalty)
+            for queue in agent_status.queues
+        ]
+        delta = QueueDelta.calculate(actual, expected)
+
+        # Each step is done even if a previous one failed
+        steps = []
+        if delta.added:
+            steps.append(
+                partial(
+                    self._add_to_queue_action.update_asterisk,
+                    agent_status,
+                    delta.added,
+                )
+            )
+        if delta.removed:
+            steps.append(
+                partial(
+                    self._remove_from_queue_action.update_asterisk,
+                    agent_status,
+                    delta.removed,
+                )
+            )
+        if delta.penalty_updated:
+            steps.append(
+                partial(
+                    self._update_penalty_action.update_asterisk,
+                    agent_status,
+                    delta.penalty_updated,
+                )
+            )
+        errors = []
+        for step in steps:
+            try:
+                step()
+            except Exception as e:
+                errors.append(e)
+
+        drift = Drift(
+            added=len(delta.added),
+            removed=len(delta.removed),
+            penalty=len(delta.penalty_updated),
+            pause=int(_has_pause_drift(agent_status, members)),
+            stale=0,
+        )
+        return drift, errors
+
+    def _remove_stale_members(self, agent_id, members):
+        logger.info(
+            'Removing agent %s from %s queues: agent is not logged',
+            agent_id,
+            len(members),
+        )
+        results = self._amid_client.actions(
+            [
+                (
+                    'QueueRemove',
+                    {'Queue': member.queue_name, 'Interface': member.interface},
+                )
+                for member in members
+            ],
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        return Drift(0, 0, 0, 0, len(members)), errors
+
+
+def _has_pause_drift(agent_status, members):
+    return any(member.paused != agent_status.paused for member in members)
+
+
+def _add(drift, other):
+    return Drift(*(a + b for a, b in zip(drift, other)))
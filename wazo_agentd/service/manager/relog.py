@@ -1,38 +1,46 @@
-# Copyright 2013-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
 
 from xivo_dao.helpers import db_utils
 
+from wazo_agentd.exception import NoSuchAgentError
+from wazo_agentd.service.manager.on_agent_updated import QueueDelta
+
 logger = logging.getLogger(__name__)
 
 
 class RelogManager:
-    def __init__(self, login_action, logoff_action, agent_dao, agent_status_dao):
+    def __init__(
+        self,
+        login_action,
+        logoff_action,
+        on_agent_updated_manager,
+        agent_dao,
+        agent_status_dao,
+        bulk_executor,
+    ):
         self._login_action = login_action
         self._logoff_action = logoff_action
+        self._on_agent_updated_manager = on_agent_updated_manager
         self._agent_dao = agent_dao
         self._agent_status_dao = agent_status_dao
+        self._bulk_executor = bulk_executor
 
-    def relog_all_agents(self, tenant_uuids=None):
+    def relog_all_agents(
+        self, tenant_uuids=None, concurrency=None, job=None, mode='full'
+    ):
         agent_statuses = self._get_agent_statuses(tenant_uuids=tenant_uuids)
-        for agent_status in agent_statuses:
-            try:
-                self._relog_agent(agent_status)
-            except Exception:
-                logger.warning(
-                    'Could not relog agent %s', agent_status.agent_id, exc_info=True
-                )
+        if mode == 'changes':
+            return self._relog_changed_agents(agent_statuses, concurrency, job)
+        return self._bulk_executor.run(
+            self._relog_agent, agent_statuses, concurrency, job
+        )
 
     def _get_agent_statuses(self, tenant_uuids=None):
         with db_utils.session_scope():
-            agent_ids = self._agent_status_dao.get_logged_agent_ids(
-                tenant_uuids=tenant_uuids
-            )
-            return [
-                self._agent_status_dao.get_status(agent_id) for agent_id in agent_ids
-            ]
+            return self._agent_status_dao.get_logged_statuses(tenant_uuids=tenant_uuids)
 
     def _relog_agent(self, agent_status):
         self._logoff_action.logoff_agent(agent_status)
@@ -41,3 +49,45 @@ class RelogManager:
         self._login_action.login_agent(
             agent, agent_status.extension, agent_status.context
         )
+
+    def _relog_changed_agents(self, agent_statuses, concurrency, job):
+        # Only the queues and penalties that changed are updated, the agents
+        # stay logged. Agents without changes are not part of the results.
+        queue_deltas = self._get_queue_deltas(agent_statuses)
+        changed_statuses = [
+            agent_status
+            for agent_status in agent_statuses
+            if agent_status.agent_id not in queue_deltas
+            or not queue_deltas[agent_status.agent_id].is_empty()
+        ]
+        logger.info(
+            'Relogging %s of %s agents with changes',
+            len(changed_statuses),
+            len(agent_statuses),
+        )
+
+        def update_queues(agent_status):
+            queue_delta = queue_deltas.get(agent_status.agent_id)
+            if queue_delta is None:
+                raise NoSuchAgentError()
+            self._on_agent_updated_manager.update_queues(agent_status, queue_delta)
+
+        return self._bulk_executor.run(
+            update_queues, changed_statuses, concurrency, job
+        )
+
+    def _get_queue_deltas(self, agent_statuses):
+        agent_ids = [agent_status.agent_id for agent_status in agent_statuses]
+        if not agent_ids:
+            return {}
+        with db_utils.session_scope():
+            # Agents deleted since their login are missing from the result
+            agents = self._agent_dao.get_agents(agent_ids, ignore_missing=True)
+        queue_deltas = {}
+        for agent_status in agent_statuses:
+            agent = agents.get(agent_status.agent_id)
+            if agent is not None:
+                queue_deltas[agent.id] = QueueDelta.calculate(
+                    agent_status.queues, agent.queues
+                )
+        return queue_deltas
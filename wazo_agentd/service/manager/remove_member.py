@@ -1,9 +1,10 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo_dao.helpers import db_utils
 
 from wazo_agentd.exception import AgentNotInQueueError
+from wazo_agentd.service.helper import group_queues_by_agent
 
 
 class RemoveMemberManager:
@@ -16,10 +17,15 @@ class RemoveMemberManager:
         self._queue_member_dao = queue_member_dao
 
     def remove_agent_from_queue(self, agent, queue):
-        self._check_agent_is_member_of_queue(agent, queue)
-        self._remove_queue_member(agent, queue)
-        self._send_agent_removed_event(agent, queue)
-        self._remove_from_queue_if_logged(agent, queue)
+        self.remove_agents_from_queues([(agent, queue)])
+
+    def remove_agents_from_queues(self, members):
+        # All the (agent, queue) members are checked before any change is made
+        for agent, queue in members:
+            self._check_agent_is_member_of_queue(agent, queue)
+        self._remove_queue_members(members)
+        self._send_agent_removed_events(members)
+        self._remove_from_queues_if_logged(members)
 
     def _check_agent_is_member_of_queue(self, agent, queue):
         for agent_queue in agent.queues:
@@ -27,23 +33,35 @@ class RemoveMemberManager:
                 return
         raise AgentNotInQueueError()
 
-    def _remove_queue_member(self, agent, queue):
+    def _remove_queue_members(self, members):
         with db_utils.session_scope():
-            self._queue_member_dao.remove_agent_from_queue(agent.id, queue.name)
-
-    def _send_agent_removed_event(self, agent, queue):
-        self._amid_client.action(
-            'UserEvent',
-            {
-                'UserEvent': 'AgentRemovedFromQueue',
-                'AgentID': agent.id,
-                'AgentNumber': agent.number,
-                'QueueName': queue.name,
-            },
+            for agent, queue in members:
+                self._queue_member_dao.remove_agent_from_queue(agent.id, queue.name)
+            self._agent_status_dao.on_queue_members_changed(
+                [agent for agent, _ in members]
+            )
+
+    def _send_agent_removed_events(self, members):
+        self._amid_client.actions(
+            [
+                (
+                    'UserEvent',
+                    {
+                        'UserEvent': 'AgentRemovedFromQueue',
+                        'AgentID': agent.id,
+                        'AgentNumber': agent.number,
+                        'QueueName': queue.name,
+                    },
+                )
+                for agent, queue in members
+            ]
         )
 
-    def _remove_from_queue_if_logged(self, agent, queue):
-        with db_utils.session_scope():
-            agent_status = self._agent_status_dao.get_status(agent.id)
-        if agent_status is not None:
-            self._remove_from_queue_action.remove_agent_from_queue(agent_status, queue)
+    def _remove_from_queues_if_logged(self, members):
+        for agent_id, queues in group_queues_by_agent(members).items():
+            with db_utils.session_scope():
+                agent_status = self._agent_status_dao.get_status(agent_id)
+            if agent_status is not None:
+                self._remove_from_queue_action.remove_agent_from_queues(
+                    agent_status, queues
+                )
@@ -1,8 +1,8 @@
-# Copyright 2019-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2019-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, call
 
 from wazo_agentd.exception import AgentAlreadyInQueueError, QueueDifferentTenantError
 from wazo_agentd.service.manager.add_member import AddMemberManager
@@ -29,22 +29,67 @@ class TestAddMemberManager(unittest.TestCase):
 
         self.member_manager.add_agent_to_queue(agent, queue)
 
-        self.add_to_queue_action.add_agent_to_queue.assert_called_once_with(
-            agent_status, queue
+        self.add_to_queue_action.add_agent_to_queues.assert_called_once_with(
+            agent_status, [queue]
         )
         self.queue_member_dao.add_agent_to_queue.assert_called_once_with(
             agent.id, agent.number, queue.name
         )
-        self.amid_client.action.assert_called_once_with(
-            'UserEvent',
-            {
-                'UserEvent': 'AgentAddedToQueue',
-                'AgentID': agent.id,
-                'AgentNumber': agent.number,
-                'QueueName': queue.name,
-            },
+        self.amid_client.actions.assert_called_once_with(
+            [
+                (
+                    'UserEvent',
+                    {
+                        'UserEvent': 'AgentAddedToQueue',
+                        'AgentID': agent.id,
+                        'AgentNumber': agent.number,
+                        'QueueName': queue.name,
+                    },
+                )
+            ]
         )
 
+    def test_add_agents_to_queues(self):
+        agent1 = Mock(id=1, tenant_uuid='fake-tenant', queues=[])
+        agent2 = Mock(id=2, tenant_uuid='fake-tenant', queues=[])
+        queue1 = Mock(tenant_uuid='fake-tenant')
+        queue2 = Mock(tenant_uuid='fake-tenant')
+        agent_status = Mock()
+        self.agent_status_dao.get_status.side_effect = [agent_status, None]
+
+        self.member_manager.add_agents_to_queues(
+            [(agent1, queue1), (agent1, queue2), (agent2, queue1)]
+        )
+
+        self.queue_member_dao.add_agent_to_queue.assert_has_calls(
+            [
+                call(agent1.id, agent1.number, queue1.name),
+                call(agent1.id, agent1.number, queue2.name),
+                call(agent2.id, agent2.number, queue1.name),
+            ]
+        )
+        self.assertEqual(len(self.amid_client.actions.call_args[0][0]), 3)
+        self.add_to_queue_action.add_agent_to_queues.assert_called_once_with(
+            agent_status, [queue1, queue2]
+        )
+        self.agent_status_dao.on_queue_members_changed.assert_called_once_with(
+            [agent1, agent1, agent2]
+        )
+
+    def test_add_agents_to_queues_nothing_done_when_one_is_invalid(self):
+        agent = Mock(id=1, tenant_uuid='fake-tenant', queues=[])
+        queue1 = Mock(tenant_uuid='fake-tenant')
+        queue2 = Mock(tenant_uuid='other-tenant')
+
+        self.assertRaises(
+            QueueDifferentTenantError,
+            self.member_manager.add_agents_to_queues,
+            [(agent, queue1), (agent, queue2)],
+        )
+
+        self.queue_member_dao.add_agent_to_queue.assert_not_called()
+        self.amid_client.actions.assert_not_called()
+
     def test_add_agent_to_queue_different_tenant(self):
         agent = Mock(tenant_uuid='fake-tenant-1', queues=[])
         agent_status = Mock()
@@ -58,8 +103,8 @@ class TestAddMemberManager(unittest.TestCase):
             queue,
         )
 
-        self.add_to_queue_action.add_agent_to_queue.assert_not_called()
-        self.amid_client.action.assert_not_called()
+        self.add_to_queue_action.add_agent_to_queues.assert_not_called()
+        self.amid_client.actions.assert_not_called()
 
     def test_add_agent_to_queue_already_in_queue(self):
         queue = Mock(tenant_uuid='fake-tenant', name='queue1')
@@ -74,5 +119,5 @@ class TestAddMemberManager(unittest.TestCase):
             queue,
         )
 
-        self.add_to_queue_action.add_agent_to_queue.assert_not_called()
-        self.amid_client.action.assert_not_called()
+        self.add_to_queue_action.add_agent_to_queues.assert_not_called()
+        self.amid_client.actions.assert_not_called()
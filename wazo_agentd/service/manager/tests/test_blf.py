@@ -0,0 +1,73 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, contains_inanyorder
+from xivo.xivo_helpers import fkey_extension
+
+from wazo_agentd.dao import ExtenFeaturesDAOAdapter
+
+from ..blf import BLFManager
+
+
+class TestBLFManager(unittest.TestCase):
+    def setUp(self):
+        self.amid_client = Mock()
+        self.amid_client.commands.side_effect = lambda commands: [
+            {'response': ['Changing']} for _ in commands
+        ]
+        self.exten_features_dao = Mock(ExtenFeaturesDAOAdapter)
+        self.exten_features_dao.get_extensions.return_value = {
+            'phoneprogfunckey': '_*735',
+            'agentstaticlogin': '_*31.',
+            'agentstaticlogoff': '_*32.',
+        }
+        self.blf_manager = BLFManager(self.amid_client, self.exten_features_dao)
+
+    def test_set_user_blfs_resolves_extensions_once(self):
+        self.blf_manager.set_user_blfs(
+            [
+                (42, 'agentstaticlogin', 'INUSE', '*10'),
+                (42, 'agentstaticlogoff', 'NOT_INUSE', '*10'),
+                (43, 'agentstaticlogin', 'INUSE', '1010'),
+            ]
+        )
+
+        self.exten_features_dao.get_extensions.assert_called_once_with(
+            {'phoneprogfunckey', 'agentstaticlogin', 'agentstaticlogoff'}
+        )
+        self.amid_client.commands.assert_called_once()
+        assert_that(
+            self.amid_client.commands.call_args.args[0],
+            contains_inanyorder(
+                _devstate_change(42, '_*31.', '*10', 'INUSE'),
+                _devstate_change(42, '_*32.', '*10', 'NOT_INUSE'),
+                _devstate_change(43, '_*31.', '1010', 'INUSE'),
+            ),
+        )
+
+    def test_set_user_blfs_skips_unconfigured_features(self):
+        self.blf_manager.set_user_blfs(
+            [
+                (42, 'agentstaticlogtoggle', 'INUSE', '*10'),
+                (42, 'agentstaticlogin', 'INUSE', '*10'),
+            ]
+        )
+
+        assert_that(
+            self.amid_client.commands.call_args.args[0],
+            contains_inanyorder(_devstate_change(42, '_*31.', '*10', 'INUSE')),
+        )
+
+    def test_set_user_blfs_without_changes(self):
+        self.blf_manager.set_user_blfs([])
+
+        self.exten_features_dao.get_extensions.assert_not_called()
+        self.amid_client.commands.assert_not_called()
+
+
+def _devstate_change(user_id, feature_exten, target, state):
+    hint = fkey_extension('_*735', (user_id, feature_exten, target))
+    return f'devstate change Custom:{hint} {state}'
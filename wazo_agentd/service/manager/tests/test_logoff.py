@@ -1,9 +1,12 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, call, sentinel
 
+from hamcrest import assert_that, contains_exactly, has_properties
+
+from wazo_agentd.service.bulk import BulkExecutor
 from wazo_agentd.service.manager.logoff import LogoffManager
 
 
@@ -13,7 +16,10 @@ class TestLogoffManager(unittest.TestCase):
         self.agent_dao = Mock()
         self.agent_status_dao = Mock()
         self.logoff_manager = LogoffManager(
-            self.logoff_action, self.agent_dao, self.agent_status_dao
+            self.logoff_action,
+            self.agent_dao,
+            self.agent_status_dao,
+            BulkExecutor(max_concurrency=1),
         )
 
     def test_logoff_agent(self):
@@ -30,3 +36,26 @@ class TestLogoffManager(unittest.TestCase):
         self.logoff_manager.logoff_agent(agent_status)
 
         self.logoff_action.logoff_agent.assert_called_once_with(agent_status)
+
+    def test_logoff_all_agents(self):
+        agent_statuses = [Mock(), Mock()]
+        self.agent_status_dao.get_logged_statuses.return_value = agent_statuses
+
+        results = self.logoff_manager.logoff_all_agents(
+            tenant_uuids=sentinel.tenant_uuids
+        )
+
+        self.agent_status_dao.get_logged_statuses.assert_called_once_with(
+            tenant_uuids=sentinel.tenant_uuids
+        )
+        self.agent_status_dao.get_status.assert_not_called()
+        self.logoff_action.logoff_agent.assert_has_calls(
+            [call(agent_status) for agent_status in agent_statuses]
+        )
+        assert_that(
+            results,
+            contains_exactly(
+                has_properties(agent_id=agent_statuses[0].agent_id, error=None),
+                has_properties(agent_id=agent_statuses[1].agent_id, error=None),
+            ),
+        )
@@ -1,11 +1,13 @@
-# Copyright 2017-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2017-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, call, patch
 from unittest.mock import sentinel as s
 
-from hamcrest import assert_that, has_entries
+from hamcrest import assert_that, calling, equal_to, has_entries, raises
+
+from wazo_agentd.store import AgentIdentity
 
 from ..on_queue_agent_paused import (
     AgentPausedEvent,
@@ -17,21 +19,18 @@ from ..on_queue_agent_paused import (
 class TestOnQueueAgentPausedManager(unittest.TestCase):
     def setUp(self):
         self.agent_status_dao = Mock()
-        self.user_dao = Mock()
-        self.agent_dao = Mock()
         self.bus_publisher = Mock()
 
         self.manager = OnQueueAgentPausedManager(
-            self.agent_status_dao, self.user_dao, self.agent_dao, self.bus_publisher
+            self.agent_status_dao,
+            self.bus_publisher,
         )
 
     def test_on_queue_agent_paused(self):
         tenant_uuid = '00000000-0000-4000-8000-0000000055ff'
-        self.agent_dao.agent_with_id.return_value = Mock(tenant_uuid=tenant_uuid)
-        self.user_dao.find_all_by_agent_id.return_value = [
-            Mock(uuid='42'),
-            Mock(uuid='43'),
-        ]
+        self.agent_status_dao.get_identity.return_value = AgentIdentity(
+            tenant_uuid, ('42', '43')
+        )
         self.manager.on_queue_agent_paused(10, s.number, s.reason, s.queue)
 
         expected_event = AgentPausedEvent(
@@ -55,11 +54,9 @@ class TestOnQueueAgentPausedManager(unittest.TestCase):
 
     def test_on_queue_agent_unpaused(self):
         tenant_uuid = '00000000-0000-4000-8000-000000c0fefe'
-        self.agent_dao.agent_with_id.return_value = Mock(tenant_uuid=tenant_uuid)
-        self.user_dao.find_all_by_agent_id.return_value = [
-            Mock(uuid='42'),
-            Mock(uuid='43'),
-        ]
+        self.agent_status_dao.get_identity.return_value = AgentIdentity(
+            tenant_uuid, ('42', '43')
+        )
 
         self.manager.on_queue_agent_unpaused(10, s.number, s.reason, s.queue)
 
@@ -81,3 +78,90 @@ class TestOnQueueAgentPausedManager(unittest.TestCase):
             10, False, s.reason
         )
         self.bus_publisher.publish.assert_called_once_with(expected_event)
+
+    def test_events_of_each_queue_are_coalesced(self):
+        self.agent_status_dao.get_identity.return_value = AgentIdentity(
+            s.tenant_uuid, ()
+        )
+
+        for queue in (s.queue1, s.queue2, s.queue3):
+            self.manager.on_queue_agent_paused(10, s.number, s.reason, queue)
+        self.manager.on_queue_agent_paused(11, s.number, s.reason, s.queue1)
+
+        self.agent_status_dao.update_pause_status.assert_has_calls(
+            [call(10, True, s.reason), call(11, True, s.reason)]
+        )
+        assert_that(self.agent_status_dao.update_pause_status.call_count, equal_to(2))
+        assert_that(self.bus_publisher.publish.call_count, equal_to(2))
+
+    def test_a_new_state_is_not_coalesced(self):
+        self.agent_status_dao.get_identity.return_value = AgentIdentity(
+            s.tenant_uuid, ()
+        )
+
+        self.manager.on_queue_agent_paused(10, s.number, s.reason, s.queue1)
+        self.manager.on_queue_agent_unpaused(10, s.number, s.reason, s.queue1)
+        self.manager.on_queue_agent_paused(10, s.number, s.other_reason, s.queue1)
+
+        self.agent_status_dao.update_pause_status.assert_has_calls(
+            [
+                call(10, True, s.reason),
+                call(10, False, s.reason),
+                call(10, True, s.other_reason),
+            ]
+        )
+
+    def test_events_after_a_failed_update_are_not_coalesced(self):
+        self.agent_status_dao.get_identity.return_value = AgentIdentity(
+            s.tenant_uuid, ()
+        )
+        self.agent_status_dao.update_pause_status.side_effect = [Exception, None]
+
+        assert_that(
+            calling(self.manager.on_queue_agent_paused).with_args(
+                10, s.number, s.reason, s.queue1
+            ),
+            raises(Exception),
+        )
+        self.manager.on_queue_agent_paused(10, s.number, s.reason, s.queue2)
+
+        self.agent_status_dao.update_pause_status.assert_has_calls(
+            [call(10, True, s.reason), call(10, True, s.reason)]
+        )
+        self.bus_publisher.publish.assert_called_once()
+
+    @patch('wazo_agentd.service.manager.on_queue_agent_paused.time.monotonic')
+    def test_events_after_the_window_are_not_coalesced(self, monotonic):
+        self.agent_status_dao.get_identity.return_value = AgentIdentity(
+            s.tenant_uuid, ()
+        )
+
+        monotonic.return_value = 100
+        self.manager.on_queue_agent_paused(10, s.number, s.reason, s.queue1)
+        monotonic.return_value = 101.5
+        self.manager.on_queue_agent_paused(10, s.number, s.reason, s.queue1)
+
+        assert_that(self.agent_status_dao.update_pause_status.call_count, equal_to(2))
+
+    def test_per_queue_events(self):
+        manager = OnQueueAgentPausedManager(
+            self.agent_status_dao,
+            self.bus_publisher,
+            per_queue_events=True,
+        )
+        self.agent_status_dao.get_identity.return_value = AgentIdentity(
+            s.tenant_uuid, ()
+        )
+
+        for queue in (s.queue1, s.queue2):
+            manager.on_queue_agent_paused(10, s.number, s.reason, queue)
+
+        self.agent_status_dao.update_pause_status.assert_called_once_with(
+            10, True, s.reason
+        )
+        self.bus_publisher.publish.assert_has_calls(
+            [
+                call(AgentPausedEvent(10, s.number, queue, s.reason, s.tenant_uuid, []))
+                for queue in (s.queue1, s.queue2)
+            ]
+        )
@@ -1,4 +1,4 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import unittest
@@ -79,12 +79,21 @@ class TestOnAgentUpdatedManager(unittest.TestCase):
 
         self.on_agent_updated_manager.on_agent_updated(agent)
 
-        self.add_to_queue_action.add_agent_to_queue.assert_called_once_with(
-            agent_status, new_queue
-        )
-        self.remove_from_queue_action.remove_agent_from_queue.assert_called_once_with(
-            agent_status, old_queue
-        )
-        self.update_penalty_action.update.assert_called_once_with(
-            agent_status, updated_queue_after
-        )
+        for action, queues in [
+            (self.add_to_queue_action, [new_queue]),
+            (self.remove_from_queue_action, [old_queue]),
+            (self.update_penalty_action, [updated_queue_after]),
+        ]:
+            action.update_asterisk.assert_called_once_with(agent_status, queues)
+            action.update_agent_status.assert_called_once_with(agent_status, queues)
+
+    def test_on_agent_updated_no_changes(self):
+        queue = Mock(id=1, penalty=0)
+        agent = Mock(id=1, queues=[queue])
+        agent_status = Mock(agent_id=1, queues=[queue])
+        self.agent_status_dao.get_status.return_value = agent_status
+
+        self.on_agent_updated_manager.on_agent_updated(agent)
+
+        self.add_to_queue_action.update_asterisk.assert_not_called()
+        self.add_to_queue_action.update_agent_status.assert_not_called()
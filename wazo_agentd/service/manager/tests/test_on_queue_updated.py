@@ -0,0 +1,44 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from wazo_agentd.service.manager.on_queue_updated import OnQueueUpdatedManager
+
+
+class TestOnQueueUpdatedManager(unittest.TestCase):
+    def setUp(self):
+        self.add_to_queue_action = Mock()
+        self.remove_from_queue_action = Mock()
+        self.agent_status_dao = Mock()
+        self.manager = OnQueueUpdatedManager(
+            self.add_to_queue_action,
+            self.remove_from_queue_action,
+            self.agent_status_dao,
+        )
+        self.queue = Mock(id=1)
+
+    def test_on_queue_updated(self):
+        added = [Mock(), Mock()]
+        removed = [Mock()]
+        self.agent_status_dao.get_statuses_to_add_to_queue.return_value = added
+        self.agent_status_dao.get_statuses_to_remove_from_queue.return_value = removed
+
+        self.manager.on_queue_updated(self.queue)
+
+        self.add_to_queue_action.add_agents_to_queue.assert_called_once_with(
+            added, self.queue
+        )
+        self.remove_from_queue_action.remove_agents_from_queue.assert_called_once_with(
+            removed, self.queue
+        )
+
+    def test_on_queue_updated_no_changes(self):
+        self.agent_status_dao.get_statuses_to_add_to_queue.return_value = []
+        self.agent_status_dao.get_statuses_to_remove_from_queue.return_value = []
+
+        self.manager.on_queue_updated(self.queue)
+
+        self.add_to_queue_action.add_agents_to_queue.assert_not_called()
+        self.remove_from_queue_action.remove_agents_from_queue.assert_not_called()
@@ -0,0 +1,172 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    contains_inanyorder,
+    equal_to,
+    has_entries,
+)
+
+from wazo_agentd.dao import _Queue
+from wazo_agentd.service.manager.reconcile import (
+    Drift,
+    ReconcileManager,
+    Reconciliation,
+)
+
+
+def _member(queue_name, agent_id, penalty='0', paused='0'):
+    return {
+        'Event': 'QueueMember',
+        'Queue': queue_name,
+        'Location': f'Local/id-{agent_id}@agentcallback',
+        'Penalty': penalty,
+        'Paused': paused,
+    }
+
+
+class TestReconcileManager(unittest.TestCase):
+    def setUp(self):
+        self.add_to_queue_action = Mock()
+        self.remove_from_queue_action = Mock()
+        self.update_penalty_action = Mock()
+        self.amid_client = Mock()
+        self.amid_client.actions.return_value = []
+        self.agent_status_dao = Mock()
+        self.manager = ReconcileManager(
+            self.add_to_queue_action,
+            self.remove_from_queue_action,
+            self.update_penalty_action,
+            self.amid_client,
+            self.agent_status_dao,
+        )
+        self.queue_1 = _Queue(1, 'tenant', 'q1', 0)
+        self.queue_2 = _Queue(2, 'tenant', 'q2', 3)
+        self.agent_status = Mock(
+            agent_id=42,
+            queues=[self.queue_1, self.queue_2],
+            paused=False,
+            paused_reason=None,
+        )
+        self.agent_status_dao.get_logged_statuses.return_value = [self.agent_status]
+
+    def _given_asterisk_members(self, *members):
+        self.amid_client.action.return_value = [
+            {'Response': 'Success'},
+            {'Event': 'QueueParams', 'Queue': 'q1'},
+            *members,
+            {'Event': 'QueueStatusComplete'},
+        ]
+
+    def test_reconcile_in_sync(self):
+        self._given_asterisk_members(
+            _member('q1', 42, penalty='0'),
+            _member('q2', 42, penalty='3'),
+            {'Event': 'QueueMember', 'Queue': 'q1', 'Location': 'SIP/abcdef'},
+        )
+
+        result = self.manager.reconcile()
+
+        assert_that(result, equal_to(Reconciliation(Drift(0, 0, 0, 0, 0), {})))
+        self.amid_client.action.assert_called_once_with('QueueStatus')
+        self.add_to_queue_action.update_asterisk.assert_not_called()
+        self.remove_from_queue_action.update_asterisk.assert_not_called()
+        self.update_penalty_action.update_asterisk.assert_not_called()
+        self.amid_client.actions.assert_not_called()
+
+    def test_reconcile_queues(self):
+        self._given_asterisk_members(
+            _member('q2', 42, penalty='1'),
+            _member('q3', 42),
+        )
+
+        result = self.manager.reconcile()
+
+        assert_that(result, equal_to(Reconciliation(Drift(1, 1, 1, 0, 0), {})))
+        self.add_to_queue_action.update_asterisk.assert_called_once_with(
+            self.agent_status, [('q1', 'tenant', 'q1', 0)]
+        )
+        self.remove_from_queue_action.update_asterisk.assert_called_once_with(
+            self.agent_status, [('q3', None, 'q3', 0)]
+        )
+        self.update_penalty_action.update_asterisk.assert_called_once_with(
+            self.agent_status, [('q2', 'tenant', 'q2', 3)]
+        )
+
+    def test_reconcile_pause_is_only_counted(self):
+        self.agent_status.paused = True
+        self.agent_status.paused_reason = 'lunch'
+        self._given_asterisk_members(
+            _member('q1', 42, paused='1'),
+            _member('q2', 42, penalty='3', paused='0'),
+        )
+
+        result = self.manager.reconcile()
+
+        assert_that(result, equal_to(Reconciliation(Drift(0, 0, 0, 1, 0), {})))
+        self.amid_client.action.assert_called_once_with('QueueStatus')
+        self.amid_client.actions.assert_not_called()
+
+    def test_reconcile_stale_members(self):
+        self._given_asterisk_members(
+            _member('q1', 42),
+            _member('q2', 42, penalty='3'),
+            _member('q1', 7),
+            _member('q2', 7),
+        )
+
+        result = self.manager.reconcile()
+
+        assert_that(result, equal_to(Reconciliation(Drift(0, 0, 0, 0, 2), {})))
+        (actions,), _ = self.amid_client.actions.call_args
+        assert_that(
+            actions,
+            contains_inanyorder(
+                (
+                    'QueueRemove',
+                    {'Queue': 'q1', 'Interface': 'Local/id-7@agentcallback'},
+                ),
+                (
+                    'QueueRemove',
+                    {'Queue': 'q2', 'Interface': 'Local/id-7@agentcallback'},
+                ),
+            ),
+        )
+
+    def test_reconcile_continues_after_a_failure(self):
+        other_status = Mock(
+            agent_id=43, queues=[self.queue_1], paused=False, paused_reason=None
+        )
+        self.agent_status_dao.get_logged_statuses.return_value = [
+            self.agent_status,
+            other_status,
+        ]
+        self._given_asterisk_members(
+            _member('q3', 42),
+            _member('q1', 7),
+        )
+        error = Exception('QueueAdd failed')
+        self.add_to_queue_action.update_asterisk.side_effect = [error, None]
+        stale_error = Exception('QueueRemove failed')
+        self.amid_client.actions.return_value = [stale_error]
+
+        result = self.manager.reconcile()
+
+        assert_that(result.drift, equal_to(Drift(3, 1, 0, 0, 1)))
+        assert_that(
+            result.errors,
+            has_entries(
+                {42: contains_exactly(error), 7: contains_exactly(stale_error)}
+            ),
+        )
+        self.remove_from_queue_action.update_asterisk.assert_called_once_with(
+            self.agent_status, [('q3', None, 'q3', 0)]
+        )
+        self.add_to_queue_action.update_asterisk.assert_called_with(
+            other_status, [('q1', 'tenant', 'q1', 0)]
+        )
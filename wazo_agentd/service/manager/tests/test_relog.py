@@ -1,11 +1,16 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import unittest
 from unittest.mock import Mock
 
+from hamcrest import assert_that, contains_exactly, empty, has_properties
+
+from wazo_agentd.dao import _Agent, _Queue
 from wazo_agentd.service.action.login import LoginAction
 from wazo_agentd.service.action.logoff import LogoffAction
+from wazo_agentd.service.bulk import BulkExecutor
+from wazo_agentd.service.manager.on_agent_updated import OnAgentUpdatedManager
 from wazo_agentd.service.manager.relog import RelogManager
 
 
@@ -13,10 +18,16 @@ class TestRelogManager(unittest.TestCase):
     def setUp(self):
         self.login_action = Mock(LoginAction)
         self.logoff_action = Mock(LogoffAction)
+        self.on_agent_updated_manager = Mock(OnAgentUpdatedManager)
         self.agent_status_dao = Mock()
         self.agent_dao = Mock()
         self.relog_manager = RelogManager(
-            self.login_action, self.logoff_action, self.agent_dao, self.agent_status_dao
+            self.login_action,
+            self.logoff_action,
+            self.on_agent_updated_manager,
+            self.agent_dao,
+            self.agent_status_dao,
+            BulkExecutor(max_concurrency=1),
         )
 
     def test_relog_all_agents(self):
@@ -26,14 +37,78 @@ class TestRelogManager(unittest.TestCase):
         agent_status.agent_id = agent_id
 
         self.agent_dao.get_agent.return_value = agent
-        self.agent_status_dao.get_logged_agent_ids.return_value = [agent_id]
-        self.agent_status_dao.get_status.return_value = agent_status
+        self.agent_status_dao.get_logged_statuses.return_value = [agent_status]
 
         self.relog_manager.relog_all_agents()
 
-        self.agent_status_dao.get_status.assert_called_once_with(agent_id)
+        self.agent_status_dao.get_logged_statuses.assert_called_once_with(
+            tenant_uuids=None
+        )
+        self.agent_status_dao.get_status.assert_not_called()
         self.logoff_action.logoff_agent.assert_called_once_with(agent_status)
         self.agent_dao.get_agent.assert_called_once_with(agent_id)
         self.login_action.login_agent.assert_called_once_with(
             agent, agent_status.extension, agent_status.context
         )
+
+    def test_relog_all_agents_reports_failures(self):
+        agent_statuses = [Mock(agent_id=1), Mock(agent_id=2)]
+        self.agent_status_dao.get_logged_statuses.return_value = agent_statuses
+        self.login_action.login_agent.side_effect = [Exception('AMI error'), None]
+
+        results = self.relog_manager.relog_all_agents()
+
+        assert_that(
+            results,
+            contains_exactly(
+                has_properties(agent_id=1, error='AMI error'),
+                has_properties(agent_id=2, error=None),
+            ),
+        )
+        self.assertEqual(self.logoff_action.logoff_agent.call_count, 2)
+
+    def test_relog_changed_agents(self):
+        queue_1 = _Queue(1, 'tenant', 'q1', 0)
+        queue_2 = _Queue(2, 'tenant', 'q2', 0)
+        unchanged = Mock(agent_id=1, queues=[queue_1])
+        changed = Mock(agent_id=2, queues=[queue_1])
+        self.agent_status_dao.get_logged_statuses.return_value = [unchanged, changed]
+        self.agent_dao.get_agents.return_value = {
+            1: _Agent(1, 'tenant', '1001', [queue_1], []),
+            2: _Agent(2, 'tenant', '1002', [queue_2], []),
+        }
+
+        results = self.relog_manager.relog_all_agents(mode='changes')
+
+        assert_that(results, contains_exactly(has_properties(agent_id=2, error=None)))
+        self.on_agent_updated_manager.update_queues.assert_called_once()
+        (
+            agent_status,
+            queue_delta,
+        ), _ = self.on_agent_updated_manager.update_queues.call_args
+        self.assertEqual(agent_status, changed)
+        self.assertEqual(queue_delta.added, [queue_2])
+        self.assertEqual(queue_delta.removed, [queue_1])
+        self.logoff_action.logoff_agent.assert_not_called()
+        self.login_action.login_agent.assert_not_called()
+
+    def test_relog_changed_agents_deleted_agent(self):
+        self.agent_status_dao.get_logged_statuses.return_value = [Mock(agent_id=1)]
+        self.agent_dao.get_agents.return_value = {}
+
+        results = self.relog_manager.relog_all_agents(mode='changes')
+
+        assert_that(
+            results,
+            contains_exactly(has_properties(agent_id=1, error='no such agent')),
+        )
+        self.agent_dao.get_agents.assert_called_once_with([1], ignore_missing=True)
+        self.on_agent_updated_manager.update_queues.assert_not_called()
+
+    def test_relog_changed_agents_no_agents(self):
+        self.agent_status_dao.get_logged_statuses.return_value = []
+
+        results = self.relog_manager.relog_all_agents(mode='changes')
+
+        assert_that(results, empty())
+        self.agent_dao.get_agents.assert_not_called()
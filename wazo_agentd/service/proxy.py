@@ -1,143 +1,295 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-import threading
+import functools
+
+from xivo_dao.helpers import db_utils
+
+from wazo_agentd.exception import NoSuchAgentError
+from wazo_agentd.metrics import SERVICE_OPERATION_DURATION
+from wazo_agentd.service.handler.on_queue import AGENT_ID_FROM_IFACE
+from wazo_agentd.service.lock import LockManager
+
+
+def _operation(function):
+    name = function.__name__
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        with SERVICE_OPERATION_DURATION.labels(operation=name).time():
+            with self._locks.operation(name):
+                return function(self, *args, **kwargs)
+
+    return wrapper
 
 
 class ServiceProxy:
-    def __init__(self):
-        self._lock = threading.Lock()
+    def __init__(self, agent_dao, agent_status_dao, line_dao, lock_manager=None):
+        self._agent_dao = agent_dao
+        self._agent_status_dao = agent_status_dao
+        self._line_dao = line_dao
+        self._locks = lock_manager or LockManager()
         self.login_handler = None
         self.logoff_handler = None
         self.membership_handler = None
         self.on_agent_handler = None
         self.on_queue_handler = None
         self.pause_handler = None
+        self.reconcile_handler = None
         self.relog_handler = None
         self.status_handler = None
 
+    @_operation
     def add_agent_to_queue(self, agent_id, queue_id, tenant_uuids=None):
-        with self._lock:
+        with self._locks.agent(agent_id, ('queue', queue_id)):
             self.membership_handler.handle_add_to_queue(
                 agent_id, queue_id, tenant_uuids=tenant_uuids
             )
 
+    @_operation
     def remove_agent_from_queue(self, agent_id, queue_id, tenant_uuids=None):
-        with self._lock:
+        with self._locks.agent(agent_id, ('queue', queue_id)):
             self.membership_handler.handle_remove_from_queue(
                 agent_id, queue_id, tenant_uuids=tenant_uuids
             )
 
+    @_operation
+    def add_agents_to_queues(self, members, tenant_uuids=None):
+        with self._locks.keys(*_member_keys(members)):
+            self.membership_handler.handle_add_to_queues(
+                members, tenant_uuids=tenant_uuids
+            )
+
+    @_operation
+    def remove_agents_from_queues(self, members, tenant_uuids=None):
+        with self._locks.keys(*_member_keys(members)):
+            self.membership_handler.handle_remove_from_queues(
+                members, tenant_uuids=tenant_uuids
+            )
+
+    @_operation
     def login_agent_by_id(self, agent_id, extension, context, tenant_uuids=None):
-        with self._lock:
+        with self._locks.agent(agent_id, ('extension', extension, context)):
             self.login_handler.handle_login_by_id(
                 agent_id, extension, context, tenant_uuids=tenant_uuids
             )
 
+    @_operation
     def login_agent_by_number(
         self, agent_number, extension, context, tenant_uuids=None
     ):
-        with self._lock:
+        agent_key = self._agent_key_by_number(agent_number, tenant_uuids)
+        with self._locks.keys(agent_key, ('extension', extension, context)):
             self.login_handler.handle_login_by_number(
                 agent_number, extension, context, tenant_uuids=tenant_uuids
             )
 
+    @_operation
     def login_user_agent(self, user_uuid, line_id, tenant_uuids=None):
-        with self._lock:
+        agent_key = self._agent_key_by_user(user_uuid, tenant_uuids)
+        with self._locks.keys(agent_key, self._extension_key_by_line(line_id)):
             self.login_handler.handle_login_user_agent(
                 user_uuid, line_id, tenant_uuids=tenant_uuids
             )
 
+    @_operation
     def logoff_agent_by_id(self, agent_id, tenant_uuids=None):
-        with self._lock:
+        with self._locks.agent(agent_id):
             self.logoff_handler.handle_logoff_by_id(agent_id, tenant_uuids=tenant_uuids)
 
+    @_operation
     def logoff_agent_by_number(self, agent_number, tenant_uuids=None):
-        with self._lock:
+        with self._locks.keys(self._agent_key_by_number(agent_number, tenant_uuids)):
             self.logoff_handler.handle_logoff_by_number(
                 agent_number, tenant_uuids=tenant_uuids
             )
 
+    @_operation
     def logoff_user_agent(self, user_uuid, tenant_uuids=None):
-        with self._lock:
+        with self._locks.keys(self._agent_key_by_user(user_uuid, tenant_uuids)):
             self.logoff_handler.handle_logoff_user_agent(
                 user_uuid, tenant_uuids=tenant_uuids
             )
 
-    def logoff_all(self, tenant_uuids=None):
-        with self._lock:
-            self.logoff_handler.handle_logoff_all(tenant_uuids=tenant_uuids)
+    @_operation
+    def logoff_all(self, tenant_uuids=None, concurrency=None, job=None):
+        with self._locks.all():
+            return self.logoff_handler.handle_logoff_all(
+                tenant_uuids=tenant_uuids, concurrency=concurrency, job=job
+            )
 
-    def relog_all(self, tenant_uuids=None):
-        with self._lock:
-            self.relog_handler.handle_relog_all(tenant_uuids=tenant_uuids)
+    @_operation
+    def relog_all(self, tenant_uuids=None, concurrency=None, job=None, mode='full'):
+        with self._locks.all():
+            return self.relog_handler.handle_relog_all(
+                tenant_uuids=tenant_uuids, concurrency=concurrency, job=job, mode=mode
+            )
 
+    @_operation
+    def reconcile(self):
+        with self._locks.all():
+            return self.reconcile_handler.handle_reconcile()
+
+    @_operation
     def pause_agent_by_number(self, agent_number, reason, tenant_uuids=None):
-        with self._lock:
+        with self._locks.keys(self._agent_key_by_number(agent_number, tenant_uuids)):
             self.pause_handler.handle_pause_by_number(
                 agent_number, reason, tenant_uuids=tenant_uuids
             )
 
+    @_operation
     def pause_user_agent(self, user_uuid, reason, tenant_uuids=None):
-        with self._lock:
+        with self._locks.keys(self._agent_key_by_user(user_uuid, tenant_uuids)):
             self.pause_handler.handle_pause_user_agent(
                 user_uuid, reason, tenant_uuids=tenant_uuids
             )
 
+    @_operation
     def unpause_agent_by_number(self, agent_number, tenant_uuids=None):
-        with self._lock:
+        with self._locks.keys(self._agent_key_by_number(agent_number, tenant_uuids)):
             self.pause_handler.handle_unpause_by_number(
                 agent_number, tenant_uuids=tenant_uuids
             )
 
+    @_operation
     def unpause_user_agent(self, user_uuid, tenant_uuids=None):
-        with self._lock:
+        with self._locks.keys(self._agent_key_by_user(user_uuid, tenant_uuids)):
             self.pause_handler.handle_unpause_user_agent(
                 user_uuid, tenant_uuids=tenant_uuids
             )
 
+    # Status reads never take the locks: each read is a consistent snapshot of
+    # the stored status, and must not wait behind logins or bulk operations.
+
+    @_operation
     def get_agent_status_by_id(self, agent_id, tenant_uuids=None):
-        with self._lock:
-            return self.status_handler.handle_status_by_id(
-                agent_id, tenant_uuids=tenant_uuids
-            )
+        return self.status_handler.handle_status_by_id(
+            agent_id, tenant_uuids=tenant_uuids
+        )
 
+    @_operation
     def get_agent_status_by_number(self, agent_number, tenant_uuids=None):
-        with self._lock:
-            return self.status_handler.handle_status_by_number(
-                agent_number, tenant_uuids=tenant_uuids
-            )
+        return self.status_handler.handle_status_by_number(
+            agent_number, tenant_uuids=tenant_uuids
+        )
 
+    @_operation
     def get_user_agent_status(self, user_uuid, tenant_uuids=None):
-        with self._lock:
-            return self.status_handler.handle_status_by_user(
-                user_uuid, tenant_uuids=tenant_uuids
-            )
+        return self.status_handler.handle_status_by_user(
+            user_uuid, tenant_uuids=tenant_uuids
+        )
 
-    def get_agent_statuses(self, tenant_uuids=None):
-        with self._lock:
-            return self.status_handler.handle_statuses(tenant_uuids=tenant_uuids)
+    @_operation
+    def get_agent_statuses(
+        self,
+        tenant_uuids=None,
+        since_version=None,
+        filters=None,
+        limit=None,
+        offset=None,
+        fields=None,
+    ):
+        return self.status_handler.handle_statuses(
+            tenant_uuids=tenant_uuids,
+            since_version=since_version,
+            filters=filters,
+            limit=limit,
+            offset=offset,
+            fields=fields,
+        )
+
+    def get_agent_statuses_version(self, tenant_uuids=None):
+        return self.status_handler.handle_statuses_version(tenant_uuids=tenant_uuids)
 
+    @_operation
     def on_agent_updated(self, agent):
-        with self._lock:
+        with self._locks.agent(agent['id']):
             return self.on_agent_handler.handle_on_agent_updated(agent['id'])
 
+    @_operation
     def on_agent_deleted(self, agent):
-        with self._lock:
+        with self._locks.agent(agent['id']):
             return self.on_agent_handler.handle_on_agent_deleted(agent['id'])
 
+    # A queue change updates the membership of any of its agents, which are not
+    # known before the change is handled: the whole service is locked.
+
+    @_operation
     def on_queue_updated(self, queue):
-        with self._lock:
+        with self._locks.all():
             return self.on_queue_handler.handle_on_queue_updated(queue['id'])
 
+    @_operation
     def on_queue_deleted(self, queue):
-        with self._lock:
+        with self._locks.all():
             return self.on_queue_handler.handle_on_queue_deleted(queue['id'])
 
+    @_operation
     def on_agent_paused(self, agent):
         paused = agent['Paused'] == '1'
-        with self._lock:
+        with self._locks.keys(*self._agent_keys_by_interface(agent)):
             if paused:
                 return self.on_queue_handler.handle_on_agent_paused(agent)
             else:
                 return self.on_queue_handler.handle_on_agent_unpaused(agent)
+
+    # The lock of an agent is always keyed by its ID, so that operations made by
+    # ID, by number or by user on the same agent are serialized with each other.
+    # When the agent does not exist, the handler will fail anyway.
+
+    def _agent_key_by_number(self, agent_number, tenant_uuids):
+        agent_status = self._agent_status_dao.get_status_by_number(
+            agent_number, tenant_uuids=tenant_uuids
+        )
+        if agent_status is not None:
+            return ('agent', agent_status.agent_id)
+        try:
+            with db_utils.session_scope():
+                agent = self._agent_dao.get_agent_by_number(
+                    agent_number, tenant_uuids=tenant_uuids
+                )
+        except NoSuchAgentError:
+            return ('agent_number', agent_number)
+        return ('agent', agent.id)
+
+    def _agent_key_by_user(self, user_uuid, tenant_uuids):
+        agent_status = self._agent_status_dao.get_status_by_user(
+            user_uuid, tenant_uuids=tenant_uuids
+        )
+        if agent_status is not None:
+            return ('agent', agent_status.agent_id)
+        try:
+            with db_utils.session_scope():
+                agent = self._agent_dao.get_agent_by_user_uuid(
+                    user_uuid, tenant_uuids=tenant_uuids
+                )
+        except NoSuchAgentError:
+            return ('user', user_uuid)
+        return ('agent', agent.id)
+
+    # A login on a line locks the extension of the line, so that it is serialized
+    # with the logins made on this extension directly.
+
+    def _extension_key_by_line(self, line_id):
+        try:
+            with db_utils.session_scope():
+                line_dao = self._line_dao
+                extension, context = line_dao.get_main_extension_context_from_line_id(
+                    line_id
+                )
+        except Exception:
+            # The handler fails on an unknown line or a line without extension
+            return ('line', line_id)
+        return ('extension', extension, context)
+
+    def _agent_keys_by_interface(self, msg):
+        matches = AGENT_ID_FROM_IFACE.match(msg.get('Interface', ''))
+        if not matches:
+            return ()
+        return (('agent', int(matches.group(1))),)
+
+
+def _member_keys(members):
+    for agent_id, queue_id in members:
+        yield ('agent', agent_id)
+        yield ('queue', queue_id)
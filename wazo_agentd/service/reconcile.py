@@ -0,0 +1,59 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ReconcileScheduler:
+    # Reconciles the agents with Asterisk every interval seconds, and when
+    # run_now is called, e.g. once wazo-amid can be reached after the start.
+
+    def __init__(self, service_proxy, enabled=True, interval=300):
+        self._service_proxy = service_proxy
+        self._enabled = enabled
+        self._interval = interval
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        if not self._enabled:
+            logger.info('Reconciliation with Asterisk is disabled')
+            return
+        self._thread = threading.Thread(target=self._loop, name='reconcile')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def run_now(self, *args):
+        self._wakeup.set()
+
+    def _loop(self):
+        while True:
+            self._wakeup.wait(self._interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                return
+            self._run()
+
+    def _run(self):
+        try:
+            self._service_proxy.reconcile()
+        except Exception:
+            logger.exception('Reconciliation with Asterisk failed')
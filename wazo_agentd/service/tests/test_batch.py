@@ -0,0 +1,104 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, contains_exactly, equal_to, instance_of, none
+
+from wazo_agentd.exception import AgentNotLoggedError, NoSuchAgentError
+from wazo_agentd.service.batch import BatchExecutor, BatchOperation
+
+
+class TestBatchExecutor(unittest.TestCase):
+    def setUp(self):
+        self.service_proxy = Mock()
+        self.agent_dao = Mock()
+        self.agent1 = Mock(id=1, number='1001')
+        self.agent2 = Mock(id=2, number='1002')
+        self.agent_dao.find_agents.return_value = [self.agent1, self.agent2]
+        self.executor = BatchExecutor(self.service_proxy, self.agent_dao)
+
+    def test_run(self):
+        operations = [
+            BatchOperation('login', agent_id=1, extension='1001', context='default'),
+            BatchOperation('pause', agent_number='1002', reason='lunch'),
+            BatchOperation('unpause', agent_id=2),
+            BatchOperation('logoff', agent_number='1001'),
+        ]
+
+        results = self.executor.run(operations, tenant_uuids=['tenant'])
+
+        self.agent_dao.find_agents.assert_called_once_with(
+            [1, 2], ['1002', '1001'], tenant_uuids=['tenant']
+        )
+        self.service_proxy.login_agent_by_id.assert_called_once_with(
+            1, '1001', 'default', tenant_uuids=['tenant']
+        )
+        self.service_proxy.pause_agent_by_number.assert_called_once_with(
+            '1002', 'lunch', tenant_uuids=['tenant']
+        )
+        self.service_proxy.unpause_agent_by_number.assert_called_once_with(
+            '1002', tenant_uuids=['tenant']
+        )
+        self.service_proxy.logoff_agent_by_id.assert_called_once_with(
+            1, tenant_uuids=['tenant']
+        )
+        assert_that(
+            [(r.operation, r.agent_id, r.agent_number, r.error) for r in results],
+            contains_exactly(
+                ('login', 1, '1001', None),
+                ('pause', 2, '1002', None),
+                ('unpause', 2, '1002', None),
+                ('logoff', 1, '1001', None),
+            ),
+        )
+
+    def test_run_unknown_agent(self):
+        operations = [BatchOperation('logoff', agent_id=3)]
+
+        results = self.executor.run(operations)
+
+        self.service_proxy.logoff_agent_by_id.assert_not_called()
+        assert_that(results[0].error, instance_of(NoSuchAgentError))
+
+    def test_run_failure_does_not_stop_others(self):
+        self.service_proxy.logoff_agent_by_id.side_effect = [
+            AgentNotLoggedError(),
+            None,
+        ]
+        operations = [
+            BatchOperation('logoff', agent_id=1),
+            BatchOperation('logoff', agent_id=1),
+        ]
+
+        results = self.executor.run(operations)
+
+        assert_that(results[0].error, instance_of(AgentNotLoggedError))
+        assert_that(results[1].error, none())
+
+    def test_run_same_agent_in_order(self):
+        calls = []
+        lock = threading.Lock()
+
+        def record(operation):
+            def function(*args, **kwargs):
+                with lock:
+                    calls.append((operation, args[0]))
+
+            return function
+
+        self.service_proxy.pause_agent_by_number.side_effect = record('pause')
+        self.service_proxy.unpause_agent_by_number.side_effect = record('unpause')
+        operations = [
+            BatchOperation('pause', agent_id=1),
+            BatchOperation('pause', agent_id=2),
+            BatchOperation('unpause', agent_id=1),
+            BatchOperation('unpause', agent_id=2),
+        ]
+
+        self.executor.run(operations)
+
+        agent1_calls = [call for call in calls if call[1] == '1001']
+        assert_that(agent1_calls, equal_to([('pause', '1001'), ('unpause', '1001')]))
@@ -0,0 +1,66 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, contains_exactly, empty, equal_to, has_properties
+
+from wazo_agentd.exception import AgentNotLoggedError
+from wazo_agentd.service.bulk import BulkExecutor
+
+
+def _agent_statuses(count):
+    return [Mock(agent_id=id_, agent_number=str(1000 + id_)) for id_ in range(count)]
+
+
+class TestBulkExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = BulkExecutor(max_concurrency=4)
+
+    def test_run_without_agents(self):
+        function = Mock()
+
+        results = self.executor.run(function, [])
+
+        assert_that(results, empty())
+        function.assert_not_called()
+
+    def test_failures_are_isolated(self):
+        def function(agent_status):
+            if agent_status.agent_id == 1:
+                raise AgentNotLoggedError()
+            if agent_status.agent_id == 2:
+                raise Exception('AMI error')
+
+        results = self.executor.run(function, _agent_statuses(4))
+
+        assert_that(
+            results,
+            contains_exactly(
+                has_properties(agent_id=0, agent_number='1000', error=None),
+                has_properties(agent_id=1, error='not logged in'),
+                has_properties(agent_id=2, error='AMI error'),
+                has_properties(agent_id=3, error=None),
+            ),
+        )
+
+    def test_concurrency_is_bounded(self):
+        for concurrency, expected in ((None, 4), (2, 2), (100, 4)):
+            lock = threading.Lock()
+            running = []
+            max_running = []
+
+            def function(agent_status):
+                with lock:
+                    running.append(agent_status)
+                    max_running.append(len(running))
+                time.sleep(0.01)
+                with lock:
+                    running.remove(agent_status)
+
+            self.executor.run(function, _agent_statuses(12), concurrency)
+
+            assert_that(max(max_running), equal_to(expected))
@@ -0,0 +1,108 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, calling, equal_to, has_entries, has_properties, raises
+
+from wazo_agentd.exception import NoSuchJobError
+from wazo_agentd.service.bulk import BulkExecutor, BulkResult
+from wazo_agentd.service.job import JobScheduler
+
+TENANT_UUID = '00000000-0000-4000-8000-00000000000a'
+OTHER_TENANT_UUID = '00000000-0000-4000-8000-00000000000b'
+
+
+class TestJobScheduler(unittest.TestCase):
+    def setUp(self):
+        self.bus_publisher = Mock()
+        self.scheduler = JobScheduler(
+            self.bus_publisher, max_concurrent_jobs=1, max_finished_jobs=2
+        )
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def test_progress_is_reported(self):
+        proceed = threading.Event()
+        agent_statuses = [Mock(agent_id=id_, agent_number=str(id_)) for id_ in (1, 2)]
+
+        def operation(agent_status):
+            if agent_status.agent_id == 2:
+                proceed.wait(timeout=5)
+                raise Exception('AMI error')
+
+        def run(job):
+            BulkExecutor(max_concurrency=1).run(operation, agent_statuses, job=job)
+
+        job = self.scheduler.submit('logoff', TENANT_UUID, run)
+        self._wait_until(lambda: job.processed == 1)
+
+        assert_that(
+            job, has_properties(status='running', total=2, failed=0, remaining=1)
+        )
+
+        proceed.set()
+        self.scheduler.stop()
+
+        assert_that(
+            job, has_properties(status='finished', processed=2, failed=1, remaining=0)
+        )
+        event = self.bus_publisher.publish.call_args[0][0]
+        assert_that(event.tenant_uuid, equal_to(TENANT_UUID))
+        assert_that(
+            event.content,
+            has_entries(uuid=job.uuid, status='finished', processed=2, failed=1),
+        )
+
+    def test_job_error(self):
+        def run(job):
+            raise Exception('db error')
+
+        job = self.scheduler.submit('relog', TENANT_UUID, run)
+        self.scheduler.stop()
+
+        assert_that(job.status, equal_to('error'))
+        self.bus_publisher.publish.assert_called_once()
+
+    def test_get(self):
+        job = self.scheduler.submit('logoff', TENANT_UUID, Mock())
+
+        assert_that(self.scheduler.get(job.uuid, [TENANT_UUID]), equal_to(job))
+        assert_that(
+            calling(self.scheduler.get).with_args(job.uuid, [OTHER_TENANT_UUID]),
+            raises(NoSuchJobError),
+        )
+        assert_that(
+            calling(self.scheduler.get).with_args('unknown'), raises(NoSuchJobError)
+        )
+
+    def test_finished_jobs_are_pruned(self):
+        jobs = [self.scheduler.submit('logoff', TENANT_UUID, Mock()) for _ in range(3)]
+        self.scheduler.stop()
+
+        assert_that(
+            calling(self.scheduler.get).with_args(jobs[0].uuid),
+            raises(NoSuchJobError),
+        )
+        assert_that(self.scheduler.get(jobs[2].uuid), equal_to(jobs[2]))
+
+    def test_job_counts_results(self):
+        job = self.scheduler.submit('logoff', TENANT_UUID, Mock())
+        job.start(3)
+
+        job.add_result(BulkResult(1, '1001', None))
+        job.add_result(BulkResult(2, '1002', 'not logged in'))
+
+        assert_that(job, has_properties(processed=2, failed=1, remaining=1))
+
+    @staticmethod
+    def _wait_until(condition, timeout=5):
+        event = threading.Event()
+        for _ in range(int(timeout / 0.01)):
+            if condition():
+                return
+            event.wait(0.01)
+        raise AssertionError('condition not met')
@@ -0,0 +1,189 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+import time
+import unittest
+from collections import defaultdict
+from unittest.mock import patch
+
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    equal_to,
+    greater_than,
+    has_entries,
+    less_than,
+)
+
+from ..lock import KeyedLock, LockManager
+
+
+class TestKeyedLock(unittest.TestCase):
+    def setUp(self):
+        self.keyed_lock = KeyedLock()
+
+    def test_unused_keys_are_released(self):
+        with self.keyed_lock('a', 'b'):
+            pass
+
+        assert_that(self.keyed_lock._key_locks, equal_to({}))
+
+    def test_overlapping_keys_do_not_deadlock(self):
+        def lock(keys):
+            for _ in range(200):
+                with self.keyed_lock(*keys):
+                    pass
+
+        threads = [
+            threading.Thread(target=lock, args=(('a', 'b'),)),
+            threading.Thread(target=lock, args=(('b', 'a'),)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert_that(any(thread.is_alive() for thread in threads), equal_to(False))
+
+
+class TestLockManagerInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.lock_manager = LockManager(hold_warning_threshold=0.05)
+
+    def _status(self):
+        status = defaultdict(dict)
+        self.lock_manager.provide_status(status)
+        return status['locks']
+
+    def test_holders_and_waiting(self):
+        acquired = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with self.lock_manager.operation('login_agent_by_id'):
+                with self.lock_manager.agent(42, ('extension', '1001', 'default')):
+                    acquired.set()
+                    release.wait()
+
+        def wait():
+            with self.lock_manager.operation('logoff_agent_by_id'):
+                with self.lock_manager.agent(42):
+                    pass
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        acquired.wait()
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        time.sleep(0.05)
+
+        status = self._status()
+        waiting = self.lock_manager.count_waiting()
+        release.set()
+        holder.join()
+        waiter.join()
+
+        assert_that(status['waiting'], equal_to(1))
+        assert_that(waiting, equal_to(1))
+        assert_that(
+            status['holders'],
+            contains_exactly(
+                has_entries(
+                    operation='login_agent_by_id',
+                    mode='shared',
+                    keys=contains_exactly('agent:42', 'extension:1001:default'),
+                )
+            ),
+        )
+        assert_that(self._status(), equal_to({'waiting': 0, 'holders': []}))
+
+    def test_long_hold_is_logged(self):
+        with patch('wazo_agentd.service.lock.logger') as logger:
+            with self.lock_manager.operation('relog_all'):
+                with self.lock_manager.all():
+                    time.sleep(0.1)
+
+        logger.warning.assert_called_once()
+        assert_that(logger.warning.call_args[0][2], equal_to('relog_all'))
+
+    def test_short_hold_is_not_logged(self):
+        with patch('wazo_agentd.service.lock.logger') as logger:
+            with self.lock_manager.agent(42):
+                pass
+
+        logger.warning.assert_not_called()
+
+
+class TestLockManagerStress(unittest.TestCase):
+    operation_duration = 0.02
+    operations = 40
+
+    def setUp(self):
+        self.lock_manager = LockManager()
+        self.counters = {}
+        self.counters_lock = threading.Lock()
+
+    def _operation(self, agent_id):
+        with self.lock_manager.agent(agent_id):
+            with self.counters_lock:
+                count = self.counters.get(agent_id, 0)
+            time.sleep(self.operation_duration)  # AMI round-trip
+            with self.counters_lock:
+                self.counters[agent_id] = count + 1
+
+    def _run(self, thread_count, agent_ids):
+        pending = list(agent_ids)
+        pending_lock = threading.Lock()
+
+        def worker():
+            while True:
+                with pending_lock:
+                    if not pending:
+                        return
+                    agent_id = pending.pop()
+                self._operation(agent_id)
+
+        threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+        return self.operations / elapsed
+
+    def test_throughput_scales_with_thread_count(self):
+        agent_ids = list(range(self.operations))
+
+        single_thread = self._run(1, agent_ids)
+        ten_threads = self._run(10, agent_ids)
+
+        assert_that(ten_threads, greater_than(single_thread * 4))
+
+    def test_same_agent_operations_are_serialized(self):
+        agent_ids = [1] * self.operations
+
+        throughput = self._run(10, agent_ids)
+
+        assert_that(self.counters[1], equal_to(self.operations))
+        assert_that(throughput, less_than(1.5 / self.operation_duration))
+
+    def test_exclusive_lock_waits_for_agent_operations(self):
+        events = []
+        started = threading.Event()
+
+        def agent_operation():
+            with self.lock_manager.agent(1):
+                started.set()
+                time.sleep(self.operation_duration)
+                events.append('agent')
+
+        thread = threading.Thread(target=agent_operation)
+        thread.start()
+        started.wait()
+        with self.lock_manager.all():
+            events.append('all')
+        thread.join()
+
+        assert_that(events, equal_to(['agent', 'all']))
@@ -1,6 +1,8 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import threading
+import time
 import unittest
 from unittest.mock import Mock
 from unittest.mock import sentinel as s
@@ -14,6 +16,7 @@ from wazo_agentd.service.handler.pause import PauseHandler
 from wazo_agentd.service.handler.relog import RelogHandler
 from wazo_agentd.service.handler.status import StatusHandler
 from wazo_agentd.service.proxy import ServiceProxy
+from wazo_agentd.store import AgentStatusStore
 
 
 class TestServiceProxy(unittest.TestCase):
@@ -26,7 +29,18 @@ class TestServiceProxy(unittest.TestCase):
         self.pause_handler = Mock(PauseHandler)
         self.relog_handler = Mock(RelogHandler)
         self.status_handler = Mock(StatusHandler)
-        self.proxy = ServiceProxy()
+        self.agent_dao = Mock()
+        self.agent_status_store = Mock(AgentStatusStore)
+        self.agent_status_store.get_status_by_number.return_value = None
+        self.agent_status_store.get_status_by_user.return_value = None
+        self.line_dao = Mock()
+        self.line_dao.get_main_extension_context_from_line_id.return_value = (
+            '1001',
+            'default',
+        )
+        self.proxy = ServiceProxy(
+            self.agent_dao, self.agent_status_store, self.line_dao
+        )
         self.proxy.login_handler = self.login_handler
         self.proxy.logoff_handler = self.logoff_handler
         self.proxy.membership_handler = self.membership_handler
@@ -101,18 +115,24 @@ class TestServiceProxy(unittest.TestCase):
         )
 
     def test_logoff_all(self):
-        self.proxy.logoff_all(tenant_uuids=self.tenants)
+        result = self.proxy.logoff_all(
+            tenant_uuids=self.tenants, concurrency=s.concurrency, job=s.job
+        )
 
         self.logoff_handler.handle_logoff_all.assert_called_once_with(
-            tenant_uuids=self.tenants
+            tenant_uuids=self.tenants, concurrency=s.concurrency, job=s.job
         )
+        self.assertEqual(result, self.logoff_handler.handle_logoff_all.return_value)
 
     def test_relog_all(self):
-        self.proxy.relog_all(tenant_uuids=self.tenants)
+        result = self.proxy.relog_all(
+            tenant_uuids=self.tenants, concurrency=s.concurrency, job=s.job
+        )
 
         self.relog_handler.handle_relog_all.assert_called_once_with(
-            tenant_uuids=self.tenants
+            tenant_uuids=self.tenants, concurrency=s.concurrency, job=s.job, mode='full'
         )
+        self.assertEqual(result, self.relog_handler.handle_relog_all.return_value)
 
     def test_pause_agent_by_number(self):
         self.proxy.pause_agent_by_number(
@@ -145,11 +165,33 @@ class TestServiceProxy(unittest.TestCase):
         )
 
     def test_get_agent_statuses(self):
-        self.proxy.get_agent_statuses(tenant_uuids=self.tenants)
+        self.proxy.get_agent_statuses(
+            tenant_uuids=self.tenants,
+            since_version=42,
+            filters={'logged': True},
+            limit=10,
+            offset=20,
+            fields=['id'],
+        )
 
         self.status_handler.handle_statuses.assert_called_once_with(
+            tenant_uuids=self.tenants,
+            since_version=42,
+            filters={'logged': True},
+            limit=10,
+            offset=20,
+            fields=['id'],
+        )
+
+    def test_get_agent_statuses_version(self):
+        result = self.proxy.get_agent_statuses_version(tenant_uuids=self.tenants)
+
+        self.status_handler.handle_statuses_version.assert_called_once_with(
             tenant_uuids=self.tenants
         )
+        self.assertEqual(
+            result, self.status_handler.handle_statuses_version.return_value
+        )
 
     def test_on_agent_updated(self):
         self.proxy.on_agent_updated(self.agent)
@@ -192,3 +234,146 @@ class TestServiceProxy(unittest.TestCase):
         self.on_queue_handler.handle_on_queue_deleted.assert_called_once_with(
             self.queue['id']
         )
+
+    def test_operations_on_different_agents_run_in_parallel(self):
+        probe = self.logoff_handler.handle_logoff_by_id.side_effect = _Probe()
+
+        _run_in_threads(self.proxy.logoff_agent_by_id, range(4))
+
+        assert probe.max_concurrency > 1
+
+    def test_operations_on_same_agent_are_serialized(self):
+        self.agent_status_store.get_status_by_number.return_value = Mock(agent_id=42)
+        probe = _Probe()
+        self.logoff_handler.handle_logoff_by_id.side_effect = probe
+        self.logoff_handler.handle_logoff_by_number.side_effect = probe
+
+        def logoff(i):
+            if i % 2:
+                self.proxy.logoff_agent_by_id(42)
+            else:
+                self.proxy.logoff_agent_by_number('1042')
+
+        _run_in_threads(logoff, range(4))
+
+        assert probe.max_concurrency == 1
+
+    def test_logoff_all_is_exclusive(self):
+        agents_probe = _Probe()
+        all_probe = _Probe(others=agents_probe)
+        self.logoff_handler.handle_logoff_all.side_effect = all_probe
+        self.logoff_handler.handle_logoff_by_id.side_effect = agents_probe
+
+        def logoff(i):
+            if i == 0:
+                self.proxy.logoff_all()
+            else:
+                self.proxy.logoff_agent_by_id(i)
+
+        _run_in_threads(logoff, range(4))
+
+        assert all_probe.overlapped is False
+
+    def test_queue_events_are_exclusive(self):
+        agents_probe = _Probe()
+        queue_probe = _Probe(others=agents_probe)
+        self.on_queue_handler.handle_on_queue_updated.side_effect = queue_probe
+        self.on_queue_handler.handle_on_queue_deleted.side_effect = queue_probe
+        self.membership_handler.handle_add_to_queue.side_effect = agents_probe
+
+        def run(i):
+            if i == 0:
+                self.proxy.on_queue_updated(self.queue)
+            elif i == 1:
+                self.proxy.on_queue_deleted(self.queue)
+            else:
+                self.proxy.add_agent_to_queue(i, s.other_queue_id)
+
+        _run_in_threads(run, range(5))
+
+        assert queue_probe.overlapped is False
+        assert queue_probe.max_concurrency == 1
+
+    def test_logins_on_same_extension_are_serialized(self):
+        probe = _Probe()
+        self.login_handler.handle_login_by_id.side_effect = probe
+        self.login_handler.handle_login_user_agent.side_effect = probe
+
+        def login(i):
+            if i % 2:
+                self.proxy.login_agent_by_id(i, '1001', 'default')
+            else:
+                self.proxy.login_user_agent(f'user-{i}', s.line_id)
+
+        _run_in_threads(login, range(4))
+
+        assert probe.max_concurrency == 1
+        self.line_dao.get_main_extension_context_from_line_id.assert_called_with(
+            s.line_id
+        )
+
+    def test_login_user_agent_unknown_line(self):
+        self.line_dao.get_main_extension_context_from_line_id.side_effect = (
+            AttributeError
+        )
+
+        self.proxy.login_user_agent(s.user_uuid, s.line_id)
+
+        self.login_handler.handle_login_user_agent.assert_called_once_with(
+            s.user_uuid, s.line_id, tenant_uuids=None
+        )
+
+    def test_status_reads_do_not_wait_for_bulk_operations(self):
+        relog_started = threading.Event()
+        relog_done = threading.Event()
+
+        def relog_all(**kwargs):
+            relog_started.set()
+            relog_done.wait(timeout=5)
+
+        self.relog_handler.handle_relog_all.side_effect = relog_all
+        relog = threading.Thread(target=self.proxy.relog_all)
+        relog.start()
+        relog_started.wait()
+
+        try:
+            start = time.monotonic()
+            self.proxy.get_agent_statuses()
+            self.proxy.get_agent_status_by_id(s.agent_id)
+            self.proxy.get_agent_status_by_number(s.agent_number)
+            self.proxy.get_user_agent_status(s.user_uuid)
+            elapsed = time.monotonic() - start
+        finally:
+            relog_done.set()
+            relog.join()
+
+        assert elapsed < 1
+        self.agent_dao.get_agent_by_number.assert_not_called()
+
+
+class _Probe:
+    def __init__(self, others=None):
+        self._lock = threading.Lock()
+        self._others = others
+        self.running = 0
+        self.max_concurrency = 0
+        self.overlapped = False
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            self.running += 1
+            self.max_concurrency = max(self.max_concurrency, self.running)
+        for _ in range(5):
+            if self._others and self._others.running:
+                self.overlapped = True
+            time.sleep(0.01)
+        with self._lock:
+            self.running -= 1
+
+
+def _run_in_threads(function, args):
+    threads = [threading.Thread(target=function, args=(arg,)) for arg in args]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
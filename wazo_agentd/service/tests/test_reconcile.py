@@ -0,0 +1,41 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+import unittest
+from unittest.mock import Mock
+
+from wazo_agentd.service.reconcile import ReconcileScheduler
+
+
+class TestReconcileScheduler(unittest.TestCase):
+    def setUp(self):
+        self.service_proxy = Mock()
+        self.reconciled = threading.Event()
+        self.service_proxy.reconcile.side_effect = lambda: self.reconciled.set()
+
+    def test_run_now(self):
+        with ReconcileScheduler(self.service_proxy, interval=3600) as scheduler:
+            scheduler.run_now('token')
+            assert self.reconciled.wait(5)
+
+    def test_interval(self):
+        with ReconcileScheduler(self.service_proxy, interval=0.01):
+            assert self.reconciled.wait(5)
+
+    def test_error_does_not_stop_the_scheduler(self):
+        self.service_proxy.reconcile.side_effect = [Exception(), None, None]
+
+        with ReconcileScheduler(self.service_proxy, interval=0.01):
+            for _ in range(100):
+                if self.service_proxy.reconcile.call_count >= 2:
+                    break
+                threading.Event().wait(0.01)
+
+        assert self.service_proxy.reconcile.call_count >= 2
+
+    def test_disabled(self):
+        with ReconcileScheduler(self.service_proxy, enabled=False) as scheduler:
+            scheduler.run_now()
+
+        self.service_proxy.reconcile.assert_not_called()
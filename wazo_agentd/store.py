@@ -0,0 +1,408 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import datetime
+import itertools
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from sqlalchemy import event
+from xivo_dao.helpers import db_utils
+from xivo_dao.helpers.db_manager import Session
+
+from wazo_agentd.dao import AgentStatus, _Queue
+from wazo_agentd.exception import NoSuchAgentError
+
+logger = logging.getLogger(__name__)
+
+AgentIdentity = namedtuple('AgentIdentity', ['tenant_uuid', 'user_uuids'])
+
+
+class AgentStatusStore:
+    # In-memory copy of agent_login_status, indexed by agent ID, number, user UUID
+    # and extension. It exposes the same interface as agent_status_dao: writes
+    # are done in the database first, in the caller's session, and applied in
+    # memory once that session is committed. They are dropped if it is rolled
+    # back. Reads of logged agents are answered from memory only. Calls that are
+    # not handled by the store are forwarded to the DAO.
+    #
+    # Entries are immutable and replaced as a whole under the write lock, so that
+    # readers never need to take it.
+    #
+    # Each change of a status, of the queue memberships or of the configuration
+    # of an agent increments a version, recorded for the agent and for its
+    # tenant. Versions start from the time of the start in milliseconds, so that
+    # they keep increasing across restarts. The versions of at most
+    # max_tracked_agents agents are kept, the oldest ones are dropped past this
+    # limit. Changes that cannot be listed by agent, the deletion of an agent or
+    # the edition of a queue, make the earlier changes unknown.
+
+    def __init__(
+        self,
+        agent_status_dao,
+        agent_dao,
+        user_dao,
+        session=Session,
+        max_tracked_agents=10000,
+    ):
+        self._dao = agent_status_dao
+        self._agent_dao = agent_dao
+        self._user_dao = user_dao
+        self._session = session
+        self._changes_key = object()
+        self._lock = threading.Lock()
+        self._statuses = {}
+        self._agent_ids_by_number = {}
+        self._agent_ids_by_user_uuid = {}
+        self._agent_ids_by_extension = {}
+        self._version = int(time.time() * 1000)
+        # Versions of all tenants, and oldest version since which changes are known
+        self._global_version = self._known_since_version = self._version
+        self._tenant_versions = {}
+        self._agent_versions = {}
+        self._max_tracked_agents = max_tracked_agents
+        event.listen(session, 'after_commit', self._apply_changes)
+        event.listen(session, 'after_soft_rollback', self._discard_changes)
+
+    def __getattr__(self, name):
+        return getattr(self._dao, name)
+
+    def load(self):
+        with db_utils.session_scope():
+            statuses = self._dao.get_logged_statuses()
+
+        with self._lock:
+            self._statuses.clear()
+            self._agent_ids_by_number.clear()
+            self._agent_ids_by_user_uuid.clear()
+            self._agent_ids_by_extension.clear()
+            for status in statuses:
+                self._put(status)
+        logger.info('Loaded the status of %s logged agents', len(statuses))
+
+    def get_status(self, agent_id, tenant_uuids=None):
+        return self._visible(self._statuses.get(agent_id), tenant_uuids)
+
+    def get_status_by_number(self, agent_number, tenant_uuids=None):
+        agent_id = self._agent_ids_by_number.get(agent_number)
+        return self._visible(self._statuses.get(agent_id), tenant_uuids)
+
+    def get_status_by_user(self, user_uuid, tenant_uuids=None):
+        agent_id = self._agent_ids_by_user_uuid.get(str(user_uuid))
+        return self._visible(self._statuses.get(agent_id), tenant_uuids)
+
+    def get_logged_statuses(self, tenant_uuids=None):
+        return [
+            status
+            for status in list(self._statuses.values())
+            if self._visible(status, tenant_uuids)
+        ]
+
+    def get_logged_agent_ids(self, tenant_uuids=None):
+        return [status.agent_id for status in self.get_logged_statuses(tenant_uuids)]
+
+    def get_statuses_for_queue(self, queue_id):
+        return [
+            status
+            for status in list(self._statuses.values())
+            if any(queue.id == queue_id for queue in status.queues)
+        ]
+
+    def get_identity(self, agent_id):
+        # Tenant and user UUIDs of an agent, used as headers of the agent events
+        status = self._statuses.get(agent_id)
+        if status is not None:
+            return AgentIdentity(status.tenant_uuid, status.user_uuids)
+        with db_utils.session_scope():
+            tenant_uuid = self._agent_dao.agent_with_id(agent_id).tenant_uuid
+            return AgentIdentity(tenant_uuid, self._find_user_uuids(agent_id))
+
+    def get_version(self, tenant_uuids=None):
+        if tenant_uuids is None:
+            versions = list(self._tenant_versions.values())
+        else:
+            versions = [self._tenant_versions.get(uuid, 0) for uuid in tenant_uuids]
+        return max(versions + [self._global_version])
+
+    def get_agent_ids_changed_since(self, version):
+        # None when the changes are not known, i.e. before the start, before the
+        # oldest dropped version or before the last change not listed by agent
+        if version < self._known_since_version:
+            return None
+        return {
+            agent_id
+            for agent_id, agent_version in list(self._agent_versions.items())
+            if agent_version > version
+        }
+
+    def is_extension_in_use(self, extension, context):
+        return (extension, context) in self._agent_ids_by_extension
+
+    def log_in_agent(
+        self, agent_id, agent_number, extension, context, interface, state_interface
+    ):
+        self._dao.log_in_agent(
+            agent_id, agent_number, extension, context, interface, state_interface
+        )
+        agent = self._agent_dao.agent_with_id(agent_id)
+        status = AgentStatus(
+            agent_id=agent_id,
+            agent_number=agent_number,
+            tenant_uuid=agent.tenant_uuid,
+            extension=extension,
+            context=context,
+            interface=interface,
+            state_interface=state_interface,
+            login_at=datetime.datetime.utcnow(),
+            paused=False,
+            paused_reason=None,
+            queues=(),
+            user_ids=tuple(agent.user_ids),
+            user_uuids=self._find_user_uuids(agent_id),
+        )
+        self._on_commit(lambda: self._put(status))
+
+    def log_off_agent(self, agent_id):
+        self._dao.log_off_agent(agent_id)
+        self._on_commit(lambda: self._pop(agent_id))
+
+    def add_agent_to_queues(self, agent_id, queues):
+        self._dao.add_agent_to_queues(agent_id, queues)
+        queues = self._to_queues(queues)
+
+        def add(status):
+            queue_ids = {queue.id for queue in queues}
+            kept = tuple(q for q in status.queues if q.id not in queue_ids)
+            return status._replace(queues=kept + queues)
+
+        self._update(agent_id, add)
+
+    def remove_agent_from_queues(self, agent_id, queue_ids):
+        self._dao.remove_agent_from_queues(agent_id, queue_ids)
+
+        def remove(status):
+            queues = tuple(q for q in status.queues if q.id not in queue_ids)
+            return status._replace(queues=queues)
+
+        self._update(agent_id, remove)
+
+    def add_agents_to_queue(self, agent_ids, queue):
+        self._dao.add_agents_to_queue(agent_ids, queue)
+        (queue,) = self._to_queues([queue])
+
+        def add(status):
+            kept = tuple(q for q in status.queues if q.id != queue.id)
+            return status._replace(queues=kept + (queue,))
+
+        for agent_id in agent_ids:
+            self._update(agent_id, add)
+
+    def remove_agents_from_queue(self, agent_ids, queue_id):
+        self._dao.remove_agents_from_queue(agent_ids, queue_id)
+
+        def remove(status):
+            queues = tuple(q for q in status.queues if q.id != queue_id)
+            return status._replace(queues=queues)
+
+        for agent_id in agent_ids:
+            self._update(agent_id, remove)
+
+    def remove_agent_from_all_queues(self, agent_id):
+        self._dao.remove_agent_from_all_queues(agent_id)
+        self._update(agent_id, lambda status: status._replace(queues=()))
+
+    def remove_all_agents_from_queue(self, queue_id):
+        self._dao.remove_all_agents_from_queue(queue_id)
+
+        def remove():
+            for status in self.get_statuses_for_queue(queue_id):
+                queues = tuple(q for q in status.queues if q.id != queue_id)
+                self._put(status._replace(queues=queues))
+
+        self._on_commit(remove)
+
+    def update_penalty(self, agent_id, queue_id, penalty):
+        self._dao.update_penalty(agent_id, queue_id, penalty)
+
+        def update(status):
+            queues = tuple(
+                q._replace(penalty=penalty) if q.id == queue_id else q
+                for q in status.queues
+            )
+            return status._replace(queues=queues)
+
+        self._update(agent_id, update)
+
+    def update_pause_status(self, agent_id, is_paused, reason=None):
+        self._dao.update_pause_status(agent_id, is_paused, reason)
+        self._update(
+            agent_id,
+            lambda status: status._replace(paused=is_paused, paused_reason=reason),
+        )
+
+    def on_agent_created(self, agent):
+        self._on_agent_config_changed(agent['id'])
+
+    def on_agent_edited(self, agent):
+        self._refresh(agent['id'])
+        self._on_agent_config_changed(agent['id'])
+
+    def on_agent_deleted(self, agent):
+        # A deleted agent is not returned with the changed agents
+        status = self._statuses.get(agent['id'])
+        with self._lock:
+            self._increment_version(agent['id'], status and status.tenant_uuid)
+            self._known_since_version = self._version
+
+    def on_queue_changed(self, queue):
+        # Members of the queue, logged or not, changed in the configuration
+        with self._lock:
+            self._version += 1
+            self._global_version = self._known_since_version = self._version
+
+    def on_queue_members_changed(self, agents):
+        # Queue memberships of agents, logged or not, changed in the caller's
+        # session
+        def changed():
+            for agent in agents:
+                self._increment_version(agent.id, agent.tenant_uuid)
+
+        self._on_commit(changed)
+
+    def on_user_agent_association_changed(self, association):
+        self._refresh(association['agent_id'])
+
+    def on_user_deleted(self, user):
+        agent_id = self._agent_ids_by_user_uuid.get(str(user['uuid']))
+        if agent_id is not None:
+            self._refresh(agent_id)
+
+    def _on_agent_config_changed(self, agent_id):
+        status = self._statuses.get(agent_id)
+        if status is not None:
+            tenant_uuid = status.tenant_uuid
+        else:
+            try:
+                with db_utils.session_scope():
+                    tenant_uuid = self._agent_dao.get_agent(agent_id).tenant_uuid
+            except NoSuchAgentError:
+                tenant_uuid = None
+        with self._lock:
+            self._increment_version(agent_id, tenant_uuid)
+
+    def _refresh(self, agent_id):
+        # Number and users of a logged agent, changed in the configuration
+        if agent_id not in self._statuses:
+            return
+        with db_utils.session_scope():
+            try:
+                agent = self._agent_dao.get_agent(agent_id)
+            except NoSuchAgentError:
+                return
+            user_uuids = self._find_user_uuids(agent_id)
+            self._update(
+                agent_id,
+                lambda status: status._replace(
+                    agent_number=agent.number,
+                    user_ids=tuple(agent.user_ids),
+                    user_uuids=user_uuids,
+                ),
+            )
+
+    def _update(self, agent_id, function):
+        def update():
+            status = self._statuses.get(agent_id)
+            if status is not None:
+                self._put(function(status))
+
+        self._on_commit(update)
+
+    def _on_commit(self, change):
+        # Changes are queued in the session and applied in order, under the lock
+        changes = self._session().info.setdefault(self._changes_key, [])
+        changes.append(change)
+
+    def _apply_changes(self, session):
+        changes = session.info.pop(self._changes_key, None)
+        if not changes:
+            return
+        with self._lock:
+            for change in changes:
+                change()
+
+    def _discard_changes(self, session, previous_transaction):
+        session.info.pop(self._changes_key, None)
+
+    def _put(self, status):
+        previous = self._statuses.get(status.agent_id)
+        self._statuses[status.agent_id] = status
+        self._increment_version(status.agent_id, status.tenant_uuid)
+        self._agent_ids_by_number[status.agent_number] = status.agent_id
+        self._agent_ids_by_extension[
+            (status.extension, status.context)
+        ] = status.agent_id
+        for user_uuid in status.user_uuids:
+            self._agent_ids_by_user_uuid[user_uuid] = status.agent_id
+        if previous is not None:
+            self._unindex(previous, status)
+
+    def _pop(self, agent_id):
+        status = self._statuses.pop(agent_id, None)
+        if status is not None:
+            self._unindex(status)
+            self._increment_version(status.agent_id, status.tenant_uuid)
+
+    def _increment_version(self, agent_id, tenant_uuid):
+        # A change of an unknown tenant changes the version of all tenants
+        self._version += 1
+        if tenant_uuid is None:
+            self._global_version = self._version
+        else:
+            self._tenant_versions[tenant_uuid] = self._version
+        # Kept in the order of the changes, so that the oldest come first
+        self._agent_versions.pop(agent_id, None)
+        self._agent_versions[agent_id] = self._version
+        excess = len(self._agent_versions) - self._max_tracked_agents
+        if excess > 0:
+            for agent_id in list(itertools.islice(self._agent_versions, excess)):
+                self._known_since_version = max(
+                    self._known_since_version, self._agent_versions.pop(agent_id)
+                )
+
+    def _unindex(self, status, current=None):
+        agent_id = status.agent_id
+        if not current or current.agent_number != status.agent_number:
+            _discard(self._agent_ids_by_number, status.agent_number, agent_id)
+        extension = (status.extension, status.context)
+        if not current or (current.extension, current.context) != extension:
+            _discard(self._agent_ids_by_extension, extension, agent_id)
+        for user_uuid in status.user_uuids:
+            if not current or user_uuid not in current.user_uuids:
+                _discard(self._agent_ids_by_user_uuid, user_uuid, agent_id)
+
+    def _find_user_uuids(self, agent_id):
+        users = self._user_dao.find_all_by_agent_id(agent_id)
+        return tuple(str(user.uuid) for user in users)
+
+    def _visible(self, status, tenant_uuids):
+        if status is None:
+            return None
+        if tenant_uuids is not None and status.tenant_uuid not in tenant_uuids:
+            return None
+        return status
+
+    @staticmethod
+    def _to_queues(queues):
+        return tuple(
+            _Queue(
+                queue.id, getattr(queue, 'tenant_uuid', None), queue.name, queue.penalty
+            )
+            for queue in queues
+        )
+
+
+def _discard(index, key, agent_id):
+    if index.get(key) == agent_id:
+        del index[key]
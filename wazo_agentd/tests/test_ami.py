@@ -0,0 +1,147 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+from hamcrest import assert_that, calling, equal_to, less_than, raises, same_instance
+
+from wazo_agentd.ami import AmidClient
+
+
+class TestAmidClientActions(unittest.TestCase):
+    def setUp(self):
+        self.client = AmidClient('localhost', max_concurrent_actions=10)
+
+    def test_actions_are_sent_concurrently_and_ordered(self):
+        def action(name, params):
+            time.sleep(0.1)
+            return [{'Response': 'Success', 'Queue': params['Queue']}]
+
+        actions = [('QueueAdd', {'Queue': f'q{i}'}) for i in range(10)]
+        with patch.object(self.client, 'action', side_effect=action):
+            start = time.monotonic()
+            responses = self.client.actions(actions)
+            elapsed = time.monotonic() - start
+
+        assert_that(
+            [response[0]['Queue'] for response in responses],
+            equal_to([f'q{i}' for i in range(10)]),
+        )
+        assert_that(elapsed, less_than(0.5))
+
+    def test_actions_raise_after_all_actions_are_done(self):
+        done = []
+        lock = threading.Lock()
+
+        def action(name, params):
+            if params['Queue'] == 'q0':
+                raise Exception('Interface not found')
+            time.sleep(0.05)
+            with lock:
+                done.append(params['Queue'])
+
+        actions = [('QueueAdd', {'Queue': f'q{i}'}) for i in range(3)]
+        with patch.object(self.client, 'action', side_effect=action):
+            assert_that(
+                calling(self.client.actions).with_args(actions), raises(Exception)
+            )
+
+        assert_that(sorted(done), equal_to(['q1', 'q2']))
+
+    def test_actions_return_exceptions(self):
+        error = Exception('Interface not found')
+
+        def action(name, params):
+            if params['Queue'] == 'q0':
+                raise error
+            return [{'Response': 'Success'}]
+
+        actions = [('QueueRemove', {'Queue': f'q{i}'}) for i in range(2)]
+        with patch.object(self.client, 'action', side_effect=action):
+            results = self.client.actions(actions, return_exceptions=True)
+
+        assert_that(results, equal_to([error, [{'Response': 'Success'}]]))
+
+
+class TestAmidClientConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.client = AmidClient('localhost', max_concurrent_actions=4)
+
+    def test_sessions_share_the_connection_pool(self):
+        session1 = self.client.session()
+        session2 = self.client.session()
+
+        assert_that(
+            session1.adapters['http://'], same_instance(session2.adapters['http://'])
+        )
+        assert_that(
+            session1.adapters['https://'], same_instance(session1.adapters['http://'])
+        )
+
+    def test_sessions_keep_the_connection_alive(self):
+        session = self.client.session()
+
+        assert_that(session.headers.get('Connection'), equal_to(None))
+
+    def test_connections_are_reused(self):
+        client_ports = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                client_ports.append(self.client_address[1])
+                self.send_response(200)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'[]')
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f'http://127.0.0.1:{server.server_address[1]}/'
+
+        for _ in range(3):
+            self.client.session().get(url)
+
+        assert_that(len(client_ports), equal_to(3))
+        assert_that(len(set(client_ports)), equal_to(1))
+
+    def test_pool_size_defaults_to_max_concurrent_actions(self):
+        assert_that(self.client._adapter._pool_maxsize, equal_to(4))
+
+        client = AmidClient('localhost', max_concurrent_actions=4, pool_size=20)
+
+        assert_that(client._adapter._pool_maxsize, equal_to(20))
+
+    def test_collect_metrics(self):
+        pool = Mock(num_connections=2, num_requests=10)
+        pool.pool.qsize.return_value = 2
+        self.client._adapter.poolmanager.pools['localhost'] = pool
+
+        metrics = {
+            sample.name: sample.value
+            for family in self.client.collect_metrics()
+            for sample in family.samples
+        }
+
+        assert_that(
+            metrics,
+            equal_to(
+                {
+                    'agentd_amid_connections_opened_total': 2,
+                    'agentd_amid_requests_total': 10,
+                    'agentd_amid_connections_idle': 2,
+                }
+            ),
+        )
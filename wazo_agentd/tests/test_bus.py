@@ -0,0 +1,89 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, contains_exactly, equal_to, greater_than_or_equal_to
+
+from wazo_agentd.bus import BusEventDispatcher
+
+
+def _key(payload):
+    return payload['id']
+
+
+class TestBusEventDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.dispatcher = BusEventDispatcher(workers=4)
+
+    def test_events_with_the_same_key_are_handled_in_order(self):
+        handled = []
+        dispatch = self.dispatcher.partitioned(_key, handled.append)
+
+        with self.dispatcher:
+            for sequence in range(100):
+                dispatch({'id': 42, 'sequence': sequence})
+
+        assert_that(
+            [payload['sequence'] for payload in handled], equal_to(list(range(100)))
+        )
+
+    def test_other_keys_are_not_blocked(self):
+        blocked = threading.Event()
+        handled = threading.Event()
+
+        def callback(payload):
+            if payload['id'] == 'slow':
+                blocked.wait(timeout=5)
+            else:
+                handled.set()
+
+        dispatch = self.dispatcher.partitioned(_key, callback)
+        slow_partition = hash('slow') % 4
+        other_id = next(i for i in range(100) if hash(i) % 4 != slow_partition)
+
+        with self.dispatcher:
+            dispatch({'id': 'slow'})
+            dispatch({'id': other_id})
+
+            assert_that(handled.wait(timeout=5), equal_to(True))
+            blocked.set()
+
+    def test_errors_do_not_stop_the_partition(self):
+        callback = Mock(side_effect=[Exception('AMI error'), None])
+        dispatch = self.dispatcher.partitioned(_key, callback)
+
+        with self.dispatcher:
+            dispatch({'id': 42})
+            dispatch({'id': 42})
+
+        assert_that(callback.call_count, equal_to(2))
+
+    def test_provide_status(self):
+        started = threading.Event()
+        proceed = threading.Event()
+
+        def callback(payload):
+            started.set()
+            proceed.wait(timeout=5)
+
+        dispatch = self.dispatcher.partitioned(_key, callback)
+        status = {'bus_events': {}}
+
+        with self.dispatcher:
+            dispatch({'id': 42})
+            dispatch({'id': 42})
+            started.wait(timeout=5)
+            self.dispatcher.provide_status(status)
+            proceed.set()
+
+        assert_that(status['bus_events']['queue_depth'], equal_to(1))
+        assert_that(status['bus_events']['lag'], greater_than_or_equal_to(0))
+
+        self.dispatcher.provide_status(status)
+        assert_that(
+            [status['bus_events']['queue_depth'], status['bus_events']['lag']],
+            contains_exactly(0, 0),
+        )
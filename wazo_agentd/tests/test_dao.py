@@ -0,0 +1,98 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock, patch
+
+from hamcrest import assert_that, calling, equal_to, has_entries, raises
+
+from wazo_agentd.dao import ExtenFeaturesDAOAdapter
+from wazo_agentd.exception import NoSuchExtenFeatureError
+
+
+class TestExtenFeaturesDAOAdapter(unittest.TestCase):
+    def setUp(self):
+        self.dao = Mock()
+        self.dao.find_extenfeatures_settings.side_effect = self._find
+        self.adapter = ExtenFeaturesDAOAdapter(self.dao, ttl=60)
+
+    @staticmethod
+    def _find(feature_names):
+        extensions = {'agentstaticlogin': '*31', 'phoneprogfunckey': '_*735.'}
+        return [
+            Mock(typeval=name, exten=extensions[name])
+            for name in feature_names
+            if name in extensions
+        ]
+
+    def test_get_extensions_is_cached(self):
+        names = ['phoneprogfunckey', 'agentstaticlogin']
+
+        first = self.adapter.get_extensions(names)
+        second = self.adapter.get_extensions(names)
+
+        expected = {'phoneprogfunckey': '_*735.', 'agentstaticlogin': '*31'}
+        assert_that(first, equal_to(expected))
+        assert_that(second, equal_to(expected))
+        self.dao.find_extenfeatures_settings.assert_called_once_with(names)
+
+    def test_only_missing_extensions_are_queried(self):
+        self.adapter.get_extensions(['phoneprogfunckey'])
+
+        self.adapter.get_extensions(['phoneprogfunckey', 'agentstaticlogin'])
+
+        self.dao.find_extenfeatures_settings.assert_called_with(['agentstaticlogin'])
+
+    def test_unknown_extensions_are_cached(self):
+        assert_that(
+            calling(self.adapter.get_extension).with_args('unknown'),
+            raises(NoSuchExtenFeatureError),
+        )
+        assert_that(
+            calling(self.adapter.get_extension).with_args('unknown'),
+            raises(NoSuchExtenFeatureError),
+        )
+
+        self.dao.find_extenfeatures_settings.assert_called_once_with(['unknown'])
+
+    @patch('wazo_agentd.dao.time.monotonic')
+    def test_expired_extensions_are_queried_again(self, monotonic):
+        monotonic.return_value = 100
+        self.adapter.get_extension('agentstaticlogin')
+
+        monotonic.return_value = 161
+        self.adapter.get_extension('agentstaticlogin')
+
+        assert_that(self.dao.find_extenfeatures_settings.call_count, equal_to(2))
+
+    def test_no_cache_when_ttl_is_0(self):
+        adapter = ExtenFeaturesDAOAdapter(self.dao, ttl=0)
+
+        adapter.get_extension('agentstaticlogin')
+        result = adapter.get_extension('agentstaticlogin')
+
+        assert_that(result, equal_to('*31'))
+        assert_that(self.dao.find_extenfeatures_settings.call_count, equal_to(2))
+        status = {'extension_features_cache': {}}
+        adapter.provide_status(status)
+        assert_that(status['extension_features_cache'], has_entries(size=0))
+
+    def test_invalidate(self):
+        self.adapter.get_extension('agentstaticlogin')
+
+        self.adapter.invalidate({'id': 1})
+        self.adapter.get_extension('agentstaticlogin')
+
+        assert_that(self.dao.find_extenfeatures_settings.call_count, equal_to(2))
+
+    def test_provide_status(self):
+        self.adapter.get_extensions(['agentstaticlogin', 'unknown'])
+        self.adapter.get_extension('agentstaticlogin')
+        status = {'extension_features_cache': {}}
+
+        self.adapter.provide_status(status)
+
+        assert_that(
+            status['extension_features_cache'],
+            has_entries(hits=1, misses=2, size=2),
+        )
@@ -0,0 +1,64 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, contains_string, equal_to
+from prometheus_client import REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+from wazo_agentd.ami import AmidClient
+from wazo_agentd.metrics import _on_session_begin, _on_session_end, register_collector
+
+
+class TestMetrics(unittest.TestCase):
+    def test_register_collector(self):
+        registry = CollectorRegistry()
+        values = iter([1, 2])
+
+        def collect():
+            yield GaugeMetricFamily('test_collected', 'Collected', value=next(values))
+
+        register_collector(collect, registry=registry)
+
+        assert_that(registry.get_sample_value('test_collected'), equal_to(1))
+        assert_that(registry.get_sample_value('test_collected'), equal_to(2))
+
+    def test_amid_counters(self):
+        registry = CollectorRegistry()
+        client = AmidClient('localhost')
+        pool = Mock(num_connections=2, num_requests=10)
+        pool.pool.qsize.return_value = 2
+        client._adapter.poolmanager.pools['localhost'] = pool
+
+        register_collector(client.collect_metrics, registry=registry)
+
+        types = {family.name: family.type for family in registry.collect()}
+        assert_that(
+            types,
+            equal_to(
+                {
+                    'agentd_amid_connections_opened': 'counter',
+                    'agentd_amid_requests': 'counter',
+                    'agentd_amid_connections_idle': 'gauge',
+                }
+            ),
+        )
+        rendered = generate_latest(registry).decode()
+        assert_that(
+            rendered, contains_string('\nagentd_amid_connections_opened_total 2.0\n')
+        )
+        assert_that(rendered, contains_string('\nagentd_amid_requests_total 10.0\n'))
+
+    def test_db_session_duration(self):
+        session = Mock(info={})
+        name = 'agentd_db_session_duration_seconds_count'
+        count = REGISTRY.get_sample_value(name)
+
+        _on_session_begin(session, Mock(), Mock())
+        _on_session_begin(session, Mock(), Mock())
+        _on_session_end(session)
+        _on_session_end(session)
+
+        assert_that(REGISTRY.get_sample_value(name), equal_to(count + 1))
@@ -1,12 +1,13 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import datetime
+import threading
 import unittest
 from functools import wraps
-from unittest.mock import ANY, Mock, patch, sentinel
+from unittest.mock import Mock, patch, sentinel
 
-from wazo_agentd.queuelog import QueueLogManager
+from wazo_agentd.queuelog import QueueLogEntry, QueueLogManager
 
 mock_date = datetime.datetime(2011, 11, 12, 13, 14, 15, 1617)
 mock_date_str = '2011-11-12 13:14:15.001617'
@@ -53,9 +54,19 @@ class TestQueuelog(unittest.TestCase):
         str_now = mock_date_str
 
         self.queue_log_mgr.on_agent_logged_in('1', '1001', 'default')
-
-        self.queue_log_dao.insert_entry.assert_called_once_with(
-            str_now, 'NONE', 'NONE', 'Agent/1', 'AGENTCALLBACKLOGIN', '1001@default'
+        self.queue_log_mgr.stop()
+
+        self.queue_log_dao.insert_entries.assert_called_once_with(
+            [
+                QueueLogEntry(
+                    str_now,
+                    'NONE',
+                    'NONE',
+                    'Agent/1',
+                    'AGENTCALLBACKLOGIN',
+                    '1001@default',
+                )
+            ]
         )
 
     @patch_datetime_now(return_value=mock_date)
@@ -63,16 +74,21 @@ class TestQueuelog(unittest.TestCase):
         str_now = mock_date_str
 
         self.queue_log_mgr.on_agent_logged_off('1', '1001', 'default', 123)
-
-        self.queue_log_dao.insert_entry.assert_called_once_with(
-            str_now,
-            'NONE',
-            'NONE',
-            'Agent/1',
-            'AGENTCALLBACKLOGOFF',
-            '1001@default',
-            '123',
-            'CommandLogoff',
+        self.queue_log_mgr.stop()
+
+        self.queue_log_dao.insert_entries.assert_called_once_with(
+            [
+                QueueLogEntry(
+                    str_now,
+                    'NONE',
+                    'NONE',
+                    'Agent/1',
+                    'AGENTCALLBACKLOGOFF',
+                    '1001@default',
+                    '123',
+                    'CommandLogoff',
+                )
+            ]
         )
 
     def test_on_agent_logged_off_written_logged_time_should_be_an_integer_when_given_logged_time_is_not_integer(
@@ -81,7 +97,47 @@ class TestQueuelog(unittest.TestCase):
         self.queue_log_mgr.on_agent_logged_off(
             sentinel.agent_number, sentinel.extension, sentinel.context, 12.98743
         )
+        self.queue_log_mgr.stop()
+
+        (entries,), _ = self.queue_log_dao.insert_entries.call_args
+        self.assertEqual(entries[0].data2, '12')
 
-        self.queue_log_dao.insert_entry.assert_called_once_with(
-            ANY, ANY, ANY, ANY, ANY, ANY, '12', ANY
+    def test_entries_are_written_in_batches(self):
+        queue_log_mgr = QueueLogManager(
+            self.queue_log_dao, max_batch_size=200, flush_interval=60
         )
+        queue_log_mgr.start()
+
+        for number in range(500):
+            queue_log_mgr.on_agent_logged_off(str(number), '1001', 'default', 12)
+        queue_log_mgr.stop()
+
+        batches = [
+            entries
+            for (entries,), _ in self.queue_log_dao.insert_entries.call_args_list
+        ]
+        self.assertEqual([len(entries) for entries in batches], [200, 200, 100])
+        self.assertEqual(batches[0][0].agent, 'Agent/0')
+        self.assertEqual(batches[2][-1].agent, 'Agent/499')
+
+    def test_entries_are_written_after_the_flush_interval(self):
+        written = threading.Event()
+        self.queue_log_dao.insert_entries.side_effect = lambda _: written.set()
+        queue_log_mgr = QueueLogManager(
+            self.queue_log_dao, max_batch_size=200, flush_interval=0.01
+        )
+
+        with queue_log_mgr:
+            queue_log_mgr.on_agent_logged_in('1', '1001', 'default')
+
+            self.assertTrue(written.wait(timeout=5))
+
+    def test_write_errors_do_not_stop_the_writer(self):
+        self.queue_log_dao.insert_entries.side_effect = [Exception('db error'), None]
+        queue_log_mgr = QueueLogManager(self.queue_log_dao, max_batch_size=1)
+
+        with queue_log_mgr:
+            queue_log_mgr.on_agent_logged_in('1', '1001', 'default')
+            queue_log_mgr.on_agent_logged_in('2', '1002', 'default')
+
+        self.assertEqual(self.queue_log_dao.insert_entries.call_count, 2)
@@ -0,0 +1,359 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    empty,
+    equal_to,
+    has_properties,
+    none,
+)
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from wazo_agentd.dao import AgentStatus, _Queue
+from wazo_agentd.store import AgentIdentity, AgentStatusStore
+
+TENANT_UUID = '00000000-0000-4000-8000-00000000000a'
+OTHER_TENANT_UUID = '00000000-0000-4000-8000-00000000000b'
+
+
+class TestAgentStatusStore(unittest.TestCase):
+    def setUp(self):
+        self.agent_status_dao = Mock()
+        self.agent_dao = Mock()
+        self.agent_dao.agent_with_id.return_value = Mock(
+            tenant_uuid=TENANT_UUID, user_ids=[1]
+        )
+        self.user_dao = Mock()
+        self.user_dao.find_all_by_agent_id.return_value = [Mock(uuid='user-uuid')]
+        self.session = scoped_session(sessionmaker())
+        self.store = AgentStatusStore(
+            self.agent_status_dao, self.agent_dao, self.user_dao, self.session
+        )
+        self.queue = _Queue(1, TENANT_UUID, 'q1', 0)
+
+    def _log_in(self, agent_id=42, number='1042', extension='1001'):
+        self.store.log_in_agent(
+            agent_id,
+            number,
+            extension,
+            'default',
+            'Local/id-42@agentcallback',
+            'PJSIP/a',
+        )
+        self.session.commit()
+
+    def test_log_in_agent_writes_through(self):
+        self._log_in()
+
+        self.agent_status_dao.log_in_agent.assert_called_once_with(
+            42, '1042', '1001', 'default', 'Local/id-42@agentcallback', 'PJSIP/a'
+        )
+        expected = has_properties(
+            agent_id=42, agent_number='1042', tenant_uuid=TENANT_UUID, user_ids=(1,)
+        )
+        assert_that(self.store.get_status(42), expected)
+        assert_that(self.store.get_status_by_number('1042'), expected)
+        assert_that(self.store.get_status_by_user('user-uuid'), expected)
+        assert_that(self.store.is_extension_in_use('1001', 'default'), equal_to(True))
+        self.agent_status_dao.get_status.assert_not_called()
+
+    def test_load(self):
+        status = AgentStatus(
+            42,
+            '1042',
+            TENANT_UUID,
+            '1001',
+            'default',
+            'Local/id-42@agentcallback',
+            'PJSIP/a',
+            None,
+            False,
+            None,
+            (self.queue,),
+            (1,),
+            ('user-uuid',),
+        )
+        self.agent_status_dao.get_logged_statuses.return_value = [status]
+
+        self.store.load()
+
+        self.agent_status_dao.get_status.assert_not_called()
+        assert_that(self.store.get_status_by_user('user-uuid'), equal_to(status))
+        assert_that(
+            self.store.get_logged_statuses([TENANT_UUID]), contains_exactly(status)
+        )
+        assert_that(self.store.get_logged_statuses([OTHER_TENANT_UUID]), empty())
+
+    def test_get_status_filters_tenants(self):
+        self._log_in()
+
+        assert_that(self.store.get_status(42, [OTHER_TENANT_UUID]), none())
+        assert_that(
+            self.store.get_status(42, [TENANT_UUID]), has_properties(agent_id=42)
+        )
+
+    def test_log_off_agent_removes_all_indexes(self):
+        self._log_in()
+
+        self.store.log_off_agent(42)
+        self.session.commit()
+
+        self.agent_status_dao.log_off_agent.assert_called_once_with(42)
+        assert_that(self.store.get_status(42), none())
+        assert_that(self.store.get_status_by_number('1042'), none())
+        assert_that(self.store.get_status_by_user('user-uuid'), none())
+        assert_that(self.store.is_extension_in_use('1001', 'default'), equal_to(False))
+
+    def test_queue_membership(self):
+        self._log_in()
+
+        self.store.add_agent_to_queues(42, [self.queue])
+        self.store.update_penalty(42, self.queue.id, 5)
+        self.session.commit()
+
+        assert_that(
+            self.store.get_status(42).queues,
+            contains_exactly(has_properties(id=1, penalty=5)),
+        )
+        assert_that(
+            self.store.get_statuses_for_queue(self.queue.id),
+            contains_exactly(has_properties(agent_id=42)),
+        )
+
+        self.store.remove_agent_from_queues(42, [self.queue.id])
+        self.session.commit()
+
+        assert_that(self.store.get_status(42).queues, equal_to(()))
+        self.agent_status_dao.remove_agent_from_queues.assert_called_once_with(
+            42, [self.queue.id]
+        )
+
+    def test_queue_membership_many_agents(self):
+        self._log_in()
+
+        self.store.add_agents_to_queue([42, 43], self.queue)
+        self.session.commit()
+
+        assert_that(
+            self.store.get_status(42).queues,
+            contains_exactly(has_properties(id=1)),
+        )
+        self.agent_status_dao.add_agents_to_queue.assert_called_once_with(
+            [42, 43], self.queue
+        )
+
+        self.store.remove_agents_from_queue([42, 43], self.queue.id)
+        self.session.commit()
+
+        assert_that(self.store.get_status(42).queues, equal_to(()))
+        self.agent_status_dao.remove_agents_from_queue.assert_called_once_with(
+            [42, 43], self.queue.id
+        )
+
+    def test_update_pause_status(self):
+        self._log_in()
+
+        self.store.update_pause_status(42, True, 'lunch')
+        self.session.commit()
+
+        self.agent_status_dao.update_pause_status.assert_called_once_with(
+            42, True, 'lunch'
+        )
+        assert_that(
+            self.store.get_status(42),
+            has_properties(paused=True, paused_reason='lunch'),
+        )
+
+    def test_unknown_calls_are_forwarded_to_the_dao(self):
+        self.store.get_statuses(tenant_uuids=[TENANT_UUID])
+
+        self.agent_status_dao.get_statuses.assert_called_once_with(
+            tenant_uuids=[TENANT_UUID]
+        )
+
+    def test_version_is_incremented_by_changes(self):
+        initial_version = self.store.get_version()
+
+        self._log_in()
+        login_version = self.store.get_version([TENANT_UUID])
+        self.store.update_pause_status(42, True, 'lunch')
+        self.session.commit()
+        pause_version = self.store.get_version([TENANT_UUID])
+        self.store.log_off_agent(42)
+        self.session.commit()
+        logoff_version = self.store.get_version()
+
+        assert_that(initial_version < login_version < pause_version < logoff_version)
+        assert_that(
+            self.store.get_version([OTHER_TENANT_UUID]), equal_to(initial_version)
+        )
+
+    def test_get_agent_ids_changed_since(self):
+        self._log_in(agent_id=1, number='1001', extension='1001')
+        version = self.store.get_version()
+        self._log_in(agent_id=2, number='1002', extension='1002')
+        self.store.add_agent_to_queues(2, [self.queue])
+        self.session.commit()
+
+        assert_that(self.store.get_agent_ids_changed_since(version), equal_to({2}))
+        assert_that(
+            self.store.get_agent_ids_changed_since(self.store.get_version()), empty()
+        )
+        assert_that(self.store.get_agent_ids_changed_since(0), none())
+
+    def test_changes_are_applied_after_commit(self):
+        self.store.log_in_agent(
+            42, '1042', '1001', 'default', 'Local/id-42@agentcallback', 'PJSIP/a'
+        )
+
+        assert_that(self.store.get_status(42), none())
+
+        self.session.commit()
+
+        assert_that(self.store.get_status(42), has_properties(agent_id=42))
+
+    def test_changes_are_dropped_on_rollback(self):
+        self._log_in()
+        version = self.store.get_version()
+        self.agent_status_dao.update_pause_status.side_effect = Exception()
+
+        try:
+            self.store.add_agent_to_queues(42, [self.queue])
+            self.store.update_pause_status(42, True, 'lunch')
+        except Exception:
+            self.session.rollback()
+        self.session.commit()
+
+        assert_that(self.store.get_status(42), has_properties(queues=()))
+        assert_that(self.store.get_version(), equal_to(version))
+
+    def test_agent_edited_updates_the_number(self):
+        self._log_in()
+        self.agent_dao.get_agent.return_value = Mock(number='2042', user_ids=[1])
+
+        self.store.on_agent_edited({'id': 42})
+        self.session.commit()
+
+        assert_that(self.store.get_status(42), has_properties(agent_number='2042'))
+        assert_that(
+            self.store.get_status_by_number('2042'), has_properties(agent_id=42)
+        )
+        assert_that(self.store.get_status_by_number('1042'), none())
+
+    def test_user_agent_association_changes_update_the_users(self):
+        self._log_in()
+        self.agent_dao.get_agent.return_value = Mock(number='1042', user_ids=[1, 2])
+        self.user_dao.find_all_by_agent_id.return_value = [
+            Mock(uuid='user-uuid'),
+            Mock(uuid='other-user-uuid'),
+        ]
+
+        self.store.on_user_agent_association_changed(
+            {'user_uuid': 'other-user-uuid', 'agent_id': 42}
+        )
+        self.session.commit()
+
+        assert_that(
+            self.store.get_status_by_user('other-user-uuid'),
+            has_properties(agent_id=42, user_ids=(1, 2)),
+        )
+
+    def test_user_deleted_removes_the_user(self):
+        self._log_in()
+        self.agent_dao.get_agent.return_value = Mock(number='1042', user_ids=[])
+        self.user_dao.find_all_by_agent_id.return_value = []
+
+        self.store.on_user_deleted({'uuid': 'user-uuid'})
+        self.session.commit()
+
+        assert_that(self.store.get_status_by_user('user-uuid'), none())
+        assert_that(self.store.get_status(42), has_properties(user_uuids=()))
+
+    def test_agent_config_events_change_the_version(self):
+        self.agent_dao.get_agent.return_value = Mock(tenant_uuid=TENANT_UUID)
+        version = self.store.get_version()
+
+        self.store.on_agent_created({'id': 42})
+        created_version = self.store.get_version([TENANT_UUID])
+        self.store.on_agent_edited({'id': 42})
+        edited_version = self.store.get_version([TENANT_UUID])
+
+        assert_that(version < created_version < edited_version)
+        assert_that(self.store.get_version([OTHER_TENANT_UUID]), equal_to(version))
+        assert_that(self.store.get_agent_ids_changed_since(version), equal_to({42}))
+        assert_that(self.store.get_status(42), none())
+
+    def test_agent_deleted_changes_the_version_of_all_tenants(self):
+        version = self.store.get_version()
+
+        self.store.on_agent_deleted({'id': 42})
+
+        assert_that(self.store.get_version([OTHER_TENANT_UUID]) > version)
+        assert_that(self.store.get_agent_ids_changed_since(version), none())
+        assert_that(
+            self.store.get_agent_ids_changed_since(self.store.get_version()), empty()
+        )
+
+    def test_queue_members_changed_changes_the_version(self):
+        version = self.store.get_version()
+        agents = [Mock(id=42, tenant_uuid=TENANT_UUID)]
+
+        self.store.on_queue_members_changed(agents)
+
+        assert_that(self.store.get_version(), equal_to(version))
+
+        self.session.commit()
+
+        assert_that(self.store.get_version([TENANT_UUID]) > version)
+        assert_that(self.store.get_version([OTHER_TENANT_UUID]), equal_to(version))
+        assert_that(self.store.get_agent_ids_changed_since(version), equal_to({42}))
+
+    def test_queue_changed_changes_the_version_of_all_tenants(self):
+        version = self.store.get_version()
+
+        self.store.on_queue_changed({'id': 1})
+
+        assert_that(self.store.get_version([OTHER_TENANT_UUID]) > version)
+        assert_that(self.store.get_agent_ids_changed_since(version), none())
+
+    def test_oldest_agent_versions_are_dropped(self):
+        store = AgentStatusStore(
+            self.agent_status_dao,
+            self.agent_dao,
+            self.user_dao,
+            self.session,
+            max_tracked_agents=2,
+        )
+        self.agent_dao.get_agent.return_value = Mock(tenant_uuid=TENANT_UUID)
+        version = store.get_version()
+        store.on_agent_created({'id': 1})
+        dropped_version = store.get_version()
+        store.on_agent_created({'id': 2})
+        kept_version = store.get_version()
+        store.on_agent_created({'id': 3})
+
+        assert_that(store.get_agent_ids_changed_since(version), none())
+        assert_that(
+            store.get_agent_ids_changed_since(dropped_version), equal_to({2, 3})
+        )
+        assert_that(store.get_agent_ids_changed_since(kept_version), equal_to({3}))
+
+    def test_get_identity_of_a_logged_agent(self):
+        self._log_in()
+        self.agent_dao.agent_with_id.reset_mock()
+
+        identity = self.store.get_identity(42)
+
+        assert_that(identity, equal_to(AgentIdentity(TENANT_UUID, ('user-uuid',))))
+        self.agent_dao.agent_with_id.assert_not_called()
+
+    def test_get_identity_of_an_agent_not_logged(self):
+        identity = self.store.get_identity(42)
+
+        assert_that(identity, equal_to(AgentIdentity(TENANT_UUID, ('user-uuid',))))
+        self.agent_dao.agent_with_id.assert_called_once_with(42)